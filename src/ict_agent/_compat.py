@@ -0,0 +1,9 @@
+"""Python version compatibility helpers"""
+
+import sys
+
+# dataclass(slots=True) needs Python 3.10+; older interpreters get regular dataclasses.
+# Usage: @dataclass(**DATACLASS_SLOTS)
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+__all__ = ["DATACLASS_SLOTS"]
@@ -0,0 +1,26 @@
+"""Optional Numba JIT support
+
+Hot scan kernels are decorated with ``njit`` from this module. When numba is
+installed they compile to machine code; otherwise the decorator is a no-op and
+the same functions run as plain Python/NumPy.
+
+Install with: pip install "ict-agent[perf]"
+"""
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    # Plain range when kernels run as Python
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback decorator - supports both ``@njit`` and ``@njit(cache=True)``"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ["njit", "prange", "NUMBA_AVAILABLE"]
@@ -2,5 +2,6 @@
 
 from ict_agent.data.fetcher import DataFetcher
 from ict_agent.data.preprocessor import DataPreprocessor
+from ict_agent.data.ohlc_view import OHLCView
 
-__all__ = ["DataFetcher", "DataPreprocessor"]
+__all__ = ["DataFetcher", "DataPreprocessor", "OHLCView"]
@@ -0,0 +1,40 @@
+"""OHLC Column View
+
+Struct-of-arrays view of OHLC data for the scan hot paths.
+"""
+
+from dataclasses import dataclass
+import pandas as pd
+import numpy as np
+
+from ict_agent._compat import DATACLASS_SLOTS
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class OHLCView:
+    """
+    OHLC columns extracted once as contiguous float64 arrays.
+    
+    Models that accept an OHLCView read these arrays directly instead of
+    looking up DataFrame columns on every call. Build one per frame with
+    from_df() and pass it to repeated scans.
+    """
+    index: pd.DatetimeIndex
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    
+    @classmethod
+    def from_df(cls, df: pd.DataFrame) -> "OHLCView":
+        """Extract the open/high/low/close columns of an OHLC DataFrame"""
+        return cls(
+            index=df.index,
+            open=np.ascontiguousarray(df["open"].to_numpy(dtype=np.float64)),
+            high=np.ascontiguousarray(df["high"].to_numpy(dtype=np.float64)),
+            low=np.ascontiguousarray(df["low"].to_numpy(dtype=np.float64)),
+            close=np.ascontiguousarray(df["close"].to_numpy(dtype=np.float64)),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.close)
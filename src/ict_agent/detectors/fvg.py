@@ -4,9 +4,10 @@ Detects imbalances in price where Smart Money has left gaps due to aggressive
 institutional order flow.
 """
 
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional
+from typing import NamedTuple, Optional, Sequence
 import pandas as pd
 import numpy as np
 
@@ -32,6 +33,41 @@ class FVG:
     mitigated: bool = False
     mitigation_index: Optional[int] = None
     
+    @classmethod
+    def from_gap(
+        cls,
+        index: int,
+        direction: FVGDirection,
+        top: float,
+        bottom: float,
+        timestamp: pd.Timestamp,
+    ) -> "FVG":
+        """Build an FVG from its gap bounds, deriving midpoint and OTE levels"""
+        size = top - bottom
+        midpoint = (top + bottom) / 2
+        
+        if direction == FVGDirection.BULLISH:
+            ote_62 = bottom + (size * 0.382)
+            ote_705 = bottom + (size * 0.295)
+            ote_79 = bottom + (size * 0.21)
+        else:
+            ote_62 = top - (size * 0.382)
+            ote_705 = top - (size * 0.295)
+            ote_79 = top - (size * 0.21)
+        
+        return cls(
+            index=index,
+            direction=direction,
+            top=top,
+            bottom=bottom,
+            midpoint=midpoint,
+            ote_62=ote_62,
+            ote_705=ote_705,
+            ote_79=ote_79,
+            size=size,
+            timestamp=timestamp,
+        )
+    
     @property
     def is_valid(self) -> bool:
         return not self.mitigated
@@ -49,6 +85,26 @@ class FVG:
         return levels.get(level, self.midpoint)
 
 
+class FVGArrays(NamedTuple):
+    """Column (struct-of-arrays) view of a list of FVGs, in list order"""
+    index: np.ndarray  # int64 bar positions
+    direction: np.ndarray  # int8 FVGDirection values
+    top: np.ndarray  # float64
+    bottom: np.ndarray  # float64
+    mitigated: np.ndarray  # bool
+    
+    @classmethod
+    def from_fvgs(cls, fvgs: Sequence[FVG]) -> "FVGArrays":
+        n = len(fvgs)
+        return cls(
+            index=np.fromiter((f.index for f in fvgs), dtype=np.int64, count=n),
+            direction=np.fromiter((f.direction.value for f in fvgs), dtype=np.int8, count=n),
+            top=np.fromiter((f.top for f in fvgs), dtype=np.float64, count=n),
+            bottom=np.fromiter((f.bottom for f in fvgs), dtype=np.float64, count=n),
+            mitigated=np.fromiter((f.mitigated for f in fvgs), dtype=bool, count=n),
+        )
+
+
 class FVGDetector:
     """
     Detects Fair Value Gaps in OHLCV data.
@@ -70,6 +126,15 @@ class FVGDetector:
         self.pip_size = pip_size
         self.join_consecutive = join_consecutive
         self._fvgs: list[FVG] = []
+        # get_active_fvgs results per direction, reset on every detect()
+        self._active_cache: dict[Optional[FVGDirection], tuple[FVG, ...]] = {}
+        self._arrays_cache: dict[Optional[FVGDirection], FVGArrays] = {}
+        
+        # Streaming state for update(): bars seen, the latest two candles and
+        # unmitigated FVGs
+        self._bar_count = 0
+        self._recent_bars: deque = deque(maxlen=2)
+        self._live_fvgs: list[FVG] = []
     
     def detect(self, ohlc: pd.DataFrame) -> pd.DataFrame:
         """
@@ -94,6 +159,8 @@ class FVGDetector:
         result["fvg_mitigation_index"] = np.nan
         
         self._fvgs = []
+        self._active_cache = {}
+        self._arrays_cache = {}
         
         for i in range(2, len(ohlc)):
             candle_prev2 = ohlc.iloc[i - 2]
@@ -110,12 +177,83 @@ class FVGDetector:
                 self._record_fvg(result, ohlc, i, FVGDirection.BEARISH, bearish_fvg)
         
         self._check_mitigation(ohlc, result)
+        self._prime_stream(ohlc)
         
         if self.join_consecutive:
             result = self._join_consecutive_fvgs(result)
         
         return result
     
+    def update(
+        self,
+        timestamp: pd.Timestamp,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+    ) -> Optional[FVG]:
+        """
+        Process one new candle appended after the data seen so far.
+        
+        Streaming counterpart to detect(): it continues from the last detect()
+        call on at least three candles (or from a fresh detector) and leaves the
+        FVGs in the same state detect() would produce on the extended data,
+        touching only the new candle.
+        
+        Returns:
+            The FVG formed by this candle, if any
+        """
+        index = self._bar_count
+        
+        for fvg in self._live_fvgs:
+            if self._is_mitigating(fvg, high, low):
+                fvg.mitigated = True
+                fvg.mitigation_index = index
+        self._live_fvgs = [f for f in self._live_fvgs if not f.mitigated]
+        
+        candle = {"open": open_price, "high": high, "low": low, "close": close}
+        fvg = None
+        
+        if len(self._recent_bars) == 2:
+            candle_prev2, candle_mid = self._recent_bars
+            
+            gap = self._check_bullish_fvg(candle_prev2, candle, candle_mid)
+            if gap:
+                fvg = FVG.from_gap(index, FVGDirection.BULLISH, *gap, timestamp)
+            else:
+                gap = self._check_bearish_fvg(candle_prev2, candle, candle_mid)
+                if gap:
+                    fvg = FVG.from_gap(index, FVGDirection.BEARISH, *gap, timestamp)
+            
+            if fvg:
+                self._fvgs.append(fvg)
+                self._live_fvgs.append(fvg)
+        
+        self._recent_bars.append(candle)
+        self._bar_count += 1
+        self._active_cache = {}
+        self._arrays_cache = {}
+        
+        return fvg
+    
+    def _prime_stream(self, ohlc: pd.DataFrame) -> None:
+        """Seed update() state from the data just passed to detect()"""
+        tail = ohlc.iloc[-2:]
+        self._bar_count = len(ohlc)
+        self._recent_bars = deque(
+            (
+                {"open": o, "high": h, "low": l, "close": c}
+                for o, h, l, c in zip(
+                    tail["open"].to_numpy(),
+                    tail["high"].to_numpy(),
+                    tail["low"].to_numpy(),
+                    tail["close"].to_numpy(),
+                )
+            ),
+            maxlen=2,
+        )
+        self._live_fvgs = [f for f in self._fvgs if not f.mitigated]
+    
     def _check_bullish_fvg(
         self, prev2: pd.Series, current: pd.Series, mid: pd.Series
     ) -> Optional[tuple[float, float]]:
@@ -164,36 +302,14 @@ class FVGDetector:
     ) -> None:
         """Record FVG in result DataFrame and internal list"""
         top, bottom = gap
-        size = top - bottom
-        midpoint = (top + bottom) / 2
-        
-        if direction == FVGDirection.BULLISH:
-            ote_62 = bottom + (size * 0.382)
-            ote_705 = bottom + (size * 0.295)
-            ote_79 = bottom + (size * 0.21)
-        else:
-            ote_62 = top - (size * 0.382)
-            ote_705 = top - (size * 0.295)
-            ote_79 = top - (size * 0.21)
-        
         idx = ohlc.index[index]
+        fvg = FVG.from_gap(index, direction, top, bottom, idx)
+        
         result.loc[idx, "fvg_direction"] = direction.value
         result.loc[idx, "fvg_top"] = top
         result.loc[idx, "fvg_bottom"] = bottom
-        result.loc[idx, "fvg_midpoint"] = midpoint
+        result.loc[idx, "fvg_midpoint"] = fvg.midpoint
         
-        fvg = FVG(
-            index=index,
-            direction=direction,
-            top=top,
-            bottom=bottom,
-            midpoint=midpoint,
-            ote_62=ote_62,
-            ote_705=ote_705,
-            ote_79=ote_79,
-            size=size,
-            timestamp=idx,
-        )
         self._fvgs.append(fvg)
     
     def _check_mitigation(self, ohlc: pd.DataFrame, result: pd.DataFrame) -> None:
@@ -202,20 +318,18 @@ class FVGDetector:
             for i in range(fvg.index + 1, len(ohlc)):
                 candle = ohlc.iloc[i]
                 
-                if fvg.direction == FVGDirection.BULLISH:
-                    if candle["low"] <= fvg.bottom:
-                        fvg.mitigated = True
-                        fvg.mitigation_index = i
-                        result.loc[fvg.timestamp, "fvg_mitigated"] = True
-                        result.loc[fvg.timestamp, "fvg_mitigation_index"] = i
-                        break
-                else:
-                    if candle["high"] >= fvg.top:
-                        fvg.mitigated = True
-                        fvg.mitigation_index = i
-                        result.loc[fvg.timestamp, "fvg_mitigated"] = True
-                        result.loc[fvg.timestamp, "fvg_mitigation_index"] = i
-                        break
+                if self._is_mitigating(fvg, candle["high"], candle["low"]):
+                    fvg.mitigated = True
+                    fvg.mitigation_index = i
+                    result.loc[fvg.timestamp, "fvg_mitigated"] = True
+                    result.loc[fvg.timestamp, "fvg_mitigation_index"] = i
+                    break
+    
+    def _is_mitigating(self, fvg: FVG, high: float, low: float) -> bool:
+        """Check if a candle after the FVG trades through it"""
+        if fvg.direction == FVGDirection.BULLISH:
+            return low <= fvg.bottom
+        return high >= fvg.top
     
     def _join_consecutive_fvgs(self, result: pd.DataFrame) -> pd.DataFrame:
         """Join consecutive FVGs of same direction into single larger FVG"""
@@ -232,12 +346,35 @@ class FVGDetector:
         result["fvg_mitigation_index"] = np.nan
         return result
     
-    def get_active_fvgs(self, direction: Optional[FVGDirection] = None) -> list[FVG]:
-        """Get all unmitigated FVGs, optionally filtered by direction"""
-        active = [f for f in self._fvgs if not f.mitigated]
+    def get_fvgs(self, direction: Optional[FVGDirection] = None) -> list[FVG]:
+        """Get all FVGs in creation order, mitigated or not, optionally filtered by direction"""
         if direction:
-            active = [f for f in active if f.direction == direction]
-        return active
+            return [f for f in self._fvgs if f.direction == direction]
+        return list(self._fvgs)
+    
+    def get_active_fvgs(self, direction: Optional[FVGDirection] = None) -> tuple[FVG, ...]:
+        """
+        Get all unmitigated FVGs, optionally filtered by direction.
+        
+        The tuple is memoized until the next detect() or update(), so repeated
+        calls share it; use as_arrays() for the same FVGs as NumPy columns.
+        """
+        cached = self._active_cache.get(direction)
+        if cached is None:
+            cached = tuple(
+                f for f in self._fvgs
+                if not f.mitigated and (not direction or f.direction == direction)
+            )
+            self._active_cache[direction] = cached
+        return cached
+    
+    def as_arrays(self, direction: Optional[FVGDirection] = None) -> FVGArrays:
+        """Get the unmitigated FVGs as parallel NumPy arrays, aligned with get_active_fvgs()"""
+        arrays = self._arrays_cache.get(direction)
+        if arrays is None:
+            arrays = FVGArrays.from_fvgs(self.get_active_fvgs(direction))
+            self._arrays_cache[direction] = arrays
+        return arrays
     
     def get_nearest_fvg(
         self, price: float, direction: FVGDirection
@@ -6,7 +6,7 @@ and Change of Character (CHoCH).
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import NamedTuple, Optional
 import pandas as pd
 import numpy as np
 
@@ -40,6 +40,22 @@ class SwingPoint:
     broken_by: Optional[int] = None
 
 
+class SwingArrays(NamedTuple):
+    """Column (struct-of-arrays) view of the detected swings, in swing order"""
+    index: np.ndarray  # int64 bar positions
+    price: np.ndarray  # float64 swing prices
+    swing_type: np.ndarray  # int8 SwingType values (1 = high, -1 = low)
+    
+    @classmethod
+    def from_swings(cls, swings: list[SwingPoint]) -> "SwingArrays":
+        n = len(swings)
+        return cls(
+            index=np.fromiter((s.index for s in swings), dtype=np.int64, count=n),
+            price=np.fromiter((s.price for s in swings), dtype=np.float64, count=n),
+            swing_type=np.fromiter((s.swing_type.value for s in swings), dtype=np.int8, count=n),
+        )
+
+
 @dataclass
 class StructureBreak:
     """Represents a structure break (BOS, SMS, or CHoCH)"""
@@ -346,6 +362,10 @@ class MarketStructureAnalyzer:
         """Get all unbroken (protected) swing points"""
         return [s for s in self._swings if not s.broken]
     
+    def get_protected_swing_arrays(self) -> SwingArrays:
+        """Get the unbroken (protected) swing points as parallel NumPy arrays"""
+        return SwingArrays.from_swings(self.get_protected_swings())
+    
     def get_latest_structure_break(self) -> Optional[StructureBreak]:
         """Get the most recent structure break"""
         return self._breaks[-1] if self._breaks else None
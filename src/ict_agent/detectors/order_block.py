@@ -4,6 +4,7 @@ Detects institutional order blocks - the last opposite-colored candle before
 a strong displacement move.
 """
 
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
 from typing import Optional
@@ -32,6 +33,7 @@ class OrderBlock:
     volume: float
     mitigated: bool = False
     mitigation_index: Optional[int] = None
+    displacement_pips: Optional[float] = None
     
     @property
     def is_valid(self) -> bool:
@@ -67,6 +69,12 @@ class OrderBlockDetector:
         self.lookback = lookback
         self.close_mitigation = close_mitigation
         self._order_blocks: list[OrderBlock] = []
+        
+        # Streaming state for update(): bars seen, the latest lookback + 1 bars
+        # as (timestamp, open, high, low, close, volume), and unmitigated OBs
+        self._bar_count = 0
+        self._recent_bars: deque = deque(maxlen=lookback + 1)
+        self._live_obs: list[OrderBlock] = []
     
     def detect(self, ohlc: pd.DataFrame) -> pd.DataFrame:
         """
@@ -103,17 +111,106 @@ class OrderBlockDetector:
             if is_bullish_candle and candle_range >= min_displacement:
                 ob_idx = self._find_last_bearish_candle(ohlc, i)
                 if ob_idx is not None:
-                    self._record_ob(result, ohlc, ob_idx, OBDirection.BULLISH, has_volume)
+                    self._record_ob(
+                        result, ohlc, ob_idx, OBDirection.BULLISH, has_volume, candle_range
+                    )
             
             elif is_bearish_candle and candle_range >= min_displacement:
                 ob_idx = self._find_last_bullish_candle(ohlc, i)
                 if ob_idx is not None:
-                    self._record_ob(result, ohlc, ob_idx, OBDirection.BEARISH, has_volume)
+                    self._record_ob(
+                        result, ohlc, ob_idx, OBDirection.BEARISH, has_volume, candle_range
+                    )
         
         self._check_mitigation(ohlc, result)
+        self._prime_stream(ohlc)
         
         return result
     
+    def update(
+        self,
+        timestamp: pd.Timestamp,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+    ) -> Optional[OrderBlock]:
+        """
+        Process one new candle appended after the data seen so far.
+        
+        Streaming counterpart to detect(): it continues from the last detect()
+        call on at least three candles (or from a fresh detector) and leaves the
+        Order Blocks in the same state detect() would produce on the extended
+        data, touching only the new candle and the lookback window.
+        
+        Returns:
+            The Order Block recorded on this candle, if any
+        """
+        index = self._bar_count
+        
+        for ob in self._live_obs:
+            if self._is_mitigating(ob, high, low, close):
+                ob.mitigated = True
+                ob.mitigation_index = index
+        self._live_obs = [ob for ob in self._live_obs if not ob.mitigated]
+        
+        self._recent_bars.append((timestamp, open_price, high, low, close, volume))
+        self._bar_count += 1
+        
+        if index < 1:
+            return None
+        
+        candle_range = high - low
+        min_displacement = self.min_displacement_pips * self.pip_size
+        if candle_range < min_displacement or close == open_price:
+            return None
+        
+        # Bullish displacement follows the last down candle, bearish the last up candle
+        direction = OBDirection.BULLISH if close > open_price else OBDirection.BEARISH
+        offset = index + 1 - len(self._recent_bars)
+        
+        for i in range(index - 1, max(0, index - self.lookback) - 1, -1):
+            ts, o, h, l, c, v = self._recent_bars[i - offset]
+            if (c < o) if direction == OBDirection.BULLISH else (c > o):
+                ob = self._build_ob(i, ts, direction, o, h, l, c, v, candle_range)
+                self._order_blocks.append(ob)
+                
+                # Catch up on mitigation by the candles after the OB
+                for j in range(i + 1, index + 1):
+                    _, _, h, l, c, _ = self._recent_bars[j - offset]
+                    if self._is_mitigating(ob, h, l, c):
+                        ob.mitigated = True
+                        ob.mitigation_index = j
+                        break
+                else:
+                    self._live_obs.append(ob)
+                
+                return ob
+        
+        return None
+    
+    def _prime_stream(self, ohlc: pd.DataFrame) -> None:
+        """Seed update() state from the data just passed to detect()"""
+        tail = ohlc.iloc[-self._recent_bars.maxlen:]
+        if "volume" in tail.columns:
+            volume = tail["volume"].to_numpy(dtype=np.float64)
+        else:
+            volume = np.zeros(len(tail))
+        self._bar_count = len(ohlc)
+        self._recent_bars = deque(
+            zip(
+                tail.index,
+                tail["open"].to_numpy(),
+                tail["high"].to_numpy(),
+                tail["low"].to_numpy(),
+                tail["close"].to_numpy(),
+                volume,
+            ),
+            maxlen=self._recent_bars.maxlen,
+        )
+        self._live_obs = [ob for ob in self._order_blocks if not ob.mitigated]
+    
     def _find_last_bearish_candle(
         self, ohlc: pd.DataFrame, displacement_idx: int
     ) -> Optional[int]:
@@ -147,36 +244,74 @@ class OrderBlockDetector:
         index: int,
         direction: OBDirection,
         has_volume: bool,
+        displacement_range: float,
     ) -> None:
         """Record Order Block in result DataFrame and internal list"""
         candle = ohlc.iloc[index]
         idx = ohlc.index[index]
-        
-        body_top = max(candle["open"], candle["close"])
-        body_bottom = min(candle["open"], candle["close"])
-        midpoint = (body_top + body_bottom) / 2
         volume = candle["volume"] if has_volume else 0
         
+        ob = self._build_ob(
+            index,
+            idx,
+            direction,
+            candle["open"],
+            candle["high"],
+            candle["low"],
+            candle["close"],
+            volume,
+            displacement_range,
+        )
+        
         result.loc[idx, "ob_direction"] = direction.value
-        result.loc[idx, "ob_top"] = candle["high"]
-        result.loc[idx, "ob_bottom"] = candle["low"]
-        result.loc[idx, "ob_midpoint"] = midpoint
+        result.loc[idx, "ob_top"] = ob.high
+        result.loc[idx, "ob_bottom"] = ob.low
+        result.loc[idx, "ob_midpoint"] = ob.midpoint
         result.loc[idx, "ob_volume"] = volume
         
-        ob = OrderBlock(
+        self._order_blocks.append(ob)
+    
+    def _build_ob(
+        self,
+        index: int,
+        timestamp: pd.Timestamp,
+        direction: OBDirection,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+        displacement_range: float,
+    ) -> OrderBlock:
+        """Build an Order Block from its candle and the range of its displacement candle"""
+        body_top = max(open_price, close)
+        body_bottom = min(open_price, close)
+        
+        return OrderBlock(
             index=index,
-            timestamp=idx,
+            timestamp=timestamp,
             direction=direction,
-            open_price=candle["open"],
-            close_price=candle["close"],
-            high=candle["high"],
-            low=candle["low"],
+            open_price=open_price,
+            close_price=close,
+            high=high,
+            low=low,
             body_top=body_top,
             body_bottom=body_bottom,
-            midpoint=midpoint,
+            midpoint=(body_top + body_bottom) / 2,
             volume=volume,
+            displacement_pips=displacement_range / self.pip_size,
         )
-        self._order_blocks.append(ob)
+    
+    def _is_mitigating(self, ob: OrderBlock, high: float, low: float, close: float) -> bool:
+        """Check if a candle after the Order Block mitigates it"""
+        if self.close_mitigation:
+            test_price = close
+        else:
+            test_price = low if ob.direction == OBDirection.BULLISH else high
+        
+        if ob.direction == OBDirection.BULLISH:
+            return test_price <= ob.body_bottom
+        return test_price >= ob.body_top
     
     def _check_mitigation(self, ohlc: pd.DataFrame, result: pd.DataFrame) -> None:
         """Check if Order Blocks have been mitigated"""
@@ -184,23 +319,11 @@ class OrderBlockDetector:
             for i in range(ob.index + 1, len(ohlc)):
                 candle = ohlc.iloc[i]
                 
-                if self.close_mitigation:
-                    test_price = candle["close"]
-                else:
-                    test_price = candle["low"] if ob.direction == OBDirection.BULLISH else candle["high"]
-                
-                if ob.direction == OBDirection.BULLISH:
-                    if test_price <= ob.body_bottom:
-                        ob.mitigated = True
-                        ob.mitigation_index = i
-                        result.loc[ob.timestamp, "ob_mitigated"] = True
-                        break
-                else:
-                    if test_price >= ob.body_top:
-                        ob.mitigated = True
-                        ob.mitigation_index = i
-                        result.loc[ob.timestamp, "ob_mitigated"] = True
-                        break
+                if self._is_mitigating(ob, candle["high"], candle["low"], candle["close"]):
+                    ob.mitigated = True
+                    ob.mitigation_index = i
+                    result.loc[ob.timestamp, "ob_mitigated"] = True
+                    break
     
     def _empty_result(self, ohlc: pd.DataFrame) -> pd.DataFrame:
         """Return empty result DataFrame"""
@@ -11,6 +11,15 @@ from typing import Optional
 import pandas as pd
 
 
+_US_PER_HOUR = 3_600_000_000
+_US_PER_DAY = 24 * _US_PER_HOUR
+
+
+def _time_to_us(t: time) -> int:
+    """Microseconds since midnight for a wall-clock time"""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
 class Killzone(Enum):
     ASIA = "asia"
     LONDON = "london"
@@ -133,6 +142,13 @@ class KillzoneManager:
     
     def __init__(self, timezone_offset: int = -5):
         self.timezone_offset = timezone_offset
+        
+        # Killzone bounds as microseconds of the EST day, in KILLZONES order
+        self._offset_us = timezone_offset * _US_PER_HOUR
+        self._window_bounds = tuple(
+            (kz, _time_to_us(window.start), _time_to_us(window.end))
+            for kz, window in self.KILLZONES.items()
+        )
     
     def get_current_killzone(self, dt: datetime) -> Optional[Killzone]:
         """Get the active killzone for given datetime (in EST)"""
@@ -144,6 +160,24 @@ class KillzoneManager:
         
         return None
     
+    def get_current_killzone_ts(self, ts: pd.Timestamp) -> Optional[Killzone]:
+        """
+        Same as get_current_killzone, for a pandas Timestamp.
+        
+        Works on the Timestamp's UTC epoch value (naive timestamps are UTC), so
+        no datetime conversion is needed per call.
+        """
+        t = (ts.value // 1000 + self._offset_us) % _US_PER_DAY
+        
+        for kz, start, end in self._window_bounds:
+            if start <= end:
+                if start <= t <= end:
+                    return kz
+            elif t >= start or t <= end:
+                return kz
+        
+        return None
+    
     def is_in_killzone(
         self, dt: datetime, killzone: Optional[Killzone] = None
     ) -> bool:
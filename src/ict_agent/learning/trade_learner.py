@@ -104,16 +104,18 @@ class TradeLearner:
         
         # Connect to KnowledgeManager for concept lookups
         self._knowledge_manager = None
+        self._knowledge_unavailable = False
     
     @property
     def knowledge(self):
         """Lazy-load knowledge manager to avoid circular imports"""
-        if self._knowledge_manager is None:
+        if self._knowledge_manager is None and not self._knowledge_unavailable:
             try:
                 from ict_agent.learning.knowledge_manager import get_knowledge_manager
                 self._knowledge_manager = get_knowledge_manager()
             except ImportError:
-                pass
+                # Remember the miss so recall paths don't retry the import every call
+                self._knowledge_unavailable = True
         return self._knowledge_manager
     
     def _load_lessons(self) -> List[TradeLesson]:
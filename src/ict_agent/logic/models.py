@@ -19,16 +19,11 @@ def is_valid_displacement_leg(candles, direction, strict_mode=True):
     Returns:
         bool: True if displacement is valid
     """
-    has_fvg = False
-    
     # 1. Check for Fair Value Gap (The Signature)
-    # Logic to detect FVG in the leg sequence
-    # (Simplified representation of FVG detection logic)
-    for i in range(1, len(candles) - 1):
-        # Placeholder for actual FVG math:
-        # if direction == 'LONG' and candles[i+1].low > candles[i-1].high: has_fvg = True
-        pass 
-            
+    # FVG detection over the leg is not implemented yet. The real check is:
+    # if direction == 'LONG' and candles[i+1].low > candles[i-1].high: has_fvg = True
+    # No per-candle loop runs until it ships - an empty scan is pure overhead.
+
     # In strict mode, NO FVG = NO DISPLACEMENT
     # Displacement is not just 'moving fast', it is 'leaving imbalance'
     # if strict_mode and not has_fvg:
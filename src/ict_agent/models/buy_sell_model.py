@@ -20,18 +20,147 @@ Leg Structure:
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple
+import weakref
 import pandas as pd
 import numpy as np
 
 from ict_agent.detectors.market_structure import (
     MarketStructureAnalyzer,
     StructureType,
+    SwingArrays,
     SwingPoint,
     SwingType,
 )
-from ict_agent.detectors.fvg import FVGDetector, FVG, FVGDirection
+from ict_agent.detectors.fvg import FVG, FVGDetector, FVGDirection
 from ict_agent.detectors.displacement import DisplacementDetector
+from ict_agent._compat import DATACLASS_SLOTS
+from ict_agent._njit import njit
+
+
+@njit(cache=True)
+def _find_equal_pairs(prices: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Pair each price with the first later price within tolerance.
+    
+    Returns a (k, 2) array of (i, j) index pairs with j > i, one per i at most,
+    in order of i. Runs as a short-circuiting loop, so no n x n matrix is built.
+    """
+    n = prices.shape[0]
+    pairs = np.empty((n, 2), dtype=np.int64)
+    count = 0
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            if abs(prices[i] - prices[j]) < tolerance:
+                pairs[count, 0] = i
+                pairs[count, 1] = j
+                count += 1
+                break
+    return pairs[:count]
+
+
+@njit(cache=True)
+def _fused_scan(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    swing_length: int,
+    min_gap: float,
+):
+    """
+    Single pass over OHLC computing everything the Buy/Sell Model consumes.
+    
+    Mirrors MarketStructureAnalyzer swing detection and FVGDetector gap and
+    mitigation rules, without building the per-bar result DataFrames. The
+    tests pin its output to those detectors.
+    
+    Returns:
+        (swing_idx, swing_type, swing_price,
+         fvg_idx, fvg_dir, fvg_top, fvg_bottom, fvg_mitigated)
+    """
+    n = high.shape[0]
+    swing_idx = np.empty(2 * n, dtype=np.int64)
+    swing_type = np.empty(2 * n, dtype=np.int8)
+    swing_price = np.empty(2 * n, dtype=np.float64)
+    n_swings = 0
+    
+    fvg_idx = np.empty(n, dtype=np.int64)
+    fvg_dir = np.empty(n, dtype=np.int8)
+    fvg_top = np.empty(n, dtype=np.float64)
+    fvg_bottom = np.empty(n, dtype=np.float64)
+    fvg_mitigated = np.zeros(n, dtype=np.bool_)
+    n_fvgs = 0
+    
+    for i in range(n):
+        # Mitigation of earlier gaps by this bar (first touch only)
+        for k in range(n_fvgs):
+            if fvg_mitigated[k]:
+                continue
+            if fvg_dir[k] == 1:
+                if low[i] <= fvg_bottom[k]:
+                    fvg_mitigated[k] = True
+            elif high[i] >= fvg_top[k]:
+                fvg_mitigated[k] = True
+        
+        # Swing high / low with swing_length bars on each side
+        if swing_length <= i < n - swing_length:
+            is_high = True
+            is_low = True
+            for j in range(i - swing_length, i + swing_length + 1):
+                if j == i:
+                    continue
+                if high[j] >= high[i]:
+                    is_high = False
+                if low[j] <= low[i]:
+                    is_low = False
+            if is_high:
+                swing_idx[n_swings] = i
+                swing_type[n_swings] = 1
+                swing_price[n_swings] = high[i]
+                n_swings += 1
+            if is_low:
+                swing_idx[n_swings] = i
+                swing_type[n_swings] = -1
+                swing_price[n_swings] = low[i]
+                n_swings += 1
+        
+        # Fair value gap completed by this bar (bullish takes precedence)
+        if i >= 2:
+            mid_body = abs(close[i - 1] - open_[i - 1])
+            if (
+                low[i] > high[i - 2]
+                and low[i] - high[i - 2] >= min_gap
+                and close[i - 1] > open_[i - 1]
+                and mid_body > 0
+            ):
+                fvg_idx[n_fvgs] = i
+                fvg_dir[n_fvgs] = 1
+                fvg_top[n_fvgs] = low[i]
+                fvg_bottom[n_fvgs] = high[i - 2]
+                n_fvgs += 1
+            elif (
+                low[i - 2] > high[i]
+                and low[i - 2] - high[i] >= min_gap
+                and close[i - 1] < open_[i - 1]
+                and mid_body > 0
+            ):
+                fvg_idx[n_fvgs] = i
+                fvg_dir[n_fvgs] = -1
+                fvg_top[n_fvgs] = low[i - 2]
+                fvg_bottom[n_fvgs] = high[i]
+                n_fvgs += 1
+    
+    return (
+        swing_idx[:n_swings],
+        swing_type[:n_swings],
+        swing_price[:n_swings],
+        fvg_idx[:n_fvgs],
+        fvg_dir[:n_fvgs],
+        fvg_top[:n_fvgs],
+        fvg_bottom[:n_fvgs],
+        fvg_mitigated[:n_fvgs],
+    )
 
 
 class ModelType(Enum):
@@ -53,7 +182,14 @@ class LegType(Enum):
     TERMINUS = "terminus"  # The reversal point
 
 
-@dataclass
+# ACC/DIS zone label for each model direction
+ZONE_TYPE_BY_MODEL = {
+    ModelType.SELL_MODEL: "acc_turn_dis",
+    ModelType.BUY_MODEL: "dis_turn_acc",
+}
+
+
+@dataclass(**DATACLASS_SLOTS)
 class LiquidityLevel:
     """Represents a liquidity level (ERL or IRL)"""
     price: float
@@ -64,7 +200,7 @@ class LiquidityLevel:
     swept_at: Optional[pd.Timestamp] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ModelLeg:
     """Represents a leg in the Buy/Sell Model"""
     leg_type: LegType
@@ -80,7 +216,7 @@ class ModelLeg:
     is_complete: bool = False
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class AccDisZone:
     """Accumulation turns Distribution zone"""
     zone_type: str  # "acc_turn_dis" or "dis_turn_acc"
@@ -93,7 +229,7 @@ class AccDisZone:
     mitigated: bool = False
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class BuySellModelState:
     """Complete state of a Buy/Sell Model"""
     model_type: ModelType
@@ -147,17 +283,29 @@ class BuySellModelDetector:
         min_leg_pips: float = 20.0,
         pip_size: float = 0.0001,
         acc_dis_threshold: float = 0.382,  # Fib level for zone detection
+        min_fvg_pips: float = 5.0,
     ):
         self.swing_length = swing_length
         self.min_leg_pips = min_leg_pips
         self.pip_size = pip_size
         self.acc_dis_threshold = acc_dis_threshold
+        self.min_fvg_pips = min_fvg_pips
         
+        # Swing and FVG rules; analyze() applies them in one fused pass with
+        # these detectors' settings instead of running each over the frame
         self.structure_analyzer = MarketStructureAnalyzer(swing_length=swing_length)
-        self.fvg_detector = FVGDetector(pip_size=pip_size)
+        self.fvg_detector = FVGDetector(min_gap_pips=min_fvg_pips, pip_size=pip_size)
         
         self._current_model: Optional[BuySellModelState] = None
         self._liquidity_levels: List[LiquidityLevel] = []
+        # External SSL sorted lowest first, external BSL sorted highest first
+        self._ssl_levels: List[LiquidityLevel] = []
+        self._bsl_levels: List[LiquidityLevel] = []
+        self._ohlc_ns: np.ndarray = np.empty(0, dtype=np.int64)
+        # Active FVGs per direction with a parallel (sorted) array of bar indices
+        self._active_fvgs: Dict[FVGDirection, Tuple[List[FVG], np.ndarray]] = {}
+        # Last analyze() call as (weakref to the frame, its fingerprint, htf_bias, result)
+        self._last_analysis: Optional[tuple] = None
     
     def analyze(
         self,
@@ -177,22 +325,44 @@ class BuySellModelDetector:
         if len(ohlc) < self.swing_length * 3:
             return None
         
-        # Analyze market structure
-        structure_df = self.structure_analyzer.analyze(ohlc)
-        swings = self.structure_analyzer._swings  # Access internal swings list
-        
-        # Detect FVGs
-        fvg_df = self.fvg_detector.detect(ohlc)
+        # The very same DataFrame with the same last bar and bias - reuse the
+        # result. Appending a bar or updating the forming bar in place reruns.
+        current_price = float(ohlc["close"].to_numpy()[-1])
+        fingerprint = (
+            len(ohlc),
+            ohlc.index[-1],
+            ohlc["high"].to_numpy()[-1],
+            ohlc["low"].to_numpy()[-1],
+            current_price,
+        )
+        last = self._last_analysis
+        if (
+            last is not None
+            and last[0]() is ohlc
+            and last[1] == fingerprint
+            and last[2] == htf_bias
+        ):
+            return last[3]
+        
+        # Bar timestamps as int64 nanoseconds for binary-search lookups
+        self._ohlc_ns = ohlc.index.as_unit("ns").asi8
+        
+        # Swings and FVGs in one pass over the OHLC arrays
+        swings, swing_arrays = self._scan_structure(ohlc)
+        
+        # One boolean mask over the swing-type column drives every high/low split
+        is_high = swing_arrays.swing_type == SwingType.HIGH.value
+        highs, lows = self._split_swings(swings, is_high)
         
         # Identify liquidity levels
-        self._identify_liquidity_levels(ohlc, swings)
+        self._identify_liquidity_levels(ohlc, highs, lows, swing_arrays, is_high)
         
         # Detect model based on structure
-        model = self._detect_model(ohlc, swings, htf_bias)
+        model = self._detect_model(ohlc, swings, swing_arrays, is_high, htf_bias, current_price)
         
         if model:
             # Identify legs
-            self._identify_legs(ohlc, model, swings)
+            self._identify_legs(ohlc, model, swings, swing_arrays, is_high)
             
             # Identify ACC/DIS zones
             self._identify_acc_dis_zones(ohlc, model)
@@ -205,13 +375,17 @@ class BuySellModelDetector:
             
             self._current_model = model
         
+        self._last_analysis = (weakref.ref(ohlc), fingerprint, htf_bias, model)
         return model
     
     def _detect_model(
         self,
         ohlc: pd.DataFrame,
         swings: List[SwingPoint],
+        swing_arrays: SwingArrays,
+        is_high: np.ndarray,
         htf_bias: Optional[str],
+        current_price: float,
     ) -> Optional[BuySellModelState]:
         """Detect if we're in a Buy or Sell model"""
         
@@ -219,61 +393,78 @@ class BuySellModelDetector:
             return None
         
         recent_swings = swings[-10:]  # Look at last 10 swings
+        recent_is_high = is_high[-10:]
+        highs, lows = self._split_swings(recent_swings, recent_is_high)
+        recent_indices = swing_arrays.index[-10:]
+        high_indices = recent_indices[recent_is_high]
+        low_indices = recent_indices[~recent_is_high]
         
         # Check for Sell Model: HH followed by structural break down
         # Pattern: HL → HH (terminus) → LH → LL (confirmation)
-        sell_model = self._check_sell_model_formation(recent_swings, ohlc)
+        sell_model = self._check_sell_model_formation(highs, lows, high_indices, low_indices)
         if sell_model:
             return sell_model
         
         # Check for Buy Model: LL followed by structural break up
         # Pattern: LH → LL (terminus) → HL → HH (confirmation)
-        buy_model = self._check_buy_model_formation(recent_swings, ohlc)
+        buy_model = self._check_buy_model_formation(highs, lows, high_indices, low_indices)
         if buy_model:
             return buy_model
         
         # If HTF bias provided, look for forming model
         if htf_bias == "bearish":
-            return self._check_forming_sell_model(recent_swings, ohlc)
+            return self._check_forming_sell_model(highs, current_price)
         elif htf_bias == "bullish":
-            return self._check_forming_buy_model(recent_swings, ohlc)
+            return self._check_forming_buy_model(lows, current_price)
         
         return None
     
+    @staticmethod
+    def _split_swings(
+        swings: List[SwingPoint],
+        is_high: np.ndarray,
+    ) -> Tuple[List[SwingPoint], List[SwingPoint]]:
+        """Split swings into (highs, lows) by a parallel boolean mask, preserving order"""
+        highs = [swings[i] for i in np.flatnonzero(is_high)]
+        lows = [swings[i] for i in np.flatnonzero(~is_high)]
+        return highs, lows
+    
     def _check_sell_model_formation(
         self,
-        swings: List[SwingPoint],
-        ohlc: pd.DataFrame,
+        highs: List[SwingPoint],
+        lows: List[SwingPoint],
+        high_indices: np.ndarray,
+        low_indices: np.ndarray,
     ) -> Optional[BuySellModelState]:
         """Check for confirmed Sell Model"""
         
         # Find potential terminus (highest high after accumulation)
-        highs = [s for s in swings if s.swing_type == SwingType.HIGH]
-        lows = [s for s in swings if s.swing_type == SwingType.LOW]
-        
         if len(highs) < 2 or len(lows) < 2:
             return None
         
+        # Swings are chronological, so later/earlier swings are found by bisection
+        
         # Look for HH that gets followed by LH and LL (structure break)
         for i in range(len(highs) - 1):
             potential_terminus = highs[i]
+            terminus_bar = potential_terminus.index
             
             # Check if there's a lower high after this
-            later_highs = [h for h in highs if h.index > potential_terminus.index]
-            later_lows = [l for l in lows if l.index > potential_terminus.index]
+            next_high_pos = int(np.searchsorted(high_indices, terminus_bar, side="right"))
+            next_low_pos = int(np.searchsorted(low_indices, terminus_bar, side="right"))
             
-            if not later_highs or not later_lows:
+            if next_high_pos == len(highs) or next_low_pos == len(lows):
                 continue
             
             # Is the next high lower? (LH confirmation)
-            if later_highs[0].price < potential_terminus.price:
+            if highs[next_high_pos].price < potential_terminus.price:
                 # Is there a lower low? (Structure break confirmation)
-                pre_terminus_lows = [l for l in lows if l.index < potential_terminus.index]
-                if pre_terminus_lows:
-                    last_hl = pre_terminus_lows[-1]
+                pre_terminus_count = int(np.searchsorted(low_indices, terminus_bar, side="left"))
+                if pre_terminus_count:
+                    last_hl = lows[pre_terminus_count - 1]
                     
                     # Check if we broke below the HL
-                    if later_lows[0].price < last_hl.price:
+                    if lows[next_low_pos].price < last_hl.price:
                         # SELL MODEL CONFIRMED
                         return BuySellModelState(
                             model_type=ModelType.SELL_MODEL,
@@ -287,35 +478,35 @@ class BuySellModelDetector:
     
     def _check_buy_model_formation(
         self,
-        swings: List[SwingPoint],
-        ohlc: pd.DataFrame,
+        highs: List[SwingPoint],
+        lows: List[SwingPoint],
+        high_indices: np.ndarray,
+        low_indices: np.ndarray,
     ) -> Optional[BuySellModelState]:
         """Check for confirmed Buy Model"""
         
-        highs = [s for s in swings if s.swing_type == SwingType.HIGH]
-        lows = [s for s in swings if s.swing_type == SwingType.LOW]
-        
         if len(highs) < 2 or len(lows) < 2:
             return None
         
         # Look for LL that gets followed by HL and HH (structure break)
         for i in range(len(lows) - 1):
             potential_terminus = lows[i]
+            terminus_bar = potential_terminus.index
             
-            later_lows = [l for l in lows if l.index > potential_terminus.index]
-            later_highs = [h for h in highs if h.index > potential_terminus.index]
+            next_low_pos = int(np.searchsorted(low_indices, terminus_bar, side="right"))
+            next_high_pos = int(np.searchsorted(high_indices, terminus_bar, side="right"))
             
-            if not later_lows or not later_highs:
+            if next_low_pos == len(lows) or next_high_pos == len(highs):
                 continue
             
             # Is the next low higher? (HL confirmation)
-            if later_lows[0].price > potential_terminus.price:
+            if lows[next_low_pos].price > potential_terminus.price:
                 # Is there a higher high? (Structure break confirmation)
-                pre_terminus_highs = [h for h in highs if h.index < potential_terminus.index]
-                if pre_terminus_highs:
-                    last_lh = pre_terminus_highs[-1]
+                pre_terminus_count = int(np.searchsorted(high_indices, terminus_bar, side="left"))
+                if pre_terminus_count:
+                    last_lh = highs[pre_terminus_count - 1]
                     
-                    if later_highs[0].price > last_lh.price:
+                    if highs[next_high_pos].price > last_lh.price:
                         # BUY MODEL CONFIRMED
                         return BuySellModelState(
                             model_type=ModelType.BUY_MODEL,
@@ -329,19 +520,19 @@ class BuySellModelDetector:
     
     def _check_forming_sell_model(
         self,
-        swings: List[SwingPoint],
-        ohlc: pd.DataFrame,
+        highs: List[SwingPoint],
+        current_price: float,
     ) -> Optional[BuySellModelState]:
         """Check for forming (not yet confirmed) Sell Model"""
         
-        highs = [s for s in swings if s.swing_type == SwingType.HIGH]
-        
         if not highs:
             return None
         
         # The most recent significant high could be the terminus
-        recent_high = max(highs[-3:], key=lambda x: x.price) if len(highs) >= 3 else highs[-1]
-        current_price = ohlc['close'].iloc[-1]
+        recent_high = highs[-1]
+        if len(highs) >= 3:
+            tail_prices = np.array([highs[-3].price, highs[-2].price, highs[-1].price])
+            recent_high = highs[len(highs) - 3 + int(tail_prices.argmax())]
         
         # If price is below the recent high, we might be in manipulation/distribution
         if current_price < recent_high.price:
@@ -357,18 +548,18 @@ class BuySellModelDetector:
     
     def _check_forming_buy_model(
         self,
-        swings: List[SwingPoint],
-        ohlc: pd.DataFrame,
+        lows: List[SwingPoint],
+        current_price: float,
     ) -> Optional[BuySellModelState]:
         """Check for forming (not yet confirmed) Buy Model"""
         
-        lows = [s for s in swings if s.swing_type == SwingType.LOW]
-        
         if not lows:
             return None
         
-        recent_low = min(lows[-3:], key=lambda x: x.price) if len(lows) >= 3 else lows[-1]
-        current_price = ohlc['close'].iloc[-1]
+        recent_low = lows[-1]
+        if len(lows) >= 3:
+            tail_prices = np.array([lows[-3].price, lows[-2].price, lows[-1].price])
+            recent_low = lows[len(lows) - 3 + int(tail_prices.argmin())]
         
         if current_price > recent_low.price:
             return BuySellModelState(
@@ -386,32 +577,40 @@ class BuySellModelDetector:
         ohlc: pd.DataFrame,
         model: BuySellModelState,
         swings: List[SwingPoint],
+        swing_arrays: SwingArrays,
+        is_high: np.ndarray,
     ) -> None:
         """Identify L1, L2, L3 legs in the model"""
         
         if model.terminus_time is None:
             return
         
-        terminus_idx = ohlc.index.get_loc(model.terminus_time) if model.terminus_time in ohlc.index else None
-        if terminus_idx is None:
-            # Find closest index
-            terminus_idx = ohlc.index.searchsorted(model.terminus_time)
+        # Exact bar position, or the closest (insertion) index if absent
+        terminus_idx, _ = self._bar_position(model.terminus_time)
         
-        post_terminus_swings = [s for s in swings if s.index > terminus_idx]
+        first_post = int(np.searchsorted(swing_arrays.index, terminus_idx, side="right"))
+        post_terminus_swings = swings[first_post:]
+        
+        swing_highs, swing_lows = self._split_swings(post_terminus_swings, is_high[first_post:])
         
         if model.model_type == ModelType.SELL_MODEL:
             # For sell model, legs are defined by swing lows (distribution points)
-            swing_lows = [s for s in post_terminus_swings if s.swing_type == SwingType.LOW]
-            swing_highs = [s for s in post_terminus_swings if s.swing_type == SwingType.HIGH]
-            
             self._create_legs_from_swings(ohlc, model, swing_lows, swing_highs, is_sell=True)
         else:
             # For buy model, legs are defined by swing highs (distribution points)
-            swing_lows = [s for s in post_terminus_swings if s.swing_type == SwingType.LOW]
-            swing_highs = [s for s in post_terminus_swings if s.swing_type == SwingType.HIGH]
-            
             self._create_legs_from_swings(ohlc, model, swing_highs, swing_lows, is_sell=False)
     
+    def _bar_position(self, ts: pd.Timestamp) -> Tuple[int, bool]:
+        """
+        Locate a timestamp among the analyzed bars with one binary search.
+        
+        Returns (position, is_exact): the bar position on an exact match,
+        otherwise the insertion point.
+        """
+        pos = int(np.searchsorted(self._ohlc_ns, ts.value))
+        is_exact = pos < len(self._ohlc_ns) and self._ohlc_ns[pos] == ts.value
+        return pos, is_exact
+    
     def _create_legs_from_swings(
         self,
         ohlc: pd.DataFrame,
@@ -427,27 +626,36 @@ class BuySellModelDetector:
         # Start from terminus
         prev_price = model.terminus_price
         prev_time = model.terminus_time
-        prev_idx = ohlc.index.get_loc(prev_time) if prev_time in ohlc.index else 0
+        pos, is_exact = self._bar_position(prev_time)
+        prev_idx = pos if is_exact else 0
         
-        for i, swing in enumerate(primary_swings[:3]):  # Max 3 legs
+        leg_swings = primary_swings[:3]  # Max 3 legs
+        if not leg_swings:
+            return
+        
+        # Leg extremes for all legs at once: each leg runs from the previous end
+        end_prices = np.array([s.price for s in leg_swings], dtype=np.float64)
+        start_prices = np.concatenate(([prev_price], end_prices[:-1]))
+        leg_highs = np.maximum(start_prices, end_prices)
+        leg_lows = np.minimum(start_prices, end_prices)
+        fvg_direction = FVGDirection.BEARISH if is_sell else FVGDirection.BULLISH
+        
+        for i, swing in enumerate(leg_swings):
             leg = ModelLeg(
-                leg_type=leg_types[i] if i < 3 else LegType.L3,
+                leg_type=leg_types[i],
                 start_index=prev_idx,
                 end_index=swing.index,
                 start_price=prev_price,
                 end_price=swing.price,
                 start_time=prev_time,
                 end_time=swing.timestamp,
-                high=max(prev_price, swing.price),
-                low=min(prev_price, swing.price),
+                high=leg_highs[i],
+                low=leg_lows[i],
                 is_complete=True,
             )
             
             # Find FVGs within this leg
-            leg.fvgs_in_leg = self._find_fvgs_in_range(
-                prev_idx, swing.index, 
-                FVGDirection.BEARISH if is_sell else FVGDirection.BULLISH
-            )
+            leg.fvgs_in_leg = self._find_fvgs_in_range(prev_idx, swing.index, fvg_direction)
             
             model.legs.append(leg)
             
@@ -462,8 +670,57 @@ class BuySellModelDetector:
         direction: FVGDirection,
     ) -> List[FVG]:
         """Find FVGs within an index range"""
-        fvgs = self.fvg_detector.get_active_fvgs(direction)
-        return [f for f in fvgs if start_idx <= f.index <= end_idx]
+        fvgs, fvg_indices = self._active_fvgs[direction]
+        lo = np.searchsorted(fvg_indices, start_idx, side="left")
+        hi = np.searchsorted(fvg_indices, end_idx, side="right")
+        return fvgs[lo:hi]
+    
+    def _scan_structure(
+        self,
+        ohlc: pd.DataFrame,
+    ) -> Tuple[List[SwingPoint], SwingArrays]:
+        """
+        Run the fused OHLC scan and wrap its outputs.
+        
+        Returns the swing points (objects and column arrays) and caches the
+        active FVGs per direction, sorted by bar index, for range lookups.
+        """
+        (
+            swing_idx, swing_type, swing_price,
+            fvg_idx, fvg_dir, fvg_top, fvg_bottom, fvg_mitigated,
+        ) = _fused_scan(
+            ohlc["open"].to_numpy(dtype=np.float64),
+            ohlc["high"].to_numpy(dtype=np.float64),
+            ohlc["low"].to_numpy(dtype=np.float64),
+            ohlc["close"].to_numpy(dtype=np.float64),
+            self.structure_analyzer.swing_length,
+            self.fvg_detector.min_gap_pips * self.fvg_detector.pip_size,
+        )
+        
+        index = ohlc.index
+        swings = [
+            SwingPoint(
+                index=int(i),
+                timestamp=index[i],
+                price=p,
+                swing_type=SwingType.HIGH if t == 1 else SwingType.LOW,
+            )
+            for i, t, p in zip(swing_idx, swing_type, swing_price)
+        ]
+        swing_arrays = SwingArrays(index=swing_idx, price=swing_price, swing_type=swing_type)
+        
+        self._active_fvgs = {}
+        for direction in (FVGDirection.BULLISH, FVGDirection.BEARISH):
+            positions = np.flatnonzero((fvg_dir == direction.value) & ~fvg_mitigated)
+            fvgs = [
+                FVG.from_gap(
+                    int(fvg_idx[k]), direction, fvg_top[k], fvg_bottom[k], index[fvg_idx[k]]
+                )
+                for k in positions
+            ]
+            self._active_fvgs[direction] = (fvgs, fvg_idx[positions])
+        
+        return swings, swing_arrays
     
     def _identify_acc_dis_zones(
         self,
@@ -472,6 +729,10 @@ class BuySellModelDetector:
     ) -> None:
         """Identify ACC turn DIS zones between legs"""
         
+        highs_arr = ohlc["high"].to_numpy()
+        lows_arr = ohlc["low"].to_numpy()
+        zone_type = ZONE_TYPE_BY_MODEL[model.model_type]
+        
         for i, leg in enumerate(model.legs):
             if not leg.is_complete:
                 continue
@@ -485,13 +746,13 @@ class BuySellModelDetector:
                 zone_low = min(leg.end_price, next_leg.start_price)
                 
                 # Expand zone to include wicks in that range
-                zone_range = ohlc.iloc[leg.end_index:next_leg.start_index + 1]
-                if len(zone_range) > 0:
-                    zone_high = max(zone_high, zone_range['high'].max())
-                    zone_low = min(zone_low, zone_range['low'].min())
+                zone_slice = slice(leg.end_index, next_leg.start_index + 1)
+                if next_leg.start_index >= leg.end_index:
+                    zone_high = max(zone_high, highs_arr[zone_slice].max())
+                    zone_low = min(zone_low, lows_arr[zone_slice].min())
                 
                 zone = AccDisZone(
-                    zone_type="acc_turn_dis" if model.model_type == ModelType.SELL_MODEL else "dis_turn_acc",
+                    zone_type=zone_type,
                     top=zone_high,
                     bottom=zone_low,
                     midpoint=(zone_high + zone_low) / 2,
@@ -505,57 +766,64 @@ class BuySellModelDetector:
     def _identify_liquidity_levels(
         self,
         ohlc: pd.DataFrame,
-        swings: List[SwingPoint],
+        highs: List[SwingPoint],
+        lows: List[SwingPoint],
+        swing_arrays: SwingArrays,
+        is_high: np.ndarray,
     ) -> None:
         """Identify External and Internal Range Liquidity levels"""
         
         self._liquidity_levels = []
         
         # External Range Liquidity: Equal highs/lows, old swing points
-        highs = [s for s in swings if s.swing_type == SwingType.HIGH]
-        lows = [s for s in swings if s.swing_type == SwingType.LOW]
+        
+        tolerance = 10 * self.pip_size
         
         # Find equal highs (buy-side liquidity)
-        for i in range(len(highs) - 1):
-            for j in range(i + 1, len(highs)):
-                if abs(highs[i].price - highs[j].price) < 10 * self.pip_size:
-                    self._liquidity_levels.append(LiquidityLevel(
-                        price=max(highs[i].price, highs[j].price),
-                        level_type="equal_highs",
-                        is_external=True,
-                        timestamp=highs[j].timestamp,
-                    ))
-                    break
+        high_prices = swing_arrays.price[is_high]
+        for i, j in _find_equal_pairs(high_prices, tolerance):
+            self._liquidity_levels.append(LiquidityLevel(
+                price=max(highs[i].price, highs[j].price),
+                level_type="equal_highs",
+                is_external=True,
+                timestamp=highs[j].timestamp,
+            ))
         
         # Find equal lows (sell-side liquidity)
-        for i in range(len(lows) - 1):
-            for j in range(i + 1, len(lows)):
-                if abs(lows[i].price - lows[j].price) < 10 * self.pip_size:
-                    self._liquidity_levels.append(LiquidityLevel(
-                        price=min(lows[i].price, lows[j].price),
-                        level_type="equal_lows",
-                        is_external=True,
-                        timestamp=lows[j].timestamp,
-                    ))
-                    break
+        low_prices = swing_arrays.price[~is_high]
+        for i, j in _find_equal_pairs(low_prices, tolerance):
+            self._liquidity_levels.append(LiquidityLevel(
+                price=min(lows[i].price, lows[j].price),
+                level_type="equal_lows",
+                is_external=True,
+                timestamp=lows[j].timestamp,
+            ))
+        
+        # Partition once so target lookups are O(1)
+        self._ssl_levels = sorted(
+            (l for l in self._liquidity_levels
+             if l.level_type in ("equal_lows", "old_low") and l.is_external),
+            key=lambda x: x.price,
+        )
+        self._bsl_levels = sorted(
+            (l for l in self._liquidity_levels
+             if l.level_type in ("equal_highs", "old_high") and l.is_external),
+            key=lambda x: -x.price,
+        )
     
     def _set_target_liquidity(self, model: BuySellModelState) -> None:
         """Set the target liquidity level for the model"""
         
         if model.model_type == ModelType.SELL_MODEL:
             # Target sell-side liquidity (equal lows, old lows)
-            ssl_levels = [l for l in self._liquidity_levels 
-                         if l.level_type in ("equal_lows", "old_low") and l.is_external]
-            if ssl_levels:
+            if self._ssl_levels:
                 # Find the nearest SSL below current price
-                model.target_liquidity = min(ssl_levels, key=lambda x: x.price)
+                model.target_liquidity = self._ssl_levels[0]
                 model.draw_on_liquidity = model.target_liquidity.price
         else:
             # Target buy-side liquidity (equal highs, old highs)
-            bsl_levels = [l for l in self._liquidity_levels
-                         if l.level_type in ("equal_highs", "old_high") and l.is_external]
-            if bsl_levels:
-                model.target_liquidity = max(bsl_levels, key=lambda x: x.price)
+            if self._bsl_levels:
+                model.target_liquidity = self._bsl_levels[0]
                 model.draw_on_liquidity = model.target_liquidity.price
     
     def _calculate_confidence(self, model: BuySellModelState) -> float:
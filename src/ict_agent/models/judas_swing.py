@@ -12,9 +12,10 @@ from ict_agent.detectors.liquidity import LiquidityDetector, LiquidityType, Liqu
 from ict_agent.detectors.displacement import DisplacementDetector, DisplacementDirection
 from ict_agent.detectors.fvg import FVGDetector, FVGDirection
 from ict_agent.detectors.market_structure import MarketStructureAnalyzer, StructureType
+from ict_agent._compat import DATACLASS_SLOTS
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class JudasSwingSetup:
     """A valid Judas Swing setup"""
     timestamp: datetime
@@ -86,7 +87,7 @@ class JudasSwingModel:
         if not valid_sweep:
             return None
         
-        current_price = ohlc.iloc[-1]["close"]
+        current_price = float(ohlc["close"].to_numpy()[-1])
         
         if valid_sweep.liquidity_type == LiquidityType.BUY_SIDE:
             direction = "bearish"
@@ -119,7 +120,7 @@ class JudasSwingModel:
             bsl = self.liquidity_detector.get_nearest_liquidity(
                 current_price, LiquidityType.BUY_SIDE
             )
-            target = bsl.level if bsl else ohlc["high"].max()
+            target = bsl.level if bsl else float(ohlc["high"].to_numpy().max())
         else:
             entry = current_price
             stop = valid_sweep.sweep_high + (5 * self.pip_size)
@@ -127,7 +128,7 @@ class JudasSwingModel:
             ssl = self.liquidity_detector.get_nearest_liquidity(
                 current_price, LiquidityType.SELL_SIDE
             )
-            target = ssl.level if ssl else ohlc["low"].min()
+            target = ssl.level if ssl else float(ohlc["low"].to_numpy().min())
         
         risk = abs(entry - stop)
         reward = abs(target - entry)
@@ -45,9 +45,215 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Tuple
 from enum import Enum
 from datetime import datetime
+import threading
+import weakref
 import pandas as pd
 import numpy as np
 
+from ict_agent._compat import DATACLASS_SLOTS
+from ict_agent._njit import njit
+
+
+def _swing_mask(prices: np.ndarray, swing_lookback: int, is_high: bool) -> np.ndarray:
+    """
+    Flag every bar that is not beaten by any of its swing_lookback neighbours.
+    
+    A swing high is the maximum of the window centred on it (a swing low the
+    minimum), found with one vectorized sliding-window reduction instead of a
+    per-bar neighbour loop. Within swing_lookback bars of the end the window
+    shrinks symmetrically to the bars that exist, so the final bar always
+    qualifies. Bars with fewer than swing_lookback bars before them are never
+    flagged.
+    """
+    n = prices.shape[0]
+    mask = np.zeros(n, dtype=bool)
+    width = 2 * swing_lookback + 1
+    
+    if n >= width:
+        windows = np.lib.stride_tricks.sliding_window_view(prices, width)
+        centre = prices[swing_lookback:n - swing_lookback]
+        if is_high:
+            mask[swing_lookback:n - swing_lookback] = centre >= windows.max(axis=1)
+        else:
+            mask[swing_lookback:n - swing_lookback] = centre <= windows.min(axis=1)
+    
+    for i in range(max(swing_lookback, n - swing_lookback), n):
+        window = prices[2 * i - n + 1:]
+        mask[i] = prices[i] >= window.max() if is_high else prices[i] <= window.min()
+    
+    return mask
+
+
+@njit(cache=True)
+def _find_engineered_levels(
+    prices: np.ndarray,
+    swing_mask: np.ndarray,
+    start_idx: int,
+    swing_lookback: int,
+    is_buy: bool,
+    level_numbers: np.ndarray,
+    level_prices: np.ndarray,
+    candle_indices: np.ndarray,
+) -> int:
+    """
+    Walk swing points after start_idx, keeping each one that extends the curve.
+    
+    For the buy model prices are highs and every swing high lower than the
+    previous kept one is a level; for the sell model prices are lows and every
+    higher swing low is. swing_mask comes from _swing_mask on the same prices.
+    
+    Levels are written into the caller's level_numbers / level_prices /
+    candle_indices buffers (len(prices) is always enough), so a scan can
+    reuse one set of buffers for every start point.
+    
+    Returns:
+        Number of levels written
+    """
+    n = prices.shape[0]
+    count = 0
+    
+    prev = prices[start_idx]
+    for i in range(start_idx + swing_lookback, n):
+        if not swing_mask[i]:
+            continue
+        price = prices[i]
+        if (is_buy and price < prev) or (not is_buy and price > prev):
+            count += 1
+            level_numbers[count - 1] = -count if is_buy else count
+            level_prices[count - 1] = price
+            candle_indices[count - 1] = i
+            prev = price
+    
+    return count
+
+
+@njit(cache=True)
+def _consolidation_window(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    end_idx: int,
+    min_candles: int,
+    max_range: float,
+):
+    """
+    Shortest window ending before end_idx that qualifies as a consolidation.
+    
+    The window grows one bar back at a time carrying its running high/low.
+    Its range only widens, so the search stops at the first window wider
+    than max_range. A window qualifies once both its high and its low have
+    been touched at least twice (within 0.2%).
+    
+    Returns:
+        (lookback, high, low) - lookback is 0 when nothing qualifies
+    """
+    high = -np.inf
+    low = np.inf
+    for lookback in range(1, min(100, end_idx)):
+        start = end_idx - lookback
+        high = max(high, highs[start])
+        low = min(low, lows[start])
+        if lookback < min_candles:
+            continue
+        if not high - low <= max_range:
+            break
+        
+        upper_touches = np.count_nonzero(highs[start:end_idx] >= high * 0.998)
+        lower_touches = np.count_nonzero(lows[start:end_idx] <= low * 1.002)
+        if upper_touches >= 2 and lower_touches >= 2:
+            return lookback, high, low
+    
+    return 0, high, low
+
+
+@njit(cache=True)
+def _first_close_beyond(closes: np.ndarray, start_idx: int, level: float, is_buy: bool) -> int:
+    """First bar from start_idx closing above (buy) / below (sell) level, or -1"""
+    for i in range(start_idx, closes.shape[0]):
+        if (is_buy and closes[i] > level) or (not is_buy and closes[i] < level):
+            return i
+    return -1
+
+
+@njit(cache=True)
+def _scan_one(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    high_swings: np.ndarray,
+    low_swings: np.ndarray,
+    scan_end: int,
+    min_candles: int,
+    max_range: float,
+    next_high: float,
+    next_low: float,
+    swing_lookback: int,
+    min_levels: int,
+    level_numbers: np.ndarray,
+    level_prices: np.ndarray,
+    candle_indices: np.ndarray,
+):
+    """
+    Consolidation, breakout direction, engineered levels and MSS for one scan end.
+    
+    Fuses what analyze used to do through detect_consolidation,
+    detect_engineered_liquidity and detect_mss into one compiled call over
+    the raw arrays. next_high/next_low are the extremes of the 10 bars from
+    scan_end, precomputed for all scan ends by the caller. The engineered
+    levels land in the first level_count slots of the level buffers, which
+    the next call overwrites.
+    
+    Returns:
+        (direction, lookback, cons_high, cons_low, level_count, mss_idx)
+        direction is 1 for the buy model, -1 for the sell model and 0 when
+        there is no usable setup (the other fields are then meaningless);
+        mss_idx is -1 while no MSS has happened.
+    """
+    lookback, cons_high, cons_low = _consolidation_window(
+        highs, lows, scan_end, min_candles, max_range
+    )
+    if lookback == 0:
+        return 0, 0, 0.0, 0.0, 0, -1
+    
+    # Model type from the breakout direction over the next 10 bars
+    broke_down = next_low < cons_low
+    broke_up = next_high > cons_high
+    if broke_down == broke_up:
+        return 0, 0, 0.0, 0.0, 0, -1
+    
+    is_buy = broke_down
+    if is_buy:
+        count = _find_engineered_levels(
+            highs, high_swings, scan_end, swing_lookback, True,
+            level_numbers, level_prices, candle_indices,
+        )
+    else:
+        count = _find_engineered_levels(
+            lows, low_swings, scan_end, swing_lookback, False,
+            level_numbers, level_prices, candle_indices,
+        )
+    if count < min_levels:
+        return 0, 0, 0.0, 0.0, 0, -1
+    
+    mss_idx = -1
+    if count > 0:
+        mss_idx = _first_close_beyond(
+            closes, candle_indices[count - 1] + 1, level_prices[count - 1], is_buy
+        )
+    
+    direction = 1 if is_buy else -1
+    return direction, lookback, cons_high, cons_low, count, mss_idx
+
+
+def _risk_reward(
+    entry: Optional[float], stop: Optional[float], target: Optional[float]
+) -> Optional[float]:
+    """Reward-to-risk ratio, or None when a level is missing/zero or risk is zero"""
+    if all([entry, stop, target]):
+        risk = abs(entry - stop)
+        reward = abs(target - entry)
+        return reward / risk if risk > 0 else None
+    return None
+
 
 class MarketMakerModelType(Enum):
     """Type of Market Maker Model"""
@@ -68,7 +274,7 @@ class MMModelPhase(Enum):
     COMPLETED = "completed"                # Target reached
 
 
-@dataclass 
+@dataclass(**DATACLASS_SLOTS)
 class EngineeredLiquidity:
     """Represents an engineered liquidity level (-1, -2, -3, etc.)"""
     level_number: int  # -1, -2, -3 for MMBM; +1, +2, +3 for MMSM
@@ -79,7 +285,7 @@ class EngineeredLiquidity:
     is_reached: bool = False
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ConsolidationRange:
     """The original consolidation range"""
     high: float
@@ -97,7 +303,7 @@ class ConsolidationRange:
         return (self.high + self.low) / 2
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class MarketMakerSetup:
     """Complete Market Maker Model setup"""
     type: MarketMakerModelType
@@ -136,11 +342,7 @@ class MarketMakerSetup:
     
     @property
     def risk_reward(self) -> Optional[float]:
-        if all([self.entry_price, self.stop_loss, self.take_profit]):
-            risk = abs(self.entry_price - self.stop_loss)
-            reward = abs(self.take_profit - self.entry_price)
-            return reward / risk if risk > 0 else None
-        return None
+        return _risk_reward(self.entry_price, self.stop_loss, self.take_profit)
     
     @property
     def legs_count(self) -> int:
@@ -160,6 +362,15 @@ class MarketMakerModelDetector:
     5. Entry zones (FVG/OB)
     """
     
+    # Trailing ATR means per DataFrame, shared by all detectors since the
+    # convenience functions each build their own detector over the same data.
+    # id(df) -> (weakref to df, (len, last timestamp, last high/low/close), mean)
+    # Detectors on different threads share it too, so it is only read or
+    # changed while holding _atr_cache_lock.
+    _atr_cache: Dict[int, Tuple[weakref.ref, tuple, np.ndarray]] = {}
+    _atr_cache_lock = threading.Lock()
+    _ATR_CACHE_SIZE = 8
+    
     def __init__(
         self,
         consolidation_min_candles: int = 10,
@@ -176,7 +387,12 @@ class MarketMakerModelDetector:
         
         self.active_setups: List[MarketMakerSetup] = []
     
-    def detect_consolidation(self, df: pd.DataFrame, end_idx: int) -> Optional[ConsolidationRange]:
+    def detect_consolidation(
+        self,
+        df: pd.DataFrame,
+        end_idx: int,
+        avg_atr: Optional[np.ndarray] = None
+    ) -> Optional[ConsolidationRange]:
         """
         Detect original consolidation range looking backward from end_idx.
         
@@ -184,127 +400,158 @@ class MarketMakerModelDetector:
         - Price stays within a tight range (low ATR relative to recent average)
         - Multiple touches of highs and lows
         - Minimum number of candles
+        
+        avg_atr is the output of _trailing_atr_mean for df; analyze passes it
+        in so the ATR is computed once per scan rather than once per end_idx.
         """
         if end_idx < self.consolidation_min_candles:
             return None
         
         # Calculate ATR for reference
-        atr = self._calculate_atr(df, 14)
-        if atr is None or end_idx >= len(atr):
+        if avg_atr is None:
+            atr = self._calculate_atr(df, 14)
+            if atr is None:
+                return None
+            avg_atr = self._trailing_atr_mean(atr)
+        if end_idx >= len(avg_atr):
             return None
         
-        avg_atr = atr[max(0, end_idx-50):end_idx].mean()
-        max_range = avg_atr * self.consolidation_max_atr_mult * 10  # Convert to price range
+        # Convert to price range
+        max_range = avg_atr[end_idx] * self.consolidation_max_atr_mult * 10
         
-        # Look backward for consolidation
-        for lookback in range(self.consolidation_min_candles, min(100, end_idx)):
-            start = end_idx - lookback
-            window = df.iloc[start:end_idx]
-            
-            high = window['high'].max()
-            low = window['low'].min()
-            range_size = high - low
-            
-            # Check if range is tight enough
-            if range_size <= max_range:
-                # Check for multiple touches (at least 2 each)
-                upper_touches = sum(window['high'] >= high * 0.998)
-                lower_touches = sum(window['low'] <= low * 1.002)
-                
-                if upper_touches >= 2 and lower_touches >= 2:
-                    return ConsolidationRange(
-                        high=high,
-                        low=low,
-                        start_idx=start,
-                        end_idx=end_idx,
-                        candle_count=lookback
-                    )
+        lookback, high, low = _consolidation_window(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            end_idx,
+            self.consolidation_min_candles,
+            max_range,
+        )
+        if lookback == 0:
+            return None
         
-        return None
+        return ConsolidationRange(
+            high=high,
+            low=low,
+            start_idx=end_idx - lookback,
+            end_idx=end_idx,
+            candle_count=lookback
+        )
     
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> Optional[pd.Series]:
         """Calculate Average True Range"""
-        if len(df) < period:
+        atr = self._atr_array(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+            period,
+        )
+        return None if atr is None else pd.Series(atr, index=df.index)
+    
+    def _atr_array(
+        self,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        period: int = 14
+    ) -> Optional[np.ndarray]:
+        """Average True Range over raw high/low/close arrays"""
+        if len(high) < period:
             return None
         
-        high = df['high']
-        low = df['low']
-        close = df['close'].shift(1)
+        prev_close = np.empty_like(high)
+        prev_close[0] = np.nan
+        prev_close[1:] = close[:-1]
         
         tr1 = high - low
-        tr2 = abs(high - close)
-        tr3 = abs(low - close)
+        tr2 = np.abs(high - prev_close)
+        tr3 = np.abs(low - prev_close)
+        
+        # fmax skips the NaN gaps on the first bar, like a row-wise max would
+        tr = np.fmax(np.fmax(tr1, tr2), tr3)
         
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        return tr.rolling(window=period).mean()
+        # Rolling mean; the first period-1 bars have no full window
+        atr = np.full(len(tr), np.nan)
+        atr[period - 1:] = np.convolve(tr, np.ones(period), mode='valid') / period
+        return atr
+    
+    def _trailing_atr_mean(self, atr: np.ndarray, window: int = 50) -> np.ndarray:
+        """
+        Mean ATR over the `window` bars before each index, skipping NaNs.
+        
+        Built from running sums so every end index costs O(1); an index with
+        no valid ATR before it gets NaN.
+        """
+        values = np.asarray(atr, dtype=np.float64)
+        valid = ~np.isnan(values)
+        sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+        counts = np.concatenate(([0], np.cumsum(valid)))
+        
+        ends = np.arange(len(values))
+        starts = np.maximum(ends - window, 0)
+        with np.errstate(invalid='ignore'):
+            return (sums[ends] - sums[starts]) / (counts[ends] - counts[starts])
     
     def detect_engineered_liquidity(
         self, 
         df: pd.DataFrame, 
         start_idx: int, 
-        model_type: MarketMakerModelType
+        model_type: MarketMakerModelType,
+        swing_mask: Optional[np.ndarray] = None
     ) -> List[EngineeredLiquidity]:
         """
         Detect engineered liquidity levels (the -1, -2, -3 or +1, +2, +3 levels).
         
         For MMBM: Look for lower highs (each is a -N level)
         For MMSM: Look for higher lows (each is a +N level)
-        """
-        levels = []
         
-        if model_type == MarketMakerModelType.BUY_MODEL:
-            # Find lower highs (each swing high that's lower than previous)
-            prev_high = df['high'].iloc[start_idx]
-            level_num = 0
-            
-            for i in range(start_idx + self.swing_lookback, len(df)):
-                # Check if this is a swing high
-                is_swing = True
-                for j in range(1, min(self.swing_lookback + 1, len(df) - i)):
-                    if df['high'].iloc[i] < df['high'].iloc[i-j] or \
-                       (i + j < len(df) and df['high'].iloc[i] < df['high'].iloc[i+j]):
-                        is_swing = False
-                        break
-                
-                if is_swing and df['high'].iloc[i] < prev_high:
-                    level_num -= 1  # -1, -2, -3...
-                    levels.append(EngineeredLiquidity(
-                        level_number=level_num,
-                        price=df['high'].iloc[i],
-                        candle_idx=i,
-                        timestamp=df.index[i]
-                    ))
-                    prev_high = df['high'].iloc[i]
+        swing_mask may be passed in when scanning many start points over the
+        same data (see analyze); it is computed from df otherwise.
+        """
+        is_buy = model_type == MarketMakerModelType.BUY_MODEL
+        # Lower highs for MMBM, higher lows for MMSM
+        prices = df['high' if is_buy else 'low'].to_numpy(dtype=np.float64)
+        if swing_mask is None:
+            swing_mask = _swing_mask(prices, self.swing_lookback, is_buy)
+        return self._build_levels(df.index, prices, swing_mask, start_idx, is_buy)
+    
+    def _build_levels(
+        self,
+        index: pd.Index,
+        prices: np.ndarray,
+        swing_mask: np.ndarray,
+        start_idx: int,
+        is_buy: bool
+    ) -> List[EngineeredLiquidity]:
+        """Run _find_engineered_levels and wrap its output into EngineeredLiquidity objects"""
+        capacity = len(prices)
+        level_numbers = np.empty(capacity, dtype=np.int64)
+        level_prices = np.empty(capacity, dtype=np.float64)
+        candle_indices = np.empty(capacity, dtype=np.int64)
+        count = _find_engineered_levels(
+            prices, swing_mask, start_idx, self.swing_lookback, is_buy,
+            level_numbers, level_prices, candle_indices,
+        )
+        level_numbers = level_numbers[:count]
+        level_prices = level_prices[:count]
+        candle_indices = candle_indices[:count]
         
-        else:  # SELL_MODEL
-            # Find higher lows (each swing low that's higher than previous)
-            prev_low = df['low'].iloc[start_idx]
-            level_num = 0
-            
-            for i in range(start_idx + self.swing_lookback, len(df)):
-                # Check if this is a swing low
-                is_swing = True
-                for j in range(1, min(self.swing_lookback + 1, len(df) - i)):
-                    if df['low'].iloc[i] > df['low'].iloc[i-j] or \
-                       (i + j < len(df) and df['low'].iloc[i] > df['low'].iloc[i+j]):
-                        is_swing = False
-                        break
-                
-                if is_swing and df['low'].iloc[i] > prev_low:
-                    level_num += 1  # +1, +2, +3...
-                    levels.append(EngineeredLiquidity(
-                        level_number=level_num,
-                        price=df['low'].iloc[i],
-                        candle_idx=i,
-                        timestamp=df.index[i]
-                    ))
-                    prev_low = df['low'].iloc[i]
-        
-        return levels
+        # One vectorized take for all timestamps (keeps tz, unlike to_numpy)
+        timestamps = index[candle_indices]
+        return [
+            EngineeredLiquidity(
+                level_number=level_number,
+                price=price,
+                candle_idx=i,
+                timestamp=timestamp
+            )
+            for level_number, price, i, timestamp in zip(
+                level_numbers.tolist(), level_prices.tolist(), candle_indices.tolist(), timestamps
+            )
+        ]
     
     def detect_pd_array(
         self, 
-        df: pd.DataFrame, 
+        df: Optional[pd.DataFrame], 
         consolidation: ConsolidationRange,
         model_type: MarketMakerModelType
     ) -> Optional[Tuple[float, float]]:
@@ -312,6 +559,7 @@ class MarketMakerModelDetector:
         Detect the PD Array zone (discount for MMBM, premium for MMSM).
         
         Uses higher timeframe structure or Fibonacci levels from consolidation.
+        Only the consolidation is needed; df is accepted for API compatibility.
         """
         if model_type == MarketMakerModelType.BUY_MODEL:
             # Discount zone = below consolidation low
@@ -345,20 +593,20 @@ class MarketMakerModelDetector:
         
         # Use the most recent engineered level as MSS reference
         last_level = engineered_levels[-1]
+        first = last_level.candle_idx + 1
+        closes = df['close'].to_numpy()[first:]
         
         if model_type == MarketMakerModelType.BUY_MODEL:
             # Look for break above the last lower high
-            for i in range(last_level.candle_idx + 1, len(df)):
-                if df['close'].iloc[i] > last_level.price:
-                    return (last_level.price, i)
-        
+            breaks = closes > last_level.price
         else:  # SELL_MODEL
             # Look for break below the last higher low
-            for i in range(last_level.candle_idx + 1, len(df)):
-                if df['close'].iloc[i] < last_level.price:
-                    return (last_level.price, i)
+            breaks = closes < last_level.price
         
-        return None
+        # argmax finds the first breaking close; any() rules out "none at all"
+        if not breaks.any():
+            return None
+        return (last_level.price, first + int(np.argmax(breaks)))
     
     def find_entry_zone(
         self, 
@@ -369,64 +617,76 @@ class MarketMakerModelDetector:
         """
         Find FVG or OB entry zone following MSS.
         """
-        lookback = min(5, mss_idx)
+        highs = df['high'].to_numpy()
+        lows = df['low'].to_numpy()
+        is_fvg, is_ob = self._entry_masks(
+            highs, lows, df['open'].to_numpy(), df['close'].to_numpy(), model_type
+        )
+        return self._entry_zone(highs, lows, is_fvg, is_ob, mss_idx, model_type)
+    
+    def _entry_masks(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        opens: np.ndarray,
+        closes: np.ndarray,
+        model_type: MarketMakerModelType
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-bar FVG and OB flags for the model's direction over the whole series.
         
-        if model_type == MarketMakerModelType.BUY_MODEL:
-            # Look for bullish FVG
-            for i in range(mss_idx, max(0, mss_idx - lookback), -1):
-                if i < 2:
-                    continue
-                
-                # Bullish FVG: gap between candle[i-2] high and candle[i] low
-                if df['low'].iloc[i] > df['high'].iloc[i-2]:
-                    return {
-                        'type': 'FVG',
-                        'high': df['low'].iloc[i],
-                        'low': df['high'].iloc[i-2],
-                        'index': i
-                    }
-                
-                # Bullish OB: last down candle before up move
-                if df['close'].iloc[i-1] < df['open'].iloc[i-1] and \
-                   df['close'].iloc[i] > df['open'].iloc[i]:
-                    return {
-                        'type': 'OB',
-                        'high': df['high'].iloc[i-1],
-                        'low': df['low'].iloc[i-1],
-                        'index': i-1
-                    }
+        is_fvg[i] marks a gap completed by candle i; is_ob[i] marks candle i
+        reversing candle i-1 (the OB itself). Bars without enough history are False.
+        """
+        is_fvg = np.zeros(len(highs), dtype=bool)
+        is_ob = np.zeros(len(highs), dtype=bool)
         
+        if model_type == MarketMakerModelType.BUY_MODEL:
+            # Bullish FVG: gap between candle[i-2] high and candle[i] low
+            is_fvg[2:] = lows[2:] > highs[:-2]
+            # Bullish OB: last down candle before up move
+            is_ob[1:] = (closes[:-1] < opens[:-1]) & (closes[1:] > opens[1:])
         else:  # SELL_MODEL
-            # Look for bearish FVG
-            for i in range(mss_idx, max(0, mss_idx - lookback), -1):
-                if i < 2:
-                    continue
-                
-                # Bearish FVG
-                if df['high'].iloc[i] < df['low'].iloc[i-2]:
-                    return {
-                        'type': 'FVG',
-                        'high': df['low'].iloc[i-2],
-                        'low': df['high'].iloc[i],
-                        'index': i
-                    }
-                
-                # Bearish OB
-                if df['close'].iloc[i-1] > df['open'].iloc[i-1] and \
-                   df['close'].iloc[i] < df['open'].iloc[i]:
-                    return {
-                        'type': 'OB',
-                        'high': df['high'].iloc[i-1],
-                        'low': df['low'].iloc[i-1],
-                        'index': i-1
-                    }
-        
-        return None
+            # Bearish FVG
+            is_fvg[2:] = highs[2:] < lows[:-2]
+            # Bearish OB
+            is_ob[1:] = (closes[:-1] > opens[:-1]) & (closes[1:] < opens[1:])
+        
+        return is_fvg, is_ob
+    
+    def _entry_zone(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        is_fvg: np.ndarray,
+        is_ob: np.ndarray,
+        mss_idx: int,
+        model_type: MarketMakerModelType
+    ) -> Optional[Dict]:
+        """find_entry_zone using flags from _entry_masks"""
+        # Candles mss_idx down to mss_idx-4 (never before the third bar)
+        first = max(2, mss_idx - 4)
+        if mss_idx < first:
+            return None
+        
+        # Most recent candle with either pattern wins; FVG before OB on a tie
+        hits = (is_fvg[first:mss_idx + 1] | is_ob[first:mss_idx + 1])[::-1]
+        offset = int(np.argmax(hits))
+        if not hits[offset]:
+            return None
+        i = mss_idx - offset
+        
+        if is_fvg[i]:
+            if model_type == MarketMakerModelType.BUY_MODEL:
+                return {'type': 'FVG', 'high': lows[i], 'low': highs[i-2], 'index': i}
+            return {'type': 'FVG', 'high': lows[i-2], 'low': highs[i], 'index': i}
+        
+        return {'type': 'OB', 'high': highs[i-1], 'low': lows[i-1], 'index': i-1}
     
     def calculate_trade_levels(
         self, 
         setup: MarketMakerSetup,
-        df: pd.DataFrame,
+        df: Optional[pd.DataFrame],
         lowest_price: float,
         highest_price: float
     ) -> MarketMakerSetup:
@@ -442,6 +702,8 @@ class MarketMakerModelDetector:
         - Entry: FVG/OB midpoint  
         - Stop: Above the highest point of the curve
         - Targets: Each +N level, then consolidation low
+        
+        df is not used; the curve extremes come in as lowest/highest_price.
         """
         if setup.entry_zone_high is None:
             return setup
@@ -449,6 +711,12 @@ class MarketMakerModelDetector:
         # Entry at zone midpoint
         setup.entry_price = (setup.entry_zone_high + setup.entry_zone_low) / 2
         
+        levels = setup.engineered_levels
+        level_numbers = np.fromiter(
+            (l.level_number for l in levels), dtype=np.int64, count=len(levels)
+        )
+        level_prices = np.fromiter((l.price for l in levels), dtype=np.float64, count=len(levels))
+        
         if setup.type == MarketMakerModelType.BUY_MODEL:
             # Stop below curve low with buffer
             buffer = 5 * self.pip_value
@@ -458,10 +726,9 @@ class MarketMakerModelDetector:
             if setup.consolidation:
                 setup.take_profit = setup.consolidation.high
             
-            # Intermediate targets are each engineered level (in reverse order)
-            for level in sorted(setup.engineered_levels, key=lambda x: x.level_number, reverse=True):
-                if level.price > setup.entry_price:
-                    setup.intermediate_targets.append(level.price)
+            # Intermediate targets are each engineered level (-1 first, then -2...)
+            ordered = level_prices[np.argsort(-level_numbers, kind='stable')]
+            setup.intermediate_targets.extend(ordered[ordered > setup.entry_price].tolist())
         
         else:  # SELL_MODEL
             # Stop above curve high with buffer
@@ -473,9 +740,8 @@ class MarketMakerModelDetector:
                 setup.take_profit = setup.consolidation.low
             
             # Intermediate targets
-            for level in sorted(setup.engineered_levels, key=lambda x: x.level_number):
-                if level.price < setup.entry_price:
-                    setup.intermediate_targets.append(level.price)
+            ordered = level_prices[np.argsort(level_numbers, kind='stable')]
+            setup.intermediate_targets.extend(ordered[ordered < setup.entry_price].tolist())
         
         return setup
     
@@ -488,48 +754,191 @@ class MarketMakerModelDetector:
         """
         Main analysis - scan for Market Maker Buy/Sell Models.
         """
-        if len(df) < 50:
+        highs = df['high'].to_numpy(dtype=np.float64)
+        lows = df['low'].to_numpy(dtype=np.float64)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        return self._analyze_arrays(
+            highs,
+            lows,
+            df['open'].to_numpy(dtype=np.float64),
+            closes,
+            df.index,
+            symbol,
+            timeframe,
+            avg_atr=self._shared_atr_mean(df, highs, lows, closes),
+        )
+    
+    def _shared_atr_mean(
+        self,
+        df: pd.DataFrame,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray
+    ) -> Optional[np.ndarray]:
+        """
+        Trailing ATR mean for df, reused across calls on the same DataFrame.
+        
+        An entry is only reused for the very same object whose length, last
+        timestamp and last bar still match, so appending a bar or updating
+        the forming bar in place recomputes it.
+        """
+        if len(df) == 0:
+            return None
+        
+        fingerprint = (len(df), df.index[-1], highs[-1], lows[-1], closes[-1])
+        cache = MarketMakerModelDetector._atr_cache
+        with MarketMakerModelDetector._atr_cache_lock:
+            entry = cache.get(id(df))
+        if entry is not None and entry[0]() is df and entry[1] == fingerprint:
+            return entry[2]
+        
+        # Computed outside the lock; a concurrent miss on the same df only
+        # repeats the work
+        atr = self._atr_array(highs, lows, closes, 14)
+        if atr is None:
+            return None
+        avg_atr = self._trailing_atr_mean(atr)
+        
+        with MarketMakerModelDetector._atr_cache_lock:
+            # Drop entries whose DataFrame is gone, then the oldest if still full
+            for key in [k for k, v in cache.items() if v[0]() is None]:
+                del cache[key]
+            cache.pop(id(df), None)
+            if len(cache) >= self._ATR_CACHE_SIZE:
+                del cache[next(iter(cache))]
+            cache[id(df)] = (weakref.ref(df), fingerprint, avg_atr)
+        return avg_atr
+    
+    def _analyze_arrays(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        opens: np.ndarray,
+        closes: np.ndarray,
+        index: pd.Index,
+        symbol: str = "",
+        timeframe: str = "",
+        avg_atr: Optional[np.ndarray] = None
+    ) -> List[MarketMakerSetup]:
+        """
+        analyze over OHLC columns converted to float64 arrays once.
+        
+        Every step below works on these arrays; the index is only used for
+        timestamps. avg_atr may carry a precomputed _trailing_atr_mean.
+        """
+        if len(index) < 50:
             return []
         
-        setups = []
+        last_timestamp = index[-1]
+        if avg_atr is None:
+            avg_atr = self._trailing_atr_mean(self._atr_array(highs, lows, closes, 14))
+        max_ranges = avg_atr * self.consolidation_max_atr_mult * 10
         
-        # Scan for potential consolidation breakouts
-        for scan_end in range(50, len(df) - 20):
-            # Try to find consolidation
-            consolidation = self.detect_consolidation(df, scan_end)
-            
-            if consolidation is None:
-                continue
-            
-            # Determine model type based on breakout direction
-            next_candles = df.iloc[scan_end:min(scan_end + 10, len(df))]
-            
-            if len(next_candles) < 5:
+        # Swing points don't depend on where the curve starts, so flag them once
+        high_swings = _swing_mask(highs, self.swing_lookback, True)
+        low_swings = _swing_mask(lows, self.swing_lookback, False)
+        
+        # FVG/OB flags are shared by every setup of the same direction
+        entry_masks = {
+            model_type: self._entry_masks(highs, lows, opens, closes, model_type)
+            for model_type in MarketMakerModelType
+        }
+        
+        # Scan for potential consolidation breakouts. Candidates stay as raw
+        # kernel output plus parallel scoring columns until confidence decides
+        # which ones become MarketMakerSetup objects.
+        found = []
+        candle_counts = []
+        level_counts = []
+        has_mss = []
+        entry_kinds = []  # 0 = none, 1 = OB, 2 = FVG
+        risk_rewards = []
+        buffer = 5 * self.pip_value
+        
+        # Extremes of the 10 bars starting at each index, for breakout checks
+        sliding = np.lib.stride_tricks.sliding_window_view
+        next_highs = sliding(highs, 10).max(axis=1)
+        next_lows = sliding(lows, 10).min(axis=1)
+        
+        # Level buffers reused by every scan end; only the count and the last
+        # level are read here; surviving setups rebuild their levels later
+        level_numbers = np.empty(len(highs), dtype=np.int64)
+        level_prices = np.empty(len(highs), dtype=np.float64)
+        candle_indices = np.empty(len(highs), dtype=np.int64)
+        
+        candidates = self._consolidation_candidates(
+            highs, lows, max_ranges, next_highs, next_lows
+        )
+        for scan_end in candidates.tolist():
+            # Consolidation, breakout direction, engineered levels and MSS
+            scan = _scan_one(
+                highs, lows, closes, high_swings, low_swings, scan_end,
+                self.consolidation_min_candles, max_ranges[scan_end],
+                next_highs[scan_end], next_lows[scan_end],
+                self.swing_lookback, self.min_engineered_levels,
+                level_numbers, level_prices, candle_indices,
+            )
+            direction, lookback, cons_high, cons_low, level_count, mss_idx = scan
+            if direction == 0:
                 continue
             
-            broke_down = next_candles['low'].min() < consolidation.low
-            broke_up = next_candles['high'].max() > consolidation.high
-            
-            if broke_down and not broke_up:
+            if direction == 1:
                 model_type = MarketMakerModelType.BUY_MODEL
-            elif broke_up and not broke_down:
-                model_type = MarketMakerModelType.SELL_MODEL
             else:
-                continue  # No clear direction
+                model_type = MarketMakerModelType.SELL_MODEL
             
-            # Detect engineered liquidity levels
-            engineered = self.detect_engineered_liquidity(df, scan_end, model_type)
+            entry_zone = None
+            risk_reward = None
+            if mss_idx >= 0:
+                entry_zone = self._entry_zone(
+                    highs, lows, *entry_masks[model_type], mss_idx, model_type
+                )
+            if entry_zone:
+                # Same entry/stop/target calculate_trade_levels will set
+                entry = (entry_zone['high'] + entry_zone['low']) / 2
+                if model_type == MarketMakerModelType.BUY_MODEL:
+                    stop = lows[scan_end:].min() - buffer
+                    risk_reward = _risk_reward(entry, stop, cons_high)
+                else:
+                    stop = highs[scan_end:].max() + buffer
+                    risk_reward = _risk_reward(entry, stop, cons_low)
             
-            if len(engineered) < self.min_engineered_levels:
-                continue
+            found.append((scan_end, model_type, scan, entry_zone))
+            candle_counts.append(lookback)
+            level_counts.append(level_count)
+            has_mss.append(mss_idx >= 0 and bool(level_prices[level_count - 1]))
+            entry_kinds.append(0 if not entry_zone else 2 if entry_zone['type'] == 'FVG' else 1)
+            risk_rewards.append(np.nan if risk_reward is None else risk_reward)
+        
+        confidences = self._batch_confidence(
+            np.array(candle_counts, dtype=np.int64),
+            np.array(level_counts, dtype=np.int64),
+            np.array(has_mss, dtype=bool),
+            np.array(entry_kinds, dtype=np.int8),
+            np.array(risk_rewards, dtype=np.float64),
+        )
+        
+        setups = []
+        for k in np.flatnonzero(confidences >= 0.5).tolist():
+            scan_end, model_type, scan, entry_zone = found[k]
+            _, lookback, cons_high, cons_low, _, mss_idx = scan
             
-            # Detect PD Array
-            pd_array = self.detect_pd_array(df, consolidation, model_type)
+            consolidation = ConsolidationRange(
+                high=cons_high,
+                low=cons_low,
+                start_idx=scan_end - lookback,
+                end_idx=scan_end,
+                candle_count=lookback
+            )
+            if model_type == MarketMakerModelType.BUY_MODEL:
+                engineered = self._build_levels(index, highs, high_swings, scan_end, True)
+            else:
+                engineered = self._build_levels(index, lows, low_swings, scan_end, False)
             
-            # Detect MSS
-            mss_result = self.detect_mss(df, engineered, model_type)
+            # Detect PD Array
+            pd_array = self.detect_pd_array(None, consolidation, model_type)
             
-            if mss_result is None:
+            if mss_idx < 0:
                 # Model still developing - might be in curve phase
                 phase = MMModelPhase.SELLSIDE_CURVE if model_type == MarketMakerModelType.BUY_MODEL \
                         else MMModelPhase.BUYSIDE_CURVE
@@ -546,14 +955,12 @@ class MarketMakerModelDetector:
                 pd_array_low=pd_array[1] if pd_array else None,
                 symbol=symbol,
                 timeframe=timeframe,
-                timestamp=df.index[-1]
+                timestamp=last_timestamp,
+                confidence=float(confidences[k])
             )
             
-            if mss_result:
-                setup.mss_level, setup.mss_candle_idx = mss_result
-                
-                # Find entry zone
-                entry_zone = self.find_entry_zone(df, setup.mss_candle_idx, model_type)
+            if mss_idx >= 0:
+                setup.mss_level, setup.mss_candle_idx = engineered[-1].price, mss_idx
                 
                 if entry_zone:
                     setup.entry_zone_high = entry_zone['high']
@@ -562,59 +969,105 @@ class MarketMakerModelDetector:
                     setup.phase = MMModelPhase.SMART_MONEY_REVERSAL
                     
                     # Calculate levels
-                    curve_section = df.iloc[scan_end:]
-                    lowest = curve_section['low'].min()
-                    highest = curve_section['high'].max()
-                    setup = self.calculate_trade_levels(setup, df, lowest, highest)
-            
-            # Calculate confidence
-            setup.confidence = self._calculate_confidence(setup)
+                    lowest = lows[scan_end:].min()
+                    highest = highs[scan_end:].max()
+                    setup = self.calculate_trade_levels(setup, None, lowest, highest)
             
-            if setup.confidence >= 0.5:
-                setups.append(setup)
+            setups.append(setup)
         
         # Keep only the most recent/best setup per type
         self.active_setups = self._deduplicate_setups(setups)
         return self.active_setups
     
-    def _calculate_confidence(self, setup: MarketMakerSetup) -> float:
-        """Calculate confidence score"""
-        confidence = 0.3  # Base
+    def _consolidation_candidates(
+        self,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        max_ranges: np.ndarray,
+        next_highs: np.ndarray,
+        next_lows: np.ndarray
+    ) -> np.ndarray:
+        """
+        Scan ends that can still hold a consolidation, in ascending order.
+        
+        The shortest window detect_consolidation tries has the narrowest range,
+        so any end where that window is already wider than the ATR limit is
+        dropped here with a single vectorized pass instead of a full check.
+        Any consolidation also contains that window, so an end where the next
+        10 bars (next_highs/next_lows) stay inside it cannot break out either.
+        """
+        min_candles = self.consolidation_min_candles
+        scan_ends = np.arange(max(50, min_candles + 1), len(highs) - 20)
+        if min_candles > 99:
+            # detect_consolidation never looks back further than 99 bars
+            return scan_ends[:0]
+        if min_candles < 1 or len(scan_ends) == 0:
+            return scan_ends
+        
+        sliding = np.lib.stride_tricks.sliding_window_view
+        window_highs = sliding(highs, min_candles).max(axis=1)
+        window_lows = sliding(lows, min_candles).min(axis=1)
+        
+        starts = scan_ends - min_candles
+        ranges = window_highs[starts] - window_lows[starts]
+        tight = ranges <= max_ranges[scan_ends]
+        can_break = (next_lows[scan_ends] < window_lows[starts]) | \
+                    (next_highs[scan_ends] > window_highs[starts])
+        return scan_ends[tight & can_break]
+    
+    def _batch_confidence(
+        self,
+        candle_counts: np.ndarray,
+        level_counts: np.ndarray,
+        has_mss: np.ndarray,
+        entry_kinds: np.ndarray,
+        risk_rewards: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate confidence scores for many candidate setups at once.
+        
+        Inputs are parallel arrays: consolidation candle count, engineered
+        level count, MSS flag, entry kind (0 none, 1 OB, 2 FVG) and R:R
+        (NaN when unavailable). Terms are added in a fixed order so each score
+        matches adding them one by one.
+        """
+        confidence = np.full(len(candle_counts), 0.3)  # Base
         
         # Consolidation quality
-        if setup.consolidation and setup.consolidation.candle_count >= 15:
-            confidence += 0.15
+        confidence += np.where(candle_counts >= 15, 0.15, 0.0)
         
         # Number of engineered levels (more = better)
-        if len(setup.engineered_levels) >= 3:
-            confidence += 0.15
-        elif len(setup.engineered_levels) >= 2:
-            confidence += 0.10
+        confidence += np.where(level_counts >= 3, 0.15, np.where(level_counts >= 2, 0.10, 0.0))
         
         # MSS confirmed
-        if setup.mss_level:
-            confidence += 0.15
+        confidence += np.where(has_mss, 0.15, 0.0)
         
-        # Entry zone found
-        if setup.entry_type:
-            confidence += 0.10
-            if setup.entry_type == 'FVG':
-                confidence += 0.05
+        # Entry zone found, FVG preferred
+        confidence += np.where(entry_kinds > 0, 0.10, 0.0)
+        confidence += np.where(entry_kinds == 2, 0.05, 0.0)
         
         # Good R:R
-        if setup.risk_reward and setup.risk_reward >= 3:
-            confidence += 0.10
+        confidence += np.where(risk_rewards >= 3, 0.10, 0.0)
         
-        return min(confidence, 1.0)
+        return np.minimum(confidence, 1.0)
     
     def _deduplicate_setups(self, setups: List[MarketMakerSetup]) -> List[MarketMakerSetup]:
         """Keep only the best setup of each type"""
-        best = {}
+        best_buy = None
+        best_sell = None
+        sell_first = False  # Output follows the order each type first appeared
         for setup in setups:
-            key = setup.type.value
-            if key not in best or setup.confidence > best[key].confidence:
-                best[key] = setup
-        return list(best.values())
+            if setup.type is MarketMakerModelType.BUY_MODEL:
+                if best_buy is None or setup.confidence > best_buy.confidence:
+                    best_buy = setup
+            elif best_sell is None:
+                sell_first = best_buy is None
+                best_sell = setup
+            elif setup.confidence > best_sell.confidence:
+                best_sell = setup
+        
+        ordered = (best_sell, best_buy) if sell_first else (best_buy, best_sell)
+        return [setup for setup in ordered if setup is not None]
     
     def format_setup(self, setup: MarketMakerSetup) -> str:
         """Format setup for display"""
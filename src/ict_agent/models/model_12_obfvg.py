@@ -19,36 +19,54 @@ KEY RULES:
 - 20 pip fixed target OR FVG projection target
 """
 
+from collections import deque
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 from datetime import datetime, time
-from typing import Optional, List, Tuple, Callable
+from typing import Optional, List, Dict, Tuple, Callable
 import pandas as pd
 import numpy as np
 
 from ict_agent.detectors.order_block import OrderBlockDetector, OrderBlock, OBDirection
-from ict_agent.detectors.fvg import FVGDetector, FVG, FVGDirection
+from ict_agent.detectors.fvg import FVGDetector, FVG, FVGArrays, FVGDirection
 from ict_agent.detectors.displacement import DisplacementDetector
 from ict_agent.engine.killzone import KillzoneManager, Killzone
+from ict_agent._compat import DATACLASS_SLOTS
+from ict_agent._njit import njit
 
 
-class Model12Phase(Enum):
-    WAITING_OB = "waiting_ob"  # Looking for Order Block
-    OB_FORMED = "ob_formed"  # OB formed, waiting for retest
-    OB_RETESTED = "ob_retested"  # OB retested, waiting for expansion
-    EXPANSION = "expansion"  # Expansion swing happening
-    FVG_FORMED = "fvg_formed"  # FVG formed in expansion
-    WAITING_ENTRY = "waiting_entry"  # Waiting for FVG retracement
-    ENTRY_VALID = "entry_valid"  # Entry conditions met
-    COMPLETE = "complete"  # Trade complete
+class Model12Phase(IntEnum):
+    WAITING_OB = 0  # Looking for Order Block
+    OB_FORMED = 1  # OB formed, waiting for retest
+    OB_RETESTED = 2  # OB retested, waiting for expansion
+    EXPANSION = 3  # Expansion swing happening
+    FVG_FORMED = 4  # FVG formed in expansion
+    WAITING_ENTRY = 5  # Waiting for FVG retracement
+    ENTRY_VALID = 6  # Entry conditions met
+    COMPLETE = 7  # Trade complete
+    
+    # Integer-valued so phase checks are int compares; keep the Enum rendering
+    __str__ = Enum.__str__
+    
+    @property
+    def label(self) -> str:
+        """Lowercase display name, e.g. entry_valid"""
+        return self.name.lower()
 
 
-class Model12Direction(Enum):
-    BULLISH = "bullish"
-    BEARISH = "bearish"
+class Model12Direction(IntEnum):
+    BULLISH = 1
+    BEARISH = -1
+    
+    __str__ = Enum.__str__
+    
+    @property
+    def label(self) -> str:
+        """Lowercase display name, e.g. bullish"""
+        return self.name.lower()
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Model12Setup:
     """Complete Model 12 trade setup"""
     direction: Model12Direction
@@ -81,7 +99,7 @@ class Model12Setup:
     invalidation_reason: Optional[str] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class Model12Signal:
     """Trading signal from Model 12"""
     direction: str  # "long" or "short"
@@ -97,6 +115,76 @@ class Model12Signal:
     timestamp: pd.Timestamp
 
 
+@njit(cache=True)
+def _pick_matching_fvg(
+    fvg_index: np.ndarray,
+    fvg_direction: np.ndarray,
+    fvg_top: np.ndarray,
+    fvg_bottom: np.ndarray,
+    fvg_mitigated: np.ndarray,
+    after_index: int,
+    direction: int,
+    min_fvg_pips: float,
+    inv_pip: float,
+) -> int:
+    """
+    Position of the most recent FVG after after_index that passes the setup filters.
+    
+    Returns -1 when no FVG qualifies. Ties on bar index keep the first FVG.
+    """
+    best = -1
+    best_index = after_index
+    for i in range(fvg_index.shape[0]):
+        if fvg_index[i] <= best_index:
+            continue
+        if fvg_direction[i] != direction or fvg_mitigated[i]:
+            continue
+        if abs(fvg_top[i] - fvg_bottom[i]) * inv_pip < min_fvg_pips:
+            continue
+        best = i
+        best_index = fvg_index[i]
+    return best
+
+
+def _setup_confidence(
+    displacement_pips: Optional[float],
+    fvg_size_pips: float,
+    in_killzone: bool,
+    reward_pips: float,
+    risk_pips: float,
+    ob_mitigated: bool,
+) -> float:
+    """Confidence score for a setup from its primitive OB/FVG features"""
+    score = 0.0
+    
+    # Order Block quality
+    if displacement_pips and displacement_pips > 10:
+        score += 0.2
+    
+    # FVG quality
+    if fvg_size_pips >= 5:
+        score += 0.15
+    if fvg_size_pips >= 10:
+        score += 0.1
+    
+    # Killzone bonus
+    if in_killzone:
+        score += 0.2
+    
+    # Risk/Reward
+    rr = reward_pips / risk_pips if risk_pips > 0 else 0
+    if rr >= 1.5:
+        score += 0.15
+    if rr >= 2.0:
+        score += 0.1
+    
+    # OB not mitigated
+    if not ob_mitigated:
+        score += 0.1
+    
+    return min(score, 1.0)
+
+
 class Model12Detector:
     """
     ICT Model 12: OB + FVG 20 Pips Scalping Model
@@ -130,6 +218,11 @@ class Model12Detector:
         self.use_fvg_projection = use_fvg_projection
         self.require_killzone = require_killzone
         
+        # Price <-> pip conversions used on every setup
+        self._inv_pip = 1.0 / pip_size
+        self._stop_buffer = 2 * pip_size  # 2 pip buffer beyond the OB
+        self._target_move = target_pips * pip_size
+        
         # Initialize detectors
         self.ob_detector = OrderBlockDetector(pip_size=pip_size)
         self.fvg_detector = FVGDetector(
@@ -141,6 +234,27 @@ class Model12Detector:
         # State
         self._active_setups: List[Model12Setup] = []
         self._signals: List[Model12Signal] = []
+        
+        # Column arrays of the frame passed to the current analyze() call
+        self._highs: Optional[np.ndarray] = None
+        self._lows: Optional[np.ndarray] = None
+        # Lowest low / highest high from each bar to the end of the frame
+        self._suffix_low: Optional[np.ndarray] = None
+        self._suffix_high: Optional[np.ndarray] = None
+        
+        # Streaming state for update(): bars seen, the latest highs/lows within
+        # OB lookback reach, and (lowest low, highest high) since each active
+        # OB candle. None while the suffix arrays above are current.
+        self._bar_count = 0
+        self._recent_highs: deque = deque(maxlen=self.ob_detector.lookback + 1)
+        self._recent_lows: deque = deque(maxlen=self.ob_detector.lookback + 1)
+        self._ob_extremes: Optional[Dict[int, Tuple[float, float]]] = None
+        
+        # Latest bar seen
+        self._last_close: float = 0.0
+        self._last_high: float = 0.0
+        self._last_low: float = 0.0
+        self._last_time: Optional[pd.Timestamp] = None
     
     def analyze(
         self,
@@ -157,47 +271,139 @@ class Model12Detector:
         Returns:
             List of active Model12Setup objects
         """
-        if len(ohlc) < 20:
-            return []
+        # Stream state and detectors cover short frames too, so update() can
+        # continue from a warm-up shorter than the 20 bars needed for setups
+        self._highs = ohlc['high'].to_numpy()
+        self._lows = ohlc['low'].to_numpy()
+        self._suffix_low = np.fmin.accumulate(self._lows[::-1])[::-1]
+        self._suffix_high = np.fmax.accumulate(self._highs[::-1])[::-1]
+        self._bar_count = len(ohlc)
+        self._ob_extremes = None
         
         # Detect Order Blocks
-        ob_df = self.ob_detector.detect(ohlc)
+        self.ob_detector.detect(ohlc)
         
         # Detect FVGs
-        fvg_df = self.fvg_detector.detect(ohlc)
+        self.fvg_detector.detect(ohlc)
+        
+        if len(ohlc) < 20:
+            return []
+        
+        self._last_close = float(ohlc['close'].to_numpy()[-1])
+        self._last_high = float(self._highs[-1])
+        self._last_low = float(self._lows[-1])
+        self._last_time = ohlc.index[-1]
+        
+        return self._evaluate_latest_bar(htf_bias)
+    
+    def update(
+        self,
+        timestamp: pd.Timestamp,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+        htf_bias: Optional[str] = None,
+    ) -> List[Model12Setup]:
+        """
+        Feed one new candle and return the active setups.
+        
+        Streaming counterpart to analyze() for bar-by-bar backtests and live
+        feeds. Calling update() for each new candle gives the same setups and
+        signals as calling analyze() on the growing DataFrame, but the
+        detectors only process the new candle instead of the whole history.
+        Continues from the last analyze() call, or from a fresh detector.
+        
+        Args:
+            timestamp: Candle open time
+            open_price, high, low, close, volume: Candle values
+            htf_bias: Optional HTF bias ("bullish" or "bearish")
+        
+        Returns:
+            List of active Model12Setup objects
+        """
+        if self._ob_extremes is None:
+            self._prime_stream()
+        
+        self.ob_detector.update(timestamp, open_price, high, low, close, volume)
+        self.fvg_detector.update(timestamp, open_price, high, low, close)
+        
+        self._bar_count += 1
+        self._recent_highs.append(high)
+        self._recent_lows.append(low)
+        self._last_close = float(close)
+        self._last_high = float(high)
+        self._last_low = float(low)
+        self._last_time = timestamp
+        
+        # Extend the running extremes of surviving OBs and seed new ones
+        extremes = {}
+        for ob in self.ob_detector.get_active_order_blocks():
+            if ob.index in self._ob_extremes:
+                lowest, highest = self._ob_extremes[ob.index]
+                extremes[ob.index] = (min(lowest, low), max(highest, high))
+            elif ob.index not in extremes:
+                since = self._bar_count - ob.index
+                extremes[ob.index] = (
+                    min(list(self._recent_lows)[-since:]),
+                    max(list(self._recent_highs)[-since:]),
+                )
+        self._ob_extremes = extremes
+        
+        if self._bar_count < 20:
+            return []
+        
+        return self._evaluate_latest_bar(htf_bias)
+    
+    def _prime_stream(self) -> None:
+        """Seed update() state from the last analyze() call, if any"""
+        self._ob_extremes = {}
+        self._recent_highs.clear()
+        self._recent_lows.clear()
+        if self._suffix_low is None:
+            return
+        
+        for ob in self.ob_detector.get_active_order_blocks():
+            self._ob_extremes[ob.index] = (
+                self._suffix_low[ob.index], self._suffix_high[ob.index]
+            )
+        self._recent_highs.extend(self._highs[-self._recent_highs.maxlen:])
+        self._recent_lows.extend(self._lows[-self._recent_lows.maxlen:])
+    
+    def _evaluate_latest_bar(self, htf_bias: Optional[str]) -> List[Model12Setup]:
+        """Run the setup state machine for the latest bar"""
         
         # Check if in killzone
-        current_time = ohlc.index[-1]
-        if hasattr(current_time, 'to_pydatetime'):
-            current_time = current_time.to_pydatetime()
-        current_killzone = self.killzone_manager.get_current_killzone(current_time)
+        current_time = self._last_time
+        if isinstance(current_time, pd.Timestamp):
+            current_killzone = self.killzone_manager.get_current_killzone_ts(current_time)
+        else:
+            current_killzone = self.killzone_manager.get_current_killzone(current_time)
         
         if self.require_killzone and current_killzone is None:
             # Update existing setups but don't create new ones
-            self._update_existing_setups(ohlc)
+            self._update_existing_setups()
             return self._active_setups
         
         # Look for new setups
-        self._scan_for_new_setups(ohlc, htf_bias, current_killzone)
+        self._scan_for_new_setups(htf_bias, current_killzone)
         
         # Update existing setups
-        self._update_existing_setups(ohlc)
+        self._update_existing_setups()
         
         # Check for entry signals
-        self._check_entry_signals(ohlc)
+        self._check_entry_signals()
         
         return self._active_setups
     
     def _scan_for_new_setups(
         self,
-        ohlc: pd.DataFrame,
         htf_bias: Optional[str],
         killzone: Optional[Killzone],
     ) -> None:
         """Scan for new Model 12 setups"""
         
-        current_price = ohlc['close'].iloc[-1]
-        
         # Get active Order Blocks
         bullish_obs = self.ob_detector.get_active_order_blocks(OBDirection.BULLISH)
         bearish_obs = self.ob_detector.get_active_order_blocks(OBDirection.BEARISH)
@@ -205,269 +411,183 @@ class Model12Detector:
         # Get active FVGs
         bullish_fvgs = self.fvg_detector.get_active_fvgs(FVGDirection.BULLISH)
         bearish_fvgs = self.fvg_detector.get_active_fvgs(FVGDirection.BEARISH)
+        bullish_fvg_arrays = self.fvg_detector.as_arrays(FVGDirection.BULLISH)
+        bearish_fvg_arrays = self.fvg_detector.as_arrays(FVGDirection.BEARISH)
         
         # Look for bullish setups (if not bearish bias)
         if htf_bias != "bearish":
-            self._scan_bullish_setups(
-                ohlc, bullish_obs, bullish_fvgs, killzone
+            self._scan_setups(
+                bullish_obs, bullish_fvgs, bullish_fvg_arrays, killzone, is_bullish=True
             )
         
         # Look for bearish setups (if not bullish bias)
         if htf_bias != "bullish":
-            self._scan_bearish_setups(
-                ohlc, bearish_obs, bearish_fvgs, killzone
+            self._scan_setups(
+                bearish_obs, bearish_fvgs, bearish_fvg_arrays, killzone, is_bullish=False
             )
     
-    def _scan_bullish_setups(
+    def _scan_setups(
         self,
-        ohlc: pd.DataFrame,
         order_blocks: List[OrderBlock],
-        fvgs: List[FVG],
+        fvgs: Tuple[FVG, ...],
+        fvg_arrays: FVGArrays,
         killzone: Optional[Killzone],
+        is_bullish: bool,
     ) -> None:
-        """Scan for bullish Model 12 setups"""
+        """
+        Scan for Model 12 setups in one direction.
         
-        current_price = ohlc['close'].iloc[-1]
-        current_time = ohlc.index[-1]
+        Every OB pairs with the newest qualifying FVG that formed after it, which
+        is the newest qualifying FVG overall whenever one exists. Entry, stop,
+        risk and target are therefore computed for all OBs at once and setups
+        are only built for the rows that pass.
+        """
+        if not order_blocks:
+            return
         
-        for ob in order_blocks:
-            # Skip if OB already in an active setup
-            if self._ob_in_active_setup(ob):
-                continue
-            
-            # Check if price has retested the OB
-            if self._check_ob_retest(ohlc, ob, is_bullish=True):
-                # Look for FVG that formed after the retest
-                matching_fvg = self._find_matching_fvg(
-                    fvgs, ob, ohlc, is_bullish=True
-                )
-                
-                if matching_fvg:
-                    # Create setup
-                    setup = self._create_bullish_setup(
-                        ob, matching_fvg, ohlc, killzone
-                    )
-                    
-                    if setup.is_valid:
-                        self._active_setups.append(setup)
-    
-    def _scan_bearish_setups(
-        self,
-        ohlc: pd.DataFrame,
-        order_blocks: List[OrderBlock],
-        fvgs: List[FVG],
-        killzone: Optional[Killzone],
-    ) -> None:
-        """Scan for bearish Model 12 setups"""
+        # Newest FVG in the trade direction that passes the filters
+        matching_fvg = self._find_matching_fvg(fvgs, fvg_arrays, is_bullish)
+        if matching_fvg is None:
+            return
         
-        for ob in order_blocks:
-            if self._ob_in_active_setup(ob):
-                continue
-            
-            if self._check_ob_retest(ohlc, ob, is_bullish=False):
-                matching_fvg = self._find_matching_fvg(
-                    fvgs, ob, ohlc, is_bullish=False
-                )
-                
-                if matching_fvg:
-                    setup = self._create_bearish_setup(
-                        ob, matching_fvg, ohlc, killzone
-                    )
-                    
-                    if setup.is_valid:
-                        self._active_setups.append(setup)
-    
-    def _check_ob_retest(
-        self,
-        ohlc: pd.DataFrame,
-        ob: OrderBlock,
-        is_bullish: bool,
-    ) -> bool:
-        """Check if Order Block has been retested"""
+        n = len(order_blocks)
+        ob_index = np.fromiter((ob.index for ob in order_blocks), dtype=np.int64, count=n)
         
-        # Look for price touching OB zone after it formed
-        post_ob_data = ohlc.iloc[ob.index:]
+        # Check if price has retested the OB and the FVG came after it
+        candidate = self._check_ob_retest(order_blocks, is_bullish) & (
+            ob_index < matching_fvg.index
+        )
+        if not candidate.any():
+            return
+        
+        fvg = matching_fvg
+        current_price = self._last_close
+        
+        # Entry at FVG midpoint or middle of the FVG
+        entry_price = fvg.midpoint if fvg.midpoint else (fvg.top + fvg.bottom) / 2
+        fvg_size = abs(fvg.top - fvg.bottom)
         
-        if len(post_ob_data) < 2:
-            return False
+        # Entry is valid while price trades inside the FVG
+        phase = (
+            Model12Phase.ENTRY_VALID if fvg.bottom <= current_price <= fvg.top
+            else Model12Phase.WAITING_ENTRY
+        )
         
         if is_bullish:
-            # For bullish OB, check if price came down to the zone
-            zone_top = ob.top
-            zone_bottom = ob.bottom
+            # Stop loss below OB
+            ob_bottom = np.fromiter((ob.low for ob in order_blocks), dtype=np.float64, count=n)
+            stop_loss = ob_bottom - self._stop_buffer
+            risk_pips = (entry_price - stop_loss) * self._inv_pip
+            
+            # FVG size projection or fixed 20 pip target
+            if self.use_fvg_projection:
+                take_profit = entry_price + fvg_size
+            else:
+                take_profit = entry_price + self._target_move
             
-            # Did any candle low touch the zone?
-            retest = post_ob_data['low'] <= zone_top
-            if retest.any():
-                return True
+            direction = Model12Direction.BULLISH
         else:
-            # For bearish OB, check if price came up to the zone
-            zone_top = ob.top
-            zone_bottom = ob.bottom
+            # Stop loss above OB
+            ob_top = np.fromiter((ob.high for ob in order_blocks), dtype=np.float64, count=n)
+            stop_loss = ob_top + self._stop_buffer
+            risk_pips = (stop_loss - entry_price) * self._inv_pip
             
-            retest = post_ob_data['high'] >= zone_bottom
-            if retest.any():
-                return True
-        
-        return False
-    
-    def _find_matching_fvg(
-        self,
-        fvgs: List[FVG],
-        ob: OrderBlock,
-        ohlc: pd.DataFrame,
-        is_bullish: bool,
-    ) -> Optional[FVG]:
-        """Find FVG that matches the setup criteria"""
+            if self.use_fvg_projection:
+                take_profit = entry_price - fvg_size
+            else:
+                take_profit = entry_price - self._target_move
+            
+            direction = Model12Direction.BEARISH
         
-        # FVG must form after OB retest
-        # FVG must be in the direction of the trade
+        # Check if stop is within limits
+        valid = candidate & ~(risk_pips > self.max_stop_pips)
         
-        matching_fvgs = []
+        # Skip OBs already in an active setup
+        taken = {s.order_block.index for s in self._active_setups if s.order_block}
         
-        for fvg in fvgs:
-            # FVG must be after OB
-            if fvg.index <= ob.index:
+        for i in np.flatnonzero(valid):
+            ob = order_blocks[i]
+            if ob.index in taken:
                 continue
+            taken.add(ob.index)
             
-            # FVG direction must match
-            if is_bullish and fvg.direction != FVGDirection.BULLISH:
-                continue
-            if not is_bullish and fvg.direction != FVGDirection.BEARISH:
-                continue
-            
-            # FVG should not be fully mitigated
-            if fvg.fully_mitigated:
-                continue
-            
-            # FVG should be large enough
-            fvg_size = abs(fvg.top - fvg.bottom) / self.pip_size
-            if fvg_size < self.min_fvg_pips:
-                continue
-            
-            matching_fvgs.append(fvg)
-        
-        # Return the most recent valid FVG
-        if matching_fvgs:
-            return max(matching_fvgs, key=lambda x: x.index)
-        
-        return None
+            risk = float(risk_pips[i])
+            self._active_setups.append(Model12Setup(
+                direction=direction,
+                phase=phase,
+                order_block=ob,
+                fvg=fvg,
+                entry_price=entry_price,
+                stop_loss=float(stop_loss[i]),
+                take_profit=take_profit,
+                target_pips=self.target_pips,
+                killzone=killzone.name if killzone else None,
+                confidence=self._calculate_setup_confidence(ob, fvg, killzone, risk),
+                is_valid=True,
+            ))
     
-    def _create_bullish_setup(
+    def _check_ob_retest(
         self,
-        ob: OrderBlock,
-        fvg: FVG,
-        ohlc: pd.DataFrame,
-        killzone: Optional[Killzone],
-    ) -> Model12Setup:
-        """Create a bullish Model 12 setup"""
-        
-        current_price = ohlc['close'].iloc[-1]
-        current_time = ohlc.index[-1]
+        order_blocks: List[OrderBlock],
+        is_bullish: bool,
+    ) -> np.ndarray:
+        """Flag which Order Blocks have been retested, one bool per OB"""
         
-        # Entry at FVG midpoint or top of FVG
-        entry_price = fvg.midpoint if fvg.midpoint else (fvg.top + fvg.bottom) / 2
+        n = len(order_blocks)
+        ob_index = np.fromiter((ob.index for ob in order_blocks), dtype=np.int64, count=n)
         
-        # Stop loss below OB
-        stop_buffer = 2 * self.pip_size  # 2 pip buffer
-        stop_loss = ob.bottom - stop_buffer
+        # Look for price touching OB zone after it formed
+        formed = ob_index <= self._bar_count - 2
         
-        # Check if stop is within limits
-        risk_pips = (entry_price - stop_loss) / self.pip_size
-        
-        if risk_pips > self.max_stop_pips:
-            return Model12Setup(
-                direction=Model12Direction.BULLISH,
-                phase=Model12Phase.WAITING_OB,
-                is_valid=False,
-                invalidation_reason=f"Risk too high: {risk_pips:.1f} pips > {self.max_stop_pips} max"
+        # Only the extreme on the retest side is needed
+        side = 0 if is_bullish else 1
+        if self._ob_extremes is None:
+            extreme = (self._suffix_low if is_bullish else self._suffix_high)[ob_index]
+        else:
+            extreme = np.fromiter(
+                (self._ob_extremes[ob.index][side] for ob in order_blocks),
+                dtype=np.float64,
+                count=n,
             )
         
-        # Take profit
-        if self.use_fvg_projection:
-            # Use FVG size as target
-            fvg_size = abs(fvg.top - fvg.bottom)
-            take_profit = entry_price + fvg_size
+        if is_bullish:
+            # For bullish OB, did any candle low come down to the zone top?
+            zone_top = np.fromiter((ob.high for ob in order_blocks), dtype=np.float64, count=n)
+            return formed & (extreme <= zone_top)
         else:
-            # Fixed 20 pip target
-            take_profit = entry_price + (self.target_pips * self.pip_size)
-        
-        # Determine phase
-        phase = Model12Phase.WAITING_ENTRY
-        if current_price <= fvg.top and current_price >= fvg.bottom:
-            phase = Model12Phase.ENTRY_VALID
-        elif current_price < fvg.bottom:
-            phase = Model12Phase.WAITING_ENTRY
-        
-        return Model12Setup(
-            direction=Model12Direction.BULLISH,
-            phase=phase,
-            order_block=ob,
-            fvg=fvg,
-            entry_price=entry_price,
-            stop_loss=stop_loss,
-            take_profit=take_profit,
-            target_pips=self.target_pips,
-            killzone=killzone.name if killzone else None,
-            confidence=self._calculate_setup_confidence(ob, fvg, killzone, risk_pips),
-            is_valid=True,
-        )
+            # For bearish OB, did any candle high come up to the zone bottom?
+            zone_bottom = np.fromiter(
+                (ob.low for ob in order_blocks), dtype=np.float64, count=n
+            )
+            return formed & (extreme >= zone_bottom)
     
-    def _create_bearish_setup(
+    def _find_matching_fvg(
         self,
-        ob: OrderBlock,
-        fvg: FVG,
-        ohlc: pd.DataFrame,
-        killzone: Optional[Killzone],
-    ) -> Model12Setup:
-        """Create a bearish Model 12 setup"""
-        
-        current_price = ohlc['close'].iloc[-1]
-        
-        # Entry at FVG midpoint
-        entry_price = fvg.midpoint if fvg.midpoint else (fvg.top + fvg.bottom) / 2
-        
-        # Stop loss above OB
-        stop_buffer = 2 * self.pip_size
-        stop_loss = ob.top + stop_buffer
-        
-        risk_pips = (stop_loss - entry_price) / self.pip_size
-        
-        if risk_pips > self.max_stop_pips:
-            return Model12Setup(
-                direction=Model12Direction.BEARISH,
-                phase=Model12Phase.WAITING_OB,
-                is_valid=False,
-                invalidation_reason=f"Risk too high: {risk_pips:.1f} pips > {self.max_stop_pips} max"
-            )
+        fvgs: Tuple[FVG, ...],
+        fvg_arrays: FVGArrays,
+        is_bullish: bool,
+        after_index: int = -1,
+    ) -> Optional[FVG]:
+        """Find FVG that matches the setup criteria"""
         
-        # Take profit
-        if self.use_fvg_projection:
-            fvg_size = abs(fvg.top - fvg.bottom)
-            take_profit = entry_price - fvg_size
-        else:
-            take_profit = entry_price - (self.target_pips * self.pip_size)
-        
-        # Determine phase
-        phase = Model12Phase.WAITING_ENTRY
-        if current_price >= fvg.bottom and current_price <= fvg.top:
-            phase = Model12Phase.ENTRY_VALID
-        elif current_price > fvg.top:
-            phase = Model12Phase.WAITING_ENTRY
-        
-        return Model12Setup(
-            direction=Model12Direction.BEARISH,
-            phase=phase,
-            order_block=ob,
-            fvg=fvg,
-            entry_price=entry_price,
-            stop_loss=stop_loss,
-            take_profit=take_profit,
-            target_pips=self.target_pips,
-            killzone=killzone.name if killzone else None,
-            confidence=self._calculate_setup_confidence(ob, fvg, killzone, risk_pips),
-            is_valid=True,
+        # FVG must form after after_index (the OB retest)
+        # FVG must be in the direction of the trade
+        # FVG should not be mitigated and should be large enough
+        # The most recent valid FVG wins
+        direction = FVGDirection.BULLISH if is_bullish else FVGDirection.BEARISH
+        best = _pick_matching_fvg(
+            fvg_arrays.index,
+            fvg_arrays.direction,
+            fvg_arrays.top,
+            fvg_arrays.bottom,
+            fvg_arrays.mitigated,
+            after_index,
+            direction.value,
+            self.min_fvg_pips,
+            self._inv_pip,
         )
+        
+        return fvgs[best] if best >= 0 else None
     
     def _calculate_setup_confidence(
         self,
@@ -477,105 +597,79 @@ class Model12Detector:
         risk_pips: float,
     ) -> float:
         """Calculate confidence score for setup"""
+        return _setup_confidence(
+            ob.displacement_pips,
+            abs(fvg.top - fvg.bottom) * self._inv_pip,
+            bool(killzone),
+            self.target_pips,
+            risk_pips,
+            ob.mitigated,
+        )
+    
+    def _update_existing_setups(self) -> None:
+        """Update existing setups with current price action"""
         
-        score = 0.0
+        current_price = self._last_close
+        current_high = self._last_high
+        current_low = self._last_low
         
-        # Order Block quality
-        if ob.displacement_pips and ob.displacement_pips > 10:
-            score += 0.2
+        # Drop setups invalidated on an earlier bar in one pass, keeping the list object
+        self._active_setups[:] = [s for s in self._active_setups if s.is_valid]
         
-        # FVG quality
-        fvg_size = abs(fvg.top - fvg.bottom) / self.pip_size
-        if fvg_size >= 5:
-            score += 0.15
-        if fvg_size >= 10:
-            score += 0.1
+        setups = self._active_setups
+        n = len(setups)
+        if n == 0:
+            return
         
-        # Killzone bonus
-        if killzone:
-            score += 0.2
+        # Mirror the setups' price levels into parallel arrays
+        direction = np.fromiter((s.direction for s in setups), dtype=np.int8, count=n)
+        is_bullish = direction == Model12Direction.BULLISH
+        has_fvg = np.fromiter((bool(s.fvg) for s in setups), dtype=bool, count=n)
+        stop_loss = np.fromiter((s.stop_loss for s in setups), dtype=np.float64, count=n)
+        entry_price = np.fromiter((s.entry_price for s in setups), dtype=np.float64, count=n)
+        take_profit = np.fromiter((s.take_profit for s in setups), dtype=np.float64, count=n)
         
-        # Risk/Reward
-        reward_pips = self.target_pips
-        rr = reward_pips / risk_pips if risk_pips > 0 else 0
-        if rr >= 1.5:
-            score += 0.15
-        if rr >= 2.0:
-            score += 0.1
+        # Invalidated if price closes beyond the stop
+        invalid = np.where(is_bullish, current_price < stop_loss, current_price > stop_loss)
         
-        # OB not mitigated
-        if not ob.mitigated:
-            score += 0.1
-        
-        return min(score, 1.0)
-    
-    def _ob_in_active_setup(self, ob: OrderBlock) -> bool:
-        """Check if OB is already in an active setup"""
-        for setup in self._active_setups:
-            if setup.order_block and setup.order_block.index == ob.index:
-                return True
-        return False
-    
-    def _update_existing_setups(self, ohlc: pd.DataFrame) -> None:
-        """Update existing setups with current price action"""
+        # Check if FVG mitigated (touched entry zone)
+        entry_touched = has_fvg & np.where(
+            is_bullish, current_low <= entry_price, current_high >= entry_price
+        )
         
-        current_price = ohlc['close'].iloc[-1]
-        current_high = ohlc['high'].iloc[-1]
-        current_low = ohlc['low'].iloc[-1]
+        # Check if target hit
+        target_hit = np.where(is_bullish, current_high >= take_profit, current_low <= take_profit)
         
-        for setup in self._active_setups[:]:  # Copy list to allow modification
-            if not setup.is_valid:
-                self._active_setups.remove(setup)
-                continue
-            
-            # Check invalidation
-            if setup.direction == Model12Direction.BULLISH:
-                # Invalidated if price closes below stop
-                if current_price < setup.stop_loss:
-                    setup.is_valid = False
-                    setup.invalidation_reason = "Price closed below stop loss"
-                    continue
-                
-                # Check if FVG mitigated (touched entry zone)
-                if setup.fvg and current_low <= setup.entry_price:
-                    setup.phase = Model12Phase.ENTRY_VALID
-                
-                # Check if target hit
-                if current_high >= setup.take_profit:
-                    setup.phase = Model12Phase.COMPLETE
-            
-            else:  # Bearish
-                if current_price > setup.stop_loss:
-                    setup.is_valid = False
-                    setup.invalidation_reason = "Price closed above stop loss"
-                    continue
-                
-                if setup.fvg and current_high >= setup.entry_price:
-                    setup.phase = Model12Phase.ENTRY_VALID
-                
-                if current_low <= setup.take_profit:
-                    setup.phase = Model12Phase.COMPLETE
-    
-    def _check_entry_signals(self, ohlc: pd.DataFrame) -> None:
+        for i in np.flatnonzero(invalid | entry_touched | target_hit):
+            setup = setups[i]
+            if invalid[i]:
+                setup.is_valid = False
+                setup.invalidation_reason = (
+                    "Price closed below stop loss" if is_bullish[i]
+                    else "Price closed above stop loss"
+                )
+            elif target_hit[i]:
+                setup.phase = Model12Phase.COMPLETE
+            else:
+                setup.phase = Model12Phase.ENTRY_VALID
+    
+    def _check_entry_signals(self) -> None:
         """Check for entry signals on valid setups"""
         
         for setup in self._active_setups:
             if setup.phase == Model12Phase.ENTRY_VALID and setup.is_valid:
-                signal = self._generate_signal(setup, ohlc)
+                signal = self._generate_signal(setup)
                 if signal:
                     self._signals.append(signal)
     
     def _generate_signal(
         self,
         setup: Model12Setup,
-        ohlc: pd.DataFrame,
     ) -> Optional[Model12Signal]:
         """Generate trading signal from valid setup"""
         
-        current_time = ohlc.index[-1]
-        
-        risk_pips = abs(setup.entry_price - setup.stop_loss) / self.pip_size
-        reward_pips = abs(setup.take_profit - setup.entry_price) / self.pip_size
+        risk_pips = abs(setup.entry_price - setup.stop_loss) * self._inv_pip
+        reward_pips = abs(setup.take_profit - setup.entry_price) * self._inv_pip
         rr = reward_pips / risk_pips if risk_pips > 0 else 0
         
         return Model12Signal(
@@ -589,7 +683,7 @@ class Model12Detector:
             fvg=setup.fvg,
             order_block=setup.order_block,
             confidence=setup.confidence,
-            timestamp=current_time,
+            timestamp=self._last_time,
         )
     
     def get_active_setups(self) -> List[Model12Setup]:
@@ -613,13 +707,13 @@ class Model12Detector:
         """Format setup for display"""
         
         lines = [
-            f"=== MODEL 12 SETUP ({setup.direction.value.upper()}) ===",
-            f"Phase: {setup.phase.value}",
+            f"=== MODEL 12 SETUP ({setup.direction.label.upper()}) ===",
+            f"Phase: {setup.phase.label}",
             f"Confidence: {setup.confidence:.0%}",
         ]
         
         if setup.order_block:
-            lines.append(f"Order Block: {setup.order_block.top:.5f} - {setup.order_block.bottom:.5f}")
+            lines.append(f"Order Block: {setup.order_block.high:.5f} - {setup.order_block.low:.5f}")
         
         if setup.fvg:
             lines.append(f"FVG: {setup.fvg.top:.5f} - {setup.fvg.bottom:.5f}")
@@ -5,16 +5,62 @@ Standard ICT retracement entry at Optimal Trade Entry zone.
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import NamedTuple, Optional
 import pandas as pd
 import numpy as np
 
 from ict_agent.detectors.market_structure import MarketStructureAnalyzer, StructureType
 from ict_agent.detectors.fvg import FVGDetector, FVGDirection
 from ict_agent.detectors.order_block import OrderBlockDetector, OBDirection
+from ict_agent._compat import DATACLASS_SLOTS
+from ict_agent._njit import njit
 
 
-@dataclass 
+# OTE Fibonacci retracement ratios
+FIB_618 = 0.618
+FIB_705 = 0.705
+FIB_79 = 0.79
+
+
+@njit(cache=True)
+def _ote_zone(swing_high: float, swing_low: float, bullish: bool) -> tuple:
+    """OTE levels as (ote_618, ote_705, ote_79) for the given swing range"""
+    swing_range = swing_high - swing_low
+    if bullish:
+        return (
+            swing_high - (swing_range * FIB_618),
+            swing_high - (swing_range * FIB_705),
+            swing_high - (swing_range * FIB_79),
+        )
+    return (
+        swing_low + (swing_range * FIB_618),
+        swing_low + (swing_range * FIB_705),
+        swing_low + (swing_range * FIB_79),
+    )
+
+
+@njit(cache=True)
+def _in_ote_zone(price: float, swing_high: float, swing_low: float, bullish: bool) -> bool:
+    """Whether price sits between the 61.8% and 79% retracement levels"""
+    ote_618, ote_705, ote_79 = _ote_zone(swing_high, swing_low, bullish)
+    if bullish:
+        return ote_79 <= price <= ote_618
+    return ote_618 <= price <= ote_79
+
+
+def _any_zone_contains(bottoms: np.ndarray, tops: np.ndarray, price: float) -> bool:
+    """Whether price falls inside any of the [bottom, top] zones"""
+    return bool(((bottoms <= price) & (tops >= price)).any())
+
+
+class OTEZone(NamedTuple):
+    """OTE retracement levels for a swing range"""
+    ote_618: float
+    ote_705: float
+    ote_79: float
+
+
+@dataclass(**DATACLASS_SLOTS)
 class OTESetup:
     """A valid OTE retracement setup"""
     timestamp: datetime
@@ -57,14 +103,9 @@ class OTERetracementModel:
     - When HTF and LTF aligned
     """
     
-    OTE_LEVELS = {
-        "fib_618": 0.618,
-        "fib_705": 0.705,
-        "fib_79": 0.79,
-    }
-    
     def __init__(self, pip_size: float = 0.0001):
         self.pip_size = pip_size
+        self._stop_buffer = 5 * pip_size  # 5 pip buffer beyond the swing
         self.structure_analyzer = MarketStructureAnalyzer()
         self.fvg_detector = FVGDetector(pip_size=pip_size)
         self.ob_detector = OrderBlockDetector(pip_size=pip_size)
@@ -74,29 +115,14 @@ class OTERetracementModel:
         swing_high: float,
         swing_low: float,
         direction: str,
-    ) -> dict:
+    ) -> OTEZone:
         """
         Calculate OTE zone levels.
         
         For bullish: measure from swing low, OTE is retracement down
         For bearish: measure from swing high, OTE is retracement up
         """
-        swing_range = swing_high - swing_low
-        
-        if direction == "bullish":
-            ote_618 = swing_high - (swing_range * self.OTE_LEVELS["fib_618"])
-            ote_705 = swing_high - (swing_range * self.OTE_LEVELS["fib_705"])
-            ote_79 = swing_high - (swing_range * self.OTE_LEVELS["fib_79"])
-        else:
-            ote_618 = swing_low + (swing_range * self.OTE_LEVELS["fib_618"])
-            ote_705 = swing_low + (swing_range * self.OTE_LEVELS["fib_705"])
-            ote_79 = swing_low + (swing_range * self.OTE_LEVELS["fib_79"])
-        
-        return {
-            "ote_618": ote_618,
-            "ote_705": ote_705,
-            "ote_79": ote_79,
-        }
+        return OTEZone(*_ote_zone(swing_high, swing_low, direction == "bullish"))
     
     def is_in_ote_zone(
         self,
@@ -106,12 +132,7 @@ class OTERetracementModel:
         direction: str,
     ) -> bool:
         """Check if price is currently in OTE zone"""
-        ote = self.calculate_ote_zone(swing_high, swing_low, direction)
-        
-        if direction == "bullish":
-            return ote["ote_79"] <= price <= ote["ote_618"]
-        else:
-            return ote["ote_618"] <= price <= ote["ote_79"]
+        return _in_ote_zone(price, swing_high, swing_low, direction == "bullish")
     
     def scan(
         self,
@@ -135,67 +156,56 @@ class OTERetracementModel:
         self.fvg_detector.detect(ohlc)
         self.ob_detector.detect(ohlc)
         
-        swings = self.structure_analyzer.get_protected_swings()
-        if len(swings) < 2:
+        swings = self.structure_analyzer.get_protected_swing_arrays()
+        if len(swings.index) < 2:
             return None
         
-        swing_highs = [s for s in swings if s.swing_type.value == 1]
-        swing_lows = [s for s in swings if s.swing_type.value == -1]
+        is_high = swings.swing_type == 1
+        is_low = swings.swing_type == -1
         
-        if not swing_highs or not swing_lows:
+        if not is_high.any() or not is_low.any():
             return None
         
-        latest_high = max(swing_highs, key=lambda s: s.index)
-        latest_low = max(swing_lows, key=lambda s: s.index)
+        # Latest (highest bar index) protected swing high and low
+        latest_high = np.flatnonzero(is_high)[swings.index[is_high].argmax()]
+        latest_low = np.flatnonzero(is_low)[swings.index[is_low].argmax()]
         
-        swing_high = latest_high.price
-        swing_low = latest_low.price
+        swing_high = swings.price[latest_high]
+        swing_low = swings.price[latest_low]
         
-        current_price = ohlc.iloc[-1]["close"]
+        current_price = float(ohlc["close"].to_numpy()[-1])
         
         if not self.is_in_ote_zone(current_price, swing_high, swing_low, htf_bias):
             return None
         
         ote = self.calculate_ote_zone(swing_high, swing_low, htf_bias)
         
-        in_fvg = False
-        in_ob = False
-        
         if htf_bias == "bullish":
-            fvgs = self.fvg_detector.get_active_fvgs(FVGDirection.BULLISH)
+            fvgs = self.fvg_detector.as_arrays(FVGDirection.BULLISH)
             obs = self.ob_detector.get_active_order_blocks(OBDirection.BULLISH)
             
-            for fvg in fvgs:
-                if fvg.contains_price(current_price):
-                    in_fvg = True
-                    break
-            
-            for ob in obs:
-                if ob.contains_price(current_price):
-                    in_ob = True
-                    break
-            
-            entry = ote["ote_705"]
-            stop = swing_low - (5 * self.pip_size)
+            entry = ote.ote_705
+            stop = swing_low - self._stop_buffer
             target = swing_high
         else:
-            fvgs = self.fvg_detector.get_active_fvgs(FVGDirection.BEARISH)
+            fvgs = self.fvg_detector.as_arrays(FVGDirection.BEARISH)
             obs = self.ob_detector.get_active_order_blocks(OBDirection.BEARISH)
             
-            for fvg in fvgs:
-                if fvg.contains_price(current_price):
-                    in_fvg = True
-                    break
-            
-            for ob in obs:
-                if ob.contains_price(current_price):
-                    in_ob = True
-                    break
-            
-            entry = ote["ote_705"]
-            stop = swing_high + (5 * self.pip_size)
+            entry = ote.ote_705
+            stop = swing_high + self._stop_buffer
             target = swing_low
         
+        in_fvg = _any_zone_contains(
+            fvgs.bottom,
+            fvgs.top,
+            current_price,
+        )
+        in_ob = _any_zone_contains(
+            np.fromiter((ob.low for ob in obs), dtype=np.float64, count=len(obs)),
+            np.fromiter((ob.high for ob in obs), dtype=np.float64, count=len(obs)),
+            current_price,
+        )
+        
         risk = abs(entry - stop)
         reward = abs(target - entry)
         rr = reward / risk if risk > 0 else 0
@@ -208,9 +218,9 @@ class OTERetracementModel:
             direction=htf_bias,
             swing_high=swing_high,
             swing_low=swing_low,
-            ote_618=ote["ote_618"],
-            ote_705=ote["ote_705"],
-            ote_79=ote["ote_79"],
+            ote_618=ote.ote_618,
+            ote_705=ote.ote_705,
+            ote_79=ote.ote_79,
             current_price=current_price,
             entry_price=entry,
             stop_loss=stop,
@@ -6,10 +6,198 @@ ICT's session-based accumulation/manipulation/distribution model.
 from dataclasses import dataclass
 from datetime import datetime, time
 from enum import Enum
-from typing import Optional
+from typing import Iterator, Optional, Union
+import weakref
 import pandas as pd
 import numpy as np
 
+from ict_agent.data.ohlc_view import OHLCView
+from ict_agent._njit import njit
+
+
+_NS_30_MIN = 30 * 60 * 1_000_000_000
+_NS_60_MIN = 60 * 60 * 1_000_000_000
+
+# One scan_batch_records() row per bar with a setup
+PO3_RECORD_DTYPE = np.dtype([
+    ("index", np.int64),
+    ("direction", np.int8),
+    ("accumulation_low", np.float64),
+    ("accumulation_high", np.float64),
+    ("manipulation_level", np.float64),
+    ("entry_price", np.float64),
+    ("stop_loss", np.float64),
+    ("target", np.float64),
+    ("risk_reward", np.float64),
+])
+
+
+@njit(cache=True)
+def _nan_max(values: np.ndarray) -> float:
+    """Maximum ignoring NaNs (NaN only if every value is NaN)"""
+    result = np.nan
+    for v in values:
+        if v > result or result != result:
+            result = v
+    return result
+
+
+@njit(cache=True)
+def _nan_min(values: np.ndarray) -> float:
+    """Minimum ignoring NaNs (NaN only if every value is NaN)"""
+    result = np.nan
+    for v in values:
+        if v < result or result != result:
+            result = v
+    return result
+
+
+@njit(cache=True)
+def _po3_decide(
+    accum_high: float,
+    accum_low: float,
+    manip_high: float,
+    manip_low: float,
+    close: float,
+    pip_size: float,
+) -> tuple:
+    """
+    Breakout decision from the accumulation and manipulation ranges.
+    
+    Returns (sign, manipulation_level, stop, target, rr) where sign is 1 for
+    bullish, -1 for bearish and 0 when there is no setup.
+    """
+    # Failed break back inside the range; a bearish failure takes precedence
+    bearish = (manip_high > accum_high) & (close < accum_high)
+    bullish = (manip_low < accum_low) & (close > accum_low) & (not bearish)
+    sign = int(bullish) - int(bearish)
+    
+    if sign == 0:
+        return 0, np.nan, np.nan, np.nan, 0.0
+    
+    bear = sign < 0
+    level = manip_high if bear else manip_low
+    stop = level + (10 * pip_size) if bear else level - (10 * pip_size)
+    target = accum_low if bear else accum_high
+    
+    risk = abs(close - stop)
+    reward = abs(target - close)
+    rr = reward / risk if risk > 0 else 0.0
+    if rr < 1.5:
+        sign = 0
+    
+    return sign, level, stop, target, rr
+
+
+@njit(cache=True)
+def _po3_core(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    close: float,
+    pip_size: float,
+) -> tuple:
+    """
+    Accumulation/manipulation/break logic on a session's high/low arrays.
+    
+    The first 6 bars accumulate and the next 6 manipulate. Returns
+    (sign, accum_low, accum_high, manipulation_level, stop, target, rr).
+    """
+    accum_high = _nan_max(highs[:6])
+    accum_low = _nan_min(lows[:6])
+    
+    sign, level, stop, target, rr = _po3_decide(
+        accum_high, accum_low, _nan_max(highs[6:12]), _nan_min(lows[6:12]), close, pip_size
+    )
+    
+    return sign, accum_low, accum_high, level, stop, target, rr
+
+
+@njit(cache=True)
+def _po3_batch(
+    ts_ns: np.ndarray,
+    day: np.ndarray,
+    in_session: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    pip_size: float,
+    tail: bool,
+) -> tuple:
+    """
+    Per-bar PO3 scan results in one pass over the frame.
+    
+    Bar i gets what scan() would return on the frame cut after bar i. Session
+    ranges are carried forward bar by bar and reset at each new day. With
+    tail=True the session is the last 50 bars instead. Returns the arrays
+    (sign, accum_low, accum_high, level, stop, target, rr); sign is 0 on bars
+    without a setup.
+    """
+    n = closes.shape[0]
+    sign = np.zeros(n, dtype=np.int8)
+    accum_lows = np.full(n, np.nan)
+    accum_highs = np.full(n, np.nan)
+    levels = np.full(n, np.nan)
+    stops = np.full(n, np.nan)
+    targets = np.full(n, np.nan)
+    rrs = np.zeros(n)
+    
+    count = 0
+    first_ts = 0
+    accum_high = np.nan
+    accum_low = np.nan
+    manip_high = np.nan
+    manip_low = np.nan
+    
+    for i in range(n):
+        if tail:
+            start = max(0, i - 49)
+            count = i - start + 1
+            first_ts = ts_ns[start]
+            accum_high = _nan_max(highs[start:start + 6])
+            accum_low = _nan_min(lows[start:start + 6])
+            manip_high = _nan_max(highs[start + 6:min(start + 12, i + 1)])
+            manip_low = _nan_min(lows[start + 6:min(start + 12, i + 1)])
+        else:
+            if i == 0 or day[i] != day[i - 1]:
+                count = 0
+                accum_high = np.nan
+                accum_low = np.nan
+                manip_high = np.nan
+                manip_low = np.nan
+            
+            if in_session[i]:
+                if count == 0:
+                    first_ts = ts_ns[i]
+                if count < 6:
+                    if highs[i] > accum_high or accum_high != accum_high:
+                        accum_high = highs[i]
+                    if lows[i] < accum_low or accum_low != accum_low:
+                        accum_low = lows[i]
+                elif count < 12:
+                    if highs[i] > manip_high or manip_high != manip_high:
+                        manip_high = highs[i]
+                    if lows[i] < manip_low or manip_low != manip_low:
+                        manip_low = lows[i]
+                count += 1
+        
+        # Distribution phase (an hour into the session) with 10+ session bars
+        if i + 1 < 10 or count < 10 or ts_ns[i] - first_ts < _NS_60_MIN:
+            continue
+        
+        s, level, stop, target, rr = _po3_decide(
+            accum_high, accum_low, manip_high, manip_low, closes[i], pip_size
+        )
+        if s != 0:
+            sign[i] = s
+            accum_lows[i] = accum_low
+            accum_highs[i] = accum_high
+            levels[i] = level
+            stops[i] = stop
+            targets[i] = target
+            rrs[i] = rr
+    
+    return sign, accum_lows, accum_highs, levels, stops, targets, rrs
+
 
 class PO3Phase(Enum):
     ACCUMULATION = "accumulation"
@@ -17,6 +205,11 @@ class PO3Phase(Enum):
     DISTRIBUTION = "distribution"
 
 
+# Phase codes used internally; PO3Phase is only built at the API boundary
+_ACC, _MAN, _DIS = 0, 1, 2
+_PHASES = (PO3Phase.ACCUMULATION, PO3Phase.MANIPULATION, PO3Phase.DISTRIBUTION)
+
+
 @dataclass
 class PO3Setup:
     """A valid Power of Three setup"""
@@ -65,10 +258,17 @@ class PowerOfThreeModel:
     
     def __init__(self, pip_size: float = 0.0001):
         self.pip_size = pip_size
+        
+        # Column view and session positions of the last scanned frame, with a
+        # weak reference to that DataFrame and its (len, last bar) fingerprint
+        self._frame_ref: Optional[weakref.ref] = None
+        self._frame_fingerprint: Optional[tuple] = None
+        self._view: Optional[OHLCView] = None
+        self._session_cache: dict[str, np.ndarray] = {}
     
     def identify_phase(
         self,
-        ohlc: pd.DataFrame,
+        ohlc: Union[pd.DataFrame, OHLCView],
         session: str = "ny",
     ) -> PO3Phase:
         """
@@ -76,92 +276,80 @@ class PowerOfThreeModel:
         
         Returns the current phase based on session timing and price action.
         """
+        return _PHASES[self._identify_phase_code(ohlc, session)]
+    
+    def _identify_phase_code(
+        self,
+        ohlc: Union[pd.DataFrame, OHLCView],
+        session: str,
+    ) -> int:
+        """identify_phase() as an int code (_ACC, _MAN or _DIS)"""
         if len(ohlc) < 10:
-            return PO3Phase.ACCUMULATION
+            return _ACC
         
-        current_time = ohlc.index[-1]
-        session_data = self._get_session_data(ohlc, session)
+        view = self._frame_view(ohlc)
+        positions = self._get_session_positions(view, session)
         
-        if len(session_data) < 5:
-            return PO3Phase.ACCUMULATION
+        if len(positions) < 5:
+            return _ACC
         
-        session_start = session_data.index[0]
-        minutes_elapsed = (current_time - session_start).total_seconds() / 60
+        # Elapsed session time in integer nanoseconds
+        elapsed_ns = view.index[-1].value - view.index[positions[0]].value
         
-        if minutes_elapsed < 30:
-            return PO3Phase.ACCUMULATION
-        elif minutes_elapsed < 60:
-            return PO3Phase.MANIPULATION
+        if elapsed_ns < _NS_30_MIN:
+            return _ACC
+        elif elapsed_ns < _NS_60_MIN:
+            return _MAN
         else:
-            return PO3Phase.DISTRIBUTION
+            return _DIS
     
     def scan(
         self,
-        ohlc: pd.DataFrame,
+        ohlc: Union[pd.DataFrame, OHLCView],
         session: str = "ny",
     ) -> Optional[PO3Setup]:
         """
         Scan for Power of Three setup.
         
+        Args:
+            ohlc: OHLC DataFrame, or an OHLCView of one for repeated scans
+            session: Session name from SESSIONS
+        
         Returns:
             PO3Setup if in distribution phase with valid setup, None otherwise
         """
-        current_phase = self.identify_phase(ohlc, session)
-        
-        if current_phase != PO3Phase.DISTRIBUTION:
-            return None
-        
-        session_data = self._get_session_data(ohlc, session)
-        if len(session_data) < 10:
+        if self._identify_phase_code(ohlc, session) != _DIS:
             return None
         
-        accum_data = session_data.head(6)
-        accum_high = accum_data["high"].max()
-        accum_low = accum_data["low"].min()
-        accum_range = (accum_low, accum_high)
-        
-        manip_data = session_data.iloc[6:12] if len(session_data) > 12 else session_data.iloc[6:]
-        
-        if len(manip_data) == 0:
+        view = self._frame_view(ohlc)
+        positions = self._get_session_positions(view, session)
+        if len(positions) < 10:
             return None
         
-        manip_high = manip_data["high"].max()
-        manip_low = manip_data["low"].min()
-        
-        broke_high = manip_high > accum_high
-        broke_low = manip_low < accum_low
+        current_price = float(view.close[-1])
         
-        if not (broke_high or broke_low):
-            return None
-        
-        current_price = ohlc.iloc[-1]["close"]
-        
-        if broke_high and current_price < accum_high:
-            direction = "bearish"
-            manipulation_level = manip_high
-            entry = current_price
-            stop = manip_high + (10 * self.pip_size)
-            target = accum_low
-        elif broke_low and current_price > accum_low:
-            direction = "bullish"
-            manipulation_level = manip_low
-            entry = current_price
-            stop = manip_low - (10 * self.pip_size)
-            target = accum_high
+        # Only the first 12 session bars feed the ranges; slice them as views
+        # when they are consecutive rows (the usual case) instead of gathering
+        first = positions[:12]
+        if first[-1] - first[0] == len(first) - 1:
+            rows = slice(first[0], first[-1] + 1)
         else:
-            return None
-        
-        risk = abs(entry - stop)
-        reward = abs(target - entry)
-        rr = reward / risk if risk > 0 else 0
+            rows = first
         
-        if rr < 1.5:
+        sign, accum_low, accum_high, manipulation_level, stop, target, rr = _po3_core(
+            view.high[rows], view.low[rows], current_price, self.pip_size
+        )
+        if sign == 0:
             return None
         
+        direction = "bullish" if sign > 0 else "bearish"
+        accum_range = (accum_low, accum_high)
+        entry = current_price
+        
         return PO3Setup(
-            timestamp=ohlc.index[-1],
+            timestamp=view.index[-1],
             session=session,
-            current_phase=current_phase,
+            current_phase=PO3Phase.DISTRIBUTION,
             direction=direction,
             accumulation_range=accum_range,
             manipulation_level=manipulation_level,
@@ -171,29 +359,162 @@ class PowerOfThreeModel:
             risk_reward=rr,
         )
     
-    def _get_session_data(
-        self, ohlc: pd.DataFrame, session: str
+    def scan_batch(
+        self,
+        ohlc: Union[pd.DataFrame, OHLCView],
+        session: str = "ny",
     ) -> pd.DataFrame:
-        """Extract data for the current session"""
-        if session not in self.SESSIONS:
-            return ohlc.tail(50)
+        """
+        Scan every bar of a backtest frame in one pass.
         
-        start_time, end_time = self.SESSIONS[session]
+        Equivalent to calling scan() on each growing prefix of the frame, but
+        the session ranges are carried forward in a single compiled loop.
+        The index must be sorted.
+        
+        Returns:
+            DataFrame with one row per bar that has a setup, indexed by the
+            bar timestamp
+        """
+        view = ohlc if isinstance(ohlc, OHLCView) else OHLCView.from_df(ohlc)
+        records = self.scan_batch_records(view, session)
+        
+        return pd.DataFrame(
+            {
+                "direction": np.where(records["direction"] > 0, "bullish", "bearish"),
+                "accumulation_low": records["accumulation_low"],
+                "accumulation_high": records["accumulation_high"],
+                "manipulation_level": records["manipulation_level"],
+                "entry_price": records["entry_price"],
+                "stop_loss": records["stop_loss"],
+                "target": records["target"],
+                "risk_reward": records["risk_reward"],
+            },
+            index=view.index[records["index"]],
+        )
+    
+    def scan_batch_records(
+        self,
+        ohlc: Union[pd.DataFrame, OHLCView],
+        session: str = "ny",
+    ) -> np.ndarray:
+        """
+        Same scan as scan_batch(), as a flat PO3_RECORD_DTYPE array.
+        
+        One record per bar with a setup; "index" is the bar position and
+        "direction" is 1 for bullish, -1 for bearish. Use iter_setups() to
+        turn records into PO3Setup objects when needed.
+        """
+        view = ohlc if isinstance(ohlc, OHLCView) else OHLCView.from_df(ohlc)
+        index = view.index
+        n = len(view)
         
-        current_date = ohlc.index[-1].date()
+        tail = session not in self.SESSIONS
+        in_session = np.zeros(n, dtype=bool)
+        if not tail:
+            start_time, end_time = self.SESSIONS[session]
+            in_session[index.indexer_between_time(start_time, end_time)] = True
         
-        mask = ohlc.index.map(
-            lambda dt: self._time_in_session(dt.time(), start_time, end_time)
-            and dt.date() == current_date
+        sign, accum_low, accum_high, level, stop, target, rr = _po3_batch(
+            index.as_unit("ns").asi8,
+            index.normalize().as_unit("ns").asi8,
+            in_session,
+            view.high,
+            view.low,
+            view.close,
+            self.pip_size,
+            tail,
         )
         
-        return ohlc[mask]
+        hits = np.flatnonzero(sign)
+        records = np.empty(len(hits), dtype=PO3_RECORD_DTYPE)
+        records["index"] = hits
+        records["direction"] = sign[hits]
+        records["accumulation_low"] = accum_low[hits]
+        records["accumulation_high"] = accum_high[hits]
+        records["manipulation_level"] = level[hits]
+        records["entry_price"] = view.close[hits]
+        records["stop_loss"] = stop[hits]
+        records["target"] = target[hits]
+        records["risk_reward"] = rr[hits]
+        return records
     
-    def _time_in_session(
-        self, t: time, start: time, end: time
-    ) -> bool:
-        """Check if time is within session"""
-        if start <= end:
-            return start <= t <= end
-        else:
-            return t >= start or t <= end
+    def iter_setups(
+        self,
+        ohlc: Union[pd.DataFrame, OHLCView],
+        records: np.ndarray,
+        session: str = "ny",
+    ) -> Iterator[PO3Setup]:
+        """Lazily build PO3Setup objects from scan_batch_records() output"""
+        index = ohlc.index
+        for record in records:
+            yield PO3Setup(
+                timestamp=index[record["index"]],
+                session=session,
+                current_phase=PO3Phase.DISTRIBUTION,
+                direction="bullish" if record["direction"] > 0 else "bearish",
+                accumulation_range=(
+                    float(record["accumulation_low"]), float(record["accumulation_high"])
+                ),
+                manipulation_level=float(record["manipulation_level"]),
+                entry_price=float(record["entry_price"]),
+                stop_loss=float(record["stop_loss"]),
+                target=float(record["target"]),
+                risk_reward=float(record["risk_reward"]),
+            )
+    
+    def _frame_view(self, ohlc: Union[pd.DataFrame, OHLCView]) -> OHLCView:
+        """
+        Column view of the frame, extracted once per frame.
+        
+        identify_phase() and scan() see the same frame, so its view and session
+        slices are reused. A DataFrame's view is only reused for the very same
+        object whose length, last timestamp and last bar still match, so
+        appending a bar or updating the forming bar in place rebuilds it.
+        """
+        if isinstance(ohlc, OHLCView):
+            if ohlc is not self._view:
+                self._frame_ref = None
+                self._view = ohlc
+                self._session_cache = {}
+            return self._view
+        
+        fingerprint = (
+            len(ohlc),
+            ohlc.index[-1],
+            ohlc["high"].to_numpy()[-1],
+            ohlc["low"].to_numpy()[-1],
+            ohlc["close"].to_numpy()[-1],
+        )
+        if (
+            self._frame_ref is None
+            or self._frame_ref() is not ohlc
+            or fingerprint != self._frame_fingerprint
+        ):
+            self._frame_ref = weakref.ref(ohlc)
+            self._frame_fingerprint = fingerprint
+            self._view = OHLCView.from_df(ohlc)
+            self._session_cache = {}
+        return self._view
+    
+    def _get_session_positions(self, view: OHLCView, session: str) -> np.ndarray:
+        """Row positions of the current session"""
+        if session in self._session_cache:
+            return self._session_cache[session]
+        
+        if session not in self.SESSIONS:
+            n = len(view)
+            positions = np.arange(max(n - 50, 0), n)
+            self._session_cache[session] = positions
+            return positions
+        
+        start_time, end_time = self.SESSIONS[session]
+        index = view.index
+        
+        # Session bars by wall-clock time (handles sessions crossing midnight)
+        positions = index.indexer_between_time(start_time, end_time)
+        
+        # Keep those on the last bar's calendar day, a suffix of the sorted index
+        day_start = index.searchsorted(index[-1].normalize(), side="left")
+        positions = positions[positions >= day_start]
+        self._session_cache[session] = positions
+        return positions
@@ -6,12 +6,87 @@ ICT's precision entry model for specific 1-hour windows with high probability se
 from dataclasses import dataclass
 from datetime import datetime, time
 from typing import Optional
+import weakref
 import pandas as pd
+import numpy as np
 
 from ict_agent.detectors.fvg import FVGDetector, FVGDirection, FVG
 from ict_agent.detectors.displacement import DisplacementDetector, DisplacementDirection
 from ict_agent.detectors.market_structure import MarketStructureAnalyzer, StructureType
 from ict_agent.engine.killzone import KillzoneManager
+from ict_agent._njit import njit, prange
+
+
+def _time_to_us(t: time) -> int:
+    """Microseconds since midnight for a wall-clock time"""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 1_000_000 + t.microsecond
+
+
+@njit(parallel=True, cache=True)
+def _sb_batch(
+    window_start: np.ndarray,
+    closes: np.ndarray,
+    swing_target: np.ndarray,
+    first_displacement: int,
+    fvg_index: np.ndarray,
+    fvg_top: np.ndarray,
+    fvg_bottom: np.ndarray,
+    fvg_midpoint: np.ndarray,
+    fvg_mitigation_index: np.ndarray,
+    bullish: bool,
+    pip_size: float,
+) -> tuple:
+    """
+    Per-bar Silver Bullet scan results, one independent bar per iteration.
+    
+    window_start is -1 outside the windows. An FVG counts for bar i if it
+    formed by bar i, inside the current window, and was not mitigated by
+    bar i. Returns (fvg_pos, entry, stop, target, rr); fvg_pos is -1 on bars
+    without a setup.
+    """
+    n = closes.shape[0]
+    fvg_pos = np.full(n, -1, dtype=np.int64)
+    entries = np.full(n, np.nan)
+    stops = np.full(n, np.nan)
+    targets = np.full(n, np.nan)
+    rrs = np.zeros(n)
+    
+    for i in prange(n):
+        if window_start[i] < 0 or first_displacement > i:
+            continue
+        
+        # Most recent FVG in the window that price is trading inside
+        price = closes[i]
+        best = -1
+        first = np.searchsorted(fvg_index, window_start[i])
+        for j in range(first, fvg_index.shape[0]):
+            if fvg_index[j] > i:
+                break
+            if fvg_mitigation_index[j] <= i:
+                continue
+            if fvg_bottom[j] <= price and fvg_top[j] >= price:
+                best = j
+        
+        if best < 0:
+            continue
+        
+        entry = fvg_midpoint[best]
+        if bullish:
+            stop = fvg_bottom[best] - (5 * pip_size)
+        else:
+            stop = fvg_top[best] + (5 * pip_size)
+        target = swing_target[i]
+        
+        risk = abs(entry - stop)
+        reward = abs(target - entry)
+        
+        fvg_pos[i] = best
+        entries[i] = entry
+        stops[i] = stop
+        targets[i] = target
+        rrs[i] = reward / risk if risk > 0 else 0.0
+    
+    return fvg_pos, entries, stops, targets, rrs
 
 
 @dataclass
@@ -62,6 +137,20 @@ class SilverBulletModel:
         self.displacement_detector = DisplacementDetector()
         self.structure_analyzer = MarketStructureAnalyzer()
         self.killzone_manager = KillzoneManager()
+        
+        # Window bounds as microseconds since midnight
+        self._window_bounds = {
+            name: (_time_to_us(start), _time_to_us(end))
+            for name, (start, end) in self.WINDOWS.items()
+        }
+        
+        # Frame the detectors last ran on, as (weakref to it, fingerprint)
+        self._detect_frame: Optional[tuple] = None
+        
+        # Window start positions of the last scanned frame, keyed by window name,
+        # and that frame as (weakref to it, (length, last timestamp))
+        self._window_start_frame: Optional[tuple] = None
+        self._window_start_cache: dict[str, int] = {}
     
     def scan(
         self,
@@ -84,16 +173,20 @@ class SilverBulletModel:
         if not window:
             return None
         
-        self.fvg_detector.detect(ohlc)
-        self.displacement_detector.detect(ohlc)
+        # Scanning the same frame again (e.g. for the other bias) reuses the detection
+        fingerprint = self._frame_fingerprint(ohlc)
+        if not self._is_same_frame(self._detect_frame, ohlc, fingerprint):
+            self.fvg_detector.detect(ohlc)
+            self.displacement_detector.detect(ohlc)
+            self._detect_frame = (weakref.ref(ohlc), fingerprint)
         
         if htf_bias == "bullish":
-            fvgs = self.fvg_detector.get_active_fvgs(FVGDirection.BULLISH)
+            fvg_direction = FVGDirection.BULLISH
             displacement = self.displacement_detector.get_recent_displacement(
                 DisplacementDirection.BULLISH
             )
         else:
-            fvgs = self.fvg_detector.get_active_fvgs(FVGDirection.BEARISH)
+            fvg_direction = FVGDirection.BEARISH
             displacement = self.displacement_detector.get_recent_displacement(
                 DisplacementDirection.BEARISH
             )
@@ -101,29 +194,36 @@ class SilverBulletModel:
         if not displacement:
             return None
         
-        current_price = ohlc.iloc[-1]["close"]
-        valid_fvgs = []
+        fvg_arrays = self.fvg_detector.as_arrays(fvg_direction)
+        if len(fvg_arrays.index) == 0:
+            return None
+        
+        current_price = float(ohlc["close"].to_numpy()[-1])
+        window_start = self._get_window_start_index(ohlc, window)
         
-        for fvg in fvgs:
-            window_start = self._get_window_start_index(ohlc, window)
-            if fvg.index >= window_start:
-                if fvg.contains_price(current_price):
-                    valid_fvgs.append(fvg)
+        # FVGs are in creation order, so this window's start is a bisection
+        first = int(np.searchsorted(fvg_arrays.index, window_start, side="left"))
         
-        if not valid_fvgs:
+        # FVGs formed in this window that price is trading inside
+        valid = np.flatnonzero(
+            (fvg_arrays.bottom[first:] <= current_price)
+            & (fvg_arrays.top[first:] >= current_price)
+        )
+        
+        if len(valid) == 0:
             return None
         
-        target_fvg = valid_fvgs[-1]
+        target_fvg = self.fvg_detector.get_active_fvgs(fvg_direction)[first + valid[-1]]
         
         entry = target_fvg.midpoint
         
         if htf_bias == "bullish":
             stop = target_fvg.bottom - (5 * self.pip_size)
-            swing_high = ohlc["high"].max()
+            swing_high = float(np.fmax.reduce(ohlc["high"].to_numpy()))
             target = swing_high
         else:
             stop = target_fvg.top + (5 * self.pip_size)
-            swing_low = ohlc["low"].min()
+            swing_low = float(np.fmin.reduce(ohlc["low"].to_numpy()))
             target = swing_low
         
         risk = abs(entry - stop)
@@ -142,22 +242,152 @@ class SilverBulletModel:
             has_displacement=True,
         )
     
+    def scan_batch(
+        self,
+        ohlc: pd.DataFrame,
+        htf_bias: str,
+    ) -> pd.DataFrame:
+        """
+        Scan every bar of a backtest frame in one pass.
+        
+        Equivalent to calling scan() on each growing prefix of the frame. The
+        detectors run once on the whole frame; FVG mitigation is then applied
+        as of each bar, and the bars are evaluated in parallel. The index
+        must be sorted.
+        
+        Returns:
+            DataFrame with one row per bar that has a setup, indexed by the
+            bar timestamp
+        """
+        index = ohlc.index
+        n = len(ohlc)
+        bullish = htf_bias == "bullish"
+        
+        self.fvg_detector.detect(ohlc)
+        self.displacement_detector.detect(ohlc)
+        self._detect_frame = None
+        
+        if bullish:
+            fvg_direction = FVGDirection.BULLISH
+            displacements = self.displacement_detector.get_displacements(
+                DisplacementDirection.BULLISH
+            )
+        else:
+            fvg_direction = FVGDirection.BEARISH
+            displacements = self.displacement_detector.get_displacements(
+                DisplacementDirection.BEARISH
+            )
+        
+        # All FVGs of the bias direction, mitigated later or not
+        fvgs = self.fvg_detector.get_fvgs(fvg_direction)
+        n_fvgs = len(fvgs)
+        mitigation_index = np.fromiter(
+            (n if f.mitigation_index is None else f.mitigation_index for f in fvgs),
+            dtype=np.int64,
+            count=n_fvgs,
+        )
+        
+        # Bar position each window bar's window opened at, -1 outside windows
+        window_code = np.full(n, -1, dtype=np.int64)
+        for code, (start, end) in reversed(list(enumerate(self.WINDOWS.values()))):
+            window_code[index.indexer_between_time(start, end)] = code
+        
+        window_names = list(self.WINDOWS)
+        window_start = np.full(n, -1, dtype=np.int64)
+        days = index.normalize().as_unit("ns").asi8
+        opened: dict[tuple, int] = {}
+        for i in np.flatnonzero(window_code >= 0):
+            key = (days[i], window_code[i])
+            if key not in opened:
+                window_open = self._window_open(index[i], window_names[window_code[i]])
+                opened[key] = int(index.searchsorted(window_open, side="left"))
+            window_start[i] = min(opened[key], i)
+        
+        if bullish:
+            swing_target = np.fmax.accumulate(ohlc["high"].to_numpy(dtype=np.float64))
+        else:
+            swing_target = np.fmin.accumulate(ohlc["low"].to_numpy(dtype=np.float64))
+        
+        fvg_pos, entry, stop, target, rr = _sb_batch(
+            window_start,
+            ohlc["close"].to_numpy(dtype=np.float64),
+            swing_target,
+            displacements[0].index if displacements else n,
+            np.fromiter((f.index for f in fvgs), dtype=np.int64, count=n_fvgs),
+            np.fromiter((f.top for f in fvgs), dtype=np.float64, count=n_fvgs),
+            np.fromiter((f.bottom for f in fvgs), dtype=np.float64, count=n_fvgs),
+            np.fromiter((f.midpoint for f in fvgs), dtype=np.float64, count=n_fvgs),
+            mitigation_index,
+            bullish,
+            self.pip_size,
+        )
+        
+        hits = np.flatnonzero(fvg_pos >= 0)
+        return pd.DataFrame(
+            {
+                "window": np.asarray(window_names, dtype=object)[window_code[hits]],
+                "direction": htf_bias,
+                "fvg_index": np.fromiter(
+                    (fvgs[p].index for p in fvg_pos[hits]), dtype=np.int64, count=len(hits)
+                ),
+                "entry_price": entry[hits],
+                "stop_loss": stop[hits],
+                "target": target[hits],
+                "risk_reward": rr[hits],
+            },
+            index=index[hits],
+        )
+    
     def _get_active_window(self, dt: datetime) -> Optional[str]:
         """Check if current time is in a Silver Bullet window"""
-        current_time = dt.time()
+        t = ((dt.hour * 60 + dt.minute) * 60 + dt.second) * 1_000_000 + dt.microsecond
         
-        for window_name, (start, end) in self.WINDOWS.items():
-            if start <= current_time <= end:
+        for window_name, (start, end) in self._window_bounds.items():
+            if start <= t <= end:
                 return window_name
         
         return None
     
+    @staticmethod
+    def _frame_fingerprint(ohlc: pd.DataFrame) -> tuple:
+        """Length, last timestamp and last bar, which change when a bar is appended or revised"""
+        return (
+            len(ohlc),
+            ohlc.index[-1],
+            ohlc["high"].to_numpy()[-1],
+            ohlc["low"].to_numpy()[-1],
+            ohlc["close"].to_numpy()[-1],
+        )
+    
+    @staticmethod
+    def _is_same_frame(state: Optional[tuple], ohlc: pd.DataFrame, fingerprint: tuple) -> bool:
+        """Whether a (weakref, fingerprint) state still describes this very DataFrame"""
+        return state is not None and state[0]() is ohlc and state[1] == fingerprint
+    
     def _get_window_start_index(self, ohlc: pd.DataFrame, window: str) -> int:
         """Get the index where the current window started"""
-        window_start_time = self.WINDOWS[window][0]
+        # Only the index matters here, so its length and last timestamp suffice
+        fingerprint = (len(ohlc), ohlc.index[-1])
+        if not self._is_same_frame(self._window_start_frame, ohlc, fingerprint):
+            self._window_start_frame = (weakref.ref(ohlc), fingerprint)
+            self._window_start_cache = {}
+        elif window in self._window_start_cache:
+            return self._window_start_cache[window]
         
-        for i, idx in enumerate(ohlc.index):
-            if idx.time() >= window_start_time:
-                return i
+        # Today's window open, then a binary search over the sorted index
+        window_open = self._window_open(ohlc.index[-1], window)
+        start = min(int(ohlc.index.searchsorted(window_open, side="left")), len(ohlc) - 1)
         
-        return 0
+        self._window_start_cache[window] = start
+        return start
+    
+    def _window_open(self, ts: pd.Timestamp, window: str) -> pd.Timestamp:
+        """Opening time of the window on the timestamp's day, in its timezone"""
+        window_start_time = self.WINDOWS[window][0]
+        return ts.replace(
+            hour=window_start_time.hour,
+            minute=window_start_time.minute,
+            second=window_start_time.second,
+            microsecond=window_start_time.microsecond,
+            nanosecond=0,
+        )
@@ -22,11 +22,179 @@ TURTLE SOUP SELL (Bearish):
 Key insight: The sweep IS the manipulation - we trade the reversal.
 """
 
+import bisect
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Tuple
+from typing import List, Optional, Dict, Tuple, Union
 from enum import Enum
 from datetime import datetime
 import pandas as pd
+import numpy as np
+
+from ict_agent._compat import DATACLASS_SLOTS
+from ict_agent.data.ohlc_view import OHLCView
+from ict_agent._njit import njit
+
+
+@njit(cache=True)
+def _swing_mask(prices: np.ndarray, lookback: int, is_high: bool) -> np.ndarray:
+    """
+    Flag every bar strictly beyond all of its lookback neighbours on both sides.
+    
+    One pass in each direction with a monotonic stack finds, for every bar,
+    the nearest bar before and after it that is at least as high (as low
+    for swing lows). A bar is a swing when both are more than lookback bars
+    away, which takes O(n) regardless of lookback. Bars within lookback of
+    either end are never flagged.
+    """
+    n = prices.shape[0]
+    mask = np.zeros(n, dtype=np.bool_)
+    if lookback == 0:
+        mask[:] = True
+        return mask
+    if n < 2 * lookback + 1:
+        return mask
+    
+    signed = prices if is_high else -prices
+    stack = np.empty(n, dtype=np.int64)
+    
+    # Nearest earlier bar at least as extreme, -1 if none
+    previous = np.empty(n, dtype=np.int64)
+    top = 0
+    for i in range(n):
+        while top > 0 and signed[stack[top - 1]] < signed[i]:
+            top -= 1
+        previous[i] = stack[top - 1] if top > 0 else -1
+        stack[top] = i
+        top += 1
+    
+    # Nearest later bar at least as extreme, n if none
+    top = 0
+    for i in range(n - 1, -1, -1):
+        while top > 0 and signed[stack[top - 1]] < signed[i]:
+            top -= 1
+        following = stack[top - 1] if top > 0 else n
+        stack[top] = i
+        top += 1
+        
+        if lookback <= i < n - lookback:
+            mask[i] = previous[i] < i - lookback and following > i + lookback
+    
+    return mask
+
+
+def _wick_rejections(
+    opens: np.ndarray,
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    min_rejection: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flag candles whose lower / upper wick is at least min_rejection of the range.
+    
+    Wicks, ranges and their ratios are computed for all candles at once.
+    Candles with no range never qualify.
+    """
+    total_range = highs - lows
+    has_range = total_range > 0
+    safe_range = np.where(has_range, total_range, 1.0)
+    lower_wick = np.minimum(opens, closes) - lows
+    upper_wick = highs - np.maximum(opens, closes)
+    return (
+        has_range & (lower_wick / safe_range >= min_rejection),
+        has_range & (upper_wick / safe_range >= min_rejection),
+    )
+
+
+@njit(cache=True)
+def _sweep_levels(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    lower_rejection: np.ndarray,
+    upper_rejection: np.ndarray,
+    level_prices: np.ndarray,
+    level_is_bsl: np.ndarray,
+    level_is_ssl: np.ndarray,
+    swept: np.ndarray,
+) -> np.ndarray:
+    """
+    Index of the level each candle sweeps, or -1.
+    
+    Candles are walked in order and each takes the first unswept level (in
+    level order) it sweeps, which is then marked in swept so later candles
+    skip it. A BSL sweep wicks below the level and closes back above on a
+    lower_rejection candle; an SSL sweep mirrors that above on an
+    upper_rejection candle.
+    """
+    swept_by = np.full(closes.shape[0], -1, dtype=np.int64)
+    
+    for i in range(closes.shape[0]):
+        if not (lower_rejection[i] or upper_rejection[i]):
+            continue
+        
+        for j in range(level_prices.shape[0]):
+            if swept[j]:
+                continue
+            
+            price = level_prices[j]
+            if level_is_bsl[j]:
+                hit = lower_rejection[i] and lows[i] < price and closes[i] > price
+            elif level_is_ssl[j]:
+                hit = upper_rejection[i] and highs[i] > price and closes[i] < price
+            else:
+                hit = False
+            
+            if hit:
+                swept[j] = True
+                swept_by[i] = j
+                break
+    
+    return swept_by
+
+
+@njit(cache=True)
+def _find_mss(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    start_idx: int,
+    end_idx: int,
+    is_bullish: bool,
+):
+    """
+    Structure level before start_idx and the first close through it after.
+    
+    The level is the most recent 3-bar swing high (bullish) or swing low
+    (bearish) within the 19 bars before start_idx. The break is searched
+    in (start_idx, end_idx).
+    
+    Returns:
+        (level, break index) - the index is -1 when there is no swing or no break
+    """
+    level = np.nan
+    found = False
+    for i in range(start_idx - 1, max(0, start_idx - 20), -1):
+        if i < 2:
+            continue
+        if is_bullish:
+            if highs[i] > highs[i - 1] and highs[i] > highs[i + 1]:
+                level = highs[i]
+                found = True
+                break
+        elif lows[i] < lows[i - 1] and lows[i] < lows[i + 1]:
+            level = lows[i]
+            found = True
+            break
+    
+    if not found:
+        return level, -1
+    
+    for i in range(start_idx + 1, end_idx):
+        if (is_bullish and closes[i] > level) or (not is_bullish and closes[i] < level):
+            return level, i
+    
+    return level, -1
 
 
 class TurtleSoupType(Enum):
@@ -45,7 +213,7 @@ class SweepStatus(Enum):
     INVALIDATED = "invalidated"   # Setup failed
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class LiquidityLevel:
     """Represents a liquidity pool (SSL or BSL)"""
     price: float
@@ -59,7 +227,7 @@ class LiquidityLevel:
         return f"{self.type}@{self.price:.5f} ({'SWEPT' if self.swept else 'ACTIVE'})"
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class TurtleSoupSetup:
     """Complete Turtle Soup trading setup"""
     type: TurtleSoupType
@@ -102,6 +270,175 @@ class TurtleSoupSetup:
         return None
 
 
+class _LevelClusters:
+    """
+    One side's liquidity levels, built by feeding swings in swing order.
+    
+    A swing within threshold of an existing level adds to the strength of
+    the earliest such level; otherwise it starts a new one. Level prices are
+    also kept sorted so only the levels next to a swing's price are compared.
+    """
+    
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.prices: List[float] = []
+        self.timestamps: List[datetime] = []
+        self.strengths: List[int] = []
+        
+        # Level prices ascending, with the matching positions in the lists above
+        self._sorted_prices: List[float] = []
+        self._sorted_positions: List[int] = []
+    
+    def add(self, price: float, timestamp: datetime) -> None:
+        """Merge one swing into the levels"""
+        sorted_prices = self._sorted_prices
+        pos = bisect.bisect_left(sorted_prices, price)
+        
+        # Levels within the threshold are contiguous around pos
+        match = len(self.prices)
+        lo = pos - 1
+        while lo >= 0 and abs(sorted_prices[lo] - price) < self.threshold:
+            match = min(match, self._sorted_positions[lo])
+            lo -= 1
+        hi = pos
+        while hi < len(sorted_prices) and abs(sorted_prices[hi] - price) < self.threshold:
+            match = min(match, self._sorted_positions[hi])
+            hi += 1
+        
+        if match < len(self.prices):
+            self.strengths[match] += 1
+            return
+        
+        self.prices.append(price)
+        self.timestamps.append(timestamp)
+        self.strengths.append(1)
+        sorted_prices.insert(pos, price)
+        self._sorted_positions.insert(pos, match)
+    
+
+
+class _LiquidityMap:
+    """
+    Liquidity levels stored column-wise for the sweep and target scans.
+    
+    The kernels read prices, sides and swept flags as arrays. LiquidityLevel
+    objects are only built for the levels that are asked for (swept levels
+    attached to setups, or the whole map through
+    TurtleSoupDetector.liquidity_levels) and are kept in step with the swept
+    flags from then on.
+    """
+    
+    def __init__(
+        self,
+        prices: np.ndarray,
+        types: List[str],
+        is_ssl: np.ndarray,
+        is_bsl: np.ndarray,
+        strengths: List[int],
+        timestamps: List[datetime],
+        levels: Optional[List[LiquidityLevel]] = None,
+    ):
+        n = len(types)
+        self.prices = prices
+        self.types = types
+        self.is_ssl = is_ssl
+        self.is_bsl = is_bsl
+        self.strengths = strengths
+        self.timestamps = timestamps
+        
+        if levels is None:
+            self.swept = np.zeros(n, dtype=np.bool_)
+            self.sweep_times: List[Optional[datetime]] = [None] * n
+            self._levels: List[Optional[LiquidityLevel]] = [None] * n
+        else:
+            self.swept = np.array([level.swept for level in levels], dtype=np.bool_)
+            self.sweep_times = [level.sweep_time for level in levels]
+            self._levels = list(levels)
+        
+        # Map positions of the SSL / BSL levels in ascending price order
+        by_price = np.argsort(prices, kind='stable')
+        self.ssl_order = by_price[self.is_ssl[by_price]]
+        self.ssl_prices = prices[self.ssl_order]
+        self.bsl_order = by_price[self.is_bsl[by_price]]
+        self.bsl_prices = prices[self.bsl_order]
+    
+    @classmethod
+    def from_clusters(cls, ssl: _LevelClusters, bsl: _LevelClusters) -> "_LiquidityMap":
+        """SSL levels then BSL levels, all unswept"""
+        n_ssl = len(ssl.prices)
+        is_ssl = np.zeros(n_ssl + len(bsl.prices), dtype=np.bool_)
+        is_ssl[:n_ssl] = True
+        return cls(
+            np.array(ssl.prices + bsl.prices, dtype=np.float64),
+            ['SSL'] * n_ssl + ['BSL'] * len(bsl.prices),
+            is_ssl,
+            ~is_ssl,
+            ssl.strengths + bsl.strengths,
+            ssl.timestamps + bsl.timestamps,
+        )
+    
+    @classmethod
+    def from_levels(cls, levels: List[LiquidityLevel]) -> "_LiquidityMap":
+        """Wrap existing LiquidityLevel objects, keeping their swept state"""
+        types = [level.type for level in levels]
+        return cls(
+            np.array([level.price for level in levels], dtype=np.float64),
+            types,
+            np.array([level_type == 'SSL' for level_type in types], dtype=np.bool_),
+            np.array([level_type == 'BSL' for level_type in types], dtype=np.bool_),
+            [level.strength for level in levels],
+            [level.timestamp for level in levels],
+            levels,
+        )
+    
+    def level(self, j: int) -> LiquidityLevel:
+        """LiquidityLevel object for map position j"""
+        level = self._levels[j]
+        if level is None:
+            level = LiquidityLevel(
+                price=self.prices[j],
+                timestamp=self.timestamps[j],
+                type=self.types[j],
+                strength=self.strengths[j],
+                swept=bool(self.swept[j]),
+                sweep_time=self.sweep_times[j],
+            )
+            self._levels[j] = level
+        return level
+    
+    def levels(self) -> Tuple[LiquidityLevel, ...]:
+        """Every level as a LiquidityLevel object, in map order"""
+        return tuple(self.level(j) for j in range(len(self._levels)))
+    
+    def next_target(self, price: float, above: bool) -> Optional[float]:
+        """
+        Nearest unswept SSL level above price (above=True) or BSL level below it.
+        
+        Binary search on that side's price ladder, then a walk past swept
+        levels, which usually stops at the first one.
+        """
+        if above:
+            start = int(np.searchsorted(self.ssl_prices, price, side='right'))
+            candidates = self.ssl_order[start:]
+        else:
+            stop = int(np.searchsorted(self.bsl_prices, price, side='left'))
+            candidates = self.bsl_order[:stop][::-1]
+        
+        for j in candidates:
+            if not self.swept[j]:
+                return self.prices[j]
+        return None
+    
+    def mark_swept(self, j: int, sweep_time: datetime) -> LiquidityLevel:
+        """Flag map position j as swept and return its LiquidityLevel"""
+        self.swept[j] = True
+        self.sweep_times[j] = sweep_time
+        level = self.level(j)
+        level.swept = True
+        level.sweep_time = sweep_time
+        return level
+
+
 class TurtleSoupDetector:
     """
     Detects ICT Turtle Soup patterns - failed breakouts following liquidity sweeps.
@@ -128,102 +465,95 @@ class TurtleSoupDetector:
         self.pip_value = pip_value
         
         # State
-        self.liquidity_levels: List[LiquidityLevel] = []
+        self._map = _LiquidityMap.from_levels([])
         self.active_setups: List[TurtleSoupSetup] = []
         self.completed_setups: List[TurtleSoupSetup] = []
         
-    def identify_swing_points(self, df: pd.DataFrame) -> Tuple[List[Dict], List[Dict]]:
+        # Streaming state for update(): every bar seen so far in growable
+        # buffers (the first _stream_len rows are live), plus the SSL/BSL swing
+        # clusters of those bars and the swing lookback they were found with.
+        # None until update() first runs; analyze() leaves its frame in
+        # _stream_view to continue from.
+        self._stream_view: Optional[OHLCView] = None
+        self._stream_buffers: Optional[Tuple[np.ndarray, ...]] = None
+        self._stream_len = 0
+        self._stream_clusters: Optional[Tuple[_LevelClusters, _LevelClusters]] = None
+        self._stream_lookback = 0
+        
+    @property
+    def liquidity_levels(self) -> Tuple[LiquidityLevel, ...]:
+        """
+        Current liquidity map: SSL levels, then BSL levels.
+        
+        The scans read the map's own columns, so the levels are handed out as
+        a read-only tuple; assign a new list of levels to replace the map.
+        """
+        return self._map.levels()
+    
+    @liquidity_levels.setter
+    def liquidity_levels(self, levels: List[LiquidityLevel]) -> None:
+        self._map = _LiquidityMap.from_levels(levels)
+    
+    def identify_swing_points(
+        self, df: Union[pd.DataFrame, OHLCView]
+    ) -> Tuple[List[Dict], List[Dict]]:
         """
         Identify swing highs and swing lows in price data.
         
         Returns:
             Tuple of (swing_highs, swing_lows) with price and index info
         """
-        swing_highs = []
-        swing_lows = []
-        
+        view = df if isinstance(df, OHLCView) else OHLCView.from_df(df)
+        highs = view.high
+        lows = view.low
         lookback = min(self.swing_lookback, len(df) // 3)
         
-        for i in range(lookback, len(df) - lookback):
-            # Check for swing high
-            is_swing_high = True
-            for j in range(1, lookback + 1):
-                if df['high'].iloc[i] <= df['high'].iloc[i - j] or \
-                   df['high'].iloc[i] <= df['high'].iloc[i + j]:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
-                swing_highs.append({
-                    'price': df['high'].iloc[i],
-                    'index': i,
-                    'timestamp': df.index[i] if hasattr(df.index[i], 'timestamp') else df.index[i]
-                })
-            
-            # Check for swing low
-            is_swing_low = True
-            for j in range(1, lookback + 1):
-                if df['low'].iloc[i] >= df['low'].iloc[i - j] or \
-                   df['low'].iloc[i] >= df['low'].iloc[i + j]:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
-                swing_lows.append({
-                    'price': df['low'].iloc[i],
-                    'index': i,
-                    'timestamp': df.index[i] if hasattr(df.index[i], 'timestamp') else df.index[i]
-                })
+        high_idx = np.flatnonzero(_swing_mask(highs, lookback, True))
+        low_idx = np.flatnonzero(_swing_mask(lows, lookback, False))
+        
+        swing_highs = [
+            {'price': highs[i], 'index': int(i), 'timestamp': ts}
+            for i, ts in zip(high_idx, df.index[high_idx])
+        ]
+        swing_lows = [
+            {'price': lows[i], 'index': int(i), 'timestamp': ts}
+            for i, ts in zip(low_idx, df.index[low_idx])
+        ]
         
         return swing_highs, swing_lows
     
-    def build_liquidity_map(self, df: pd.DataFrame) -> List[LiquidityLevel]:
+    def build_liquidity_map(
+        self, df: Union[pd.DataFrame, OHLCView]
+    ) -> Tuple[LiquidityLevel, ...]:
         """
         Build a map of liquidity levels from swing points.
         SSL (Sellside Liquidity) = above swing highs
         BSL (Buyside Liquidity) = below swing lows
         """
+        # SSL above swing highs (buy stops), BSL below swing lows (sell stops)
+        self._map = _LiquidityMap.from_clusters(*self._build_clusters(df))
+        
+        return self.liquidity_levels
+    
+    def _build_clusters(
+        self, df: Union[pd.DataFrame, OHLCView]
+    ) -> Tuple[_LevelClusters, _LevelClusters]:
+        """Cluster every swing high into SSL levels and every swing low into BSL levels"""
         swing_highs, swing_lows = self.identify_swing_points(df)
+        threshold = self.sweep_threshold_pips * self.pip_value
         
-        self.liquidity_levels = []
+        ssl_clusters = _LevelClusters(threshold)
+        for swing in swing_highs:
+            ssl_clusters.add(swing['price'], swing['timestamp'])
+        bsl_clusters = _LevelClusters(threshold)
+        for swing in swing_lows:
+            bsl_clusters.add(swing['price'], swing['timestamp'])
         
-        # SSL levels (above swing highs where buy stops rest)
-        for sh in swing_highs:
-            level = LiquidityLevel(
-                price=sh['price'],
-                timestamp=sh['timestamp'],
-                type='SSL',
-                strength=1
-            )
-            # Check if similar level exists (cluster)
-            for existing in self.liquidity_levels:
-                if existing.type == 'SSL' and \
-                   abs(existing.price - level.price) < self.sweep_threshold_pips * self.pip_value:
-                    existing.strength += 1
-                    break
-            else:
-                self.liquidity_levels.append(level)
-        
-        # BSL levels (below swing lows where sell stops rest)
-        for sl in swing_lows:
-            level = LiquidityLevel(
-                price=sl['price'],
-                timestamp=sl['timestamp'],
-                type='BSL',
-                strength=1
-            )
-            # Check if similar level exists (cluster)
-            for existing in self.liquidity_levels:
-                if existing.type == 'BSL' and \
-                   abs(existing.price - level.price) < self.sweep_threshold_pips * self.pip_value:
-                    existing.strength += 1
-                    break
-            else:
-                self.liquidity_levels.append(level)
-        
-        return self.liquidity_levels
+        return ssl_clusters, bsl_clusters
     
-    def detect_sweep(self, df: pd.DataFrame, candle_idx: int) -> Optional[Tuple[LiquidityLevel, TurtleSoupType]]:
+    def detect_sweep(
+        self, df: Union[pd.DataFrame, OHLCView], candle_idx: int
+    ) -> Optional[Tuple[LiquidityLevel, TurtleSoupType]]:
         """
         Detect if the current candle sweeps any liquidity level.
         
@@ -234,45 +564,48 @@ class TurtleSoupDetector:
         """
         if candle_idx >= len(df):
             return None
-            
-        candle = df.iloc[candle_idx]
-        current_price = candle['close']
         
-        for level in self.liquidity_levels:
-            if level.swept:
-                continue
-                
-            if level.type == 'BSL':
-                # Bullish Turtle Soup: Sweep below swing low
-                # Price wicks below but closes above
-                if candle['low'] < level.price and candle['close'] > level.price:
-                    # Check for rejection (lower wick)
-                    body = abs(candle['close'] - candle['open'])
-                    lower_wick = min(candle['open'], candle['close']) - candle['low']
-                    total_range = candle['high'] - candle['low']
-                    
-                    if total_range > 0 and lower_wick / total_range >= self.min_sweep_rejection:
-                        level.swept = True
-                        level.sweep_time = df.index[candle_idx]
-                        return (level, TurtleSoupType.BULLISH)
-            
-            elif level.type == 'SSL':
-                # Bearish Turtle Soup: Sweep above swing high
-                # Price wicks above but closes below
-                if candle['high'] > level.price and candle['close'] < level.price:
-                    # Check for rejection (upper wick)
-                    body = abs(candle['close'] - candle['open'])
-                    upper_wick = candle['high'] - max(candle['open'], candle['close'])
-                    total_range = candle['high'] - candle['low']
-                    
-                    if total_range > 0 and upper_wick / total_range >= self.min_sweep_rejection:
-                        level.swept = True
-                        level.sweep_time = df.index[candle_idx]
-                        return (level, TurtleSoupType.BEARISH)
+        if candle_idx < 0:
+            candle_idx += len(df)
         
-        return None
+        view = df if isinstance(df, OHLCView) else OHLCView.from_df(df)
+        swept_by = self._sweep_levels(view, candle_idx, candle_idx + 1)
+        if swept_by[0] < 0:
+            return None
+        return self._mark_swept(view, candle_idx, int(swept_by[0]))
+    
+    def _sweep_levels(self, view: OHLCView, start: int, stop: int) -> np.ndarray:
+        """Map position of the level each candle in [start, stop) sweeps, or -1"""
+        highs = view.high[start:stop]
+        lows = view.low[start:stop]
+        closes = view.close[start:stop]
+        lower_rejection, upper_rejection = _wick_rejections(
+            view.open[start:stop], highs, lows, closes, self.min_sweep_rejection
+        )
+        return _sweep_levels(
+            highs,
+            lows,
+            closes,
+            lower_rejection,
+            upper_rejection,
+            self._map.prices,
+            self._map.is_bsl,
+            self._map.is_ssl,
+            self._map.swept.copy(),
+        )
     
-    def detect_mss(self, df: pd.DataFrame, start_idx: int, soup_type: TurtleSoupType) -> Optional[Tuple[float, int]]:
+    def _mark_swept(
+        self, view: OHLCView, candle_idx: int, level_idx: int
+    ) -> Tuple[LiquidityLevel, TurtleSoupType]:
+        """Flag a level as swept by the candle and return it with the setup type"""
+        level = self._map.mark_swept(level_idx, view.index[candle_idx])
+        if level.type == 'BSL':
+            return (level, TurtleSoupType.BULLISH)
+        return (level, TurtleSoupType.BEARISH)
+    
+    def detect_mss(
+        self, df: Union[pd.DataFrame, OHLCView], start_idx: int, soup_type: TurtleSoupType
+    ) -> Optional[Tuple[float, int]]:
         """
         Detect Market Structure Shift following the sweep.
         
@@ -287,49 +620,30 @@ class TurtleSoupDetector:
             
         end_idx = min(start_idx + self.mss_lookback, len(df))
         
-        if soup_type == TurtleSoupType.BULLISH:
-            # Looking for break of a lower high (bullish MSS)
-            # Find the most recent lower high before the sweep
-            swing_high = None
-            for i in range(start_idx - 1, max(0, start_idx - 20), -1):
-                if i >= 2 and df['high'].iloc[i] > df['high'].iloc[i-1] and \
-                   df['high'].iloc[i] > df['high'].iloc[i+1]:
-                    swing_high = df['high'].iloc[i]
-                    break
-            
-            if swing_high is None:
-                return None
-            
-            # Check if price breaks above this level
-            for i in range(start_idx + 1, end_idx):
-                if df['close'].iloc[i] > swing_high:
-                    return (swing_high, i)
-        
-        else:  # BEARISH
-            # Looking for break of a higher low (bearish MSS)
-            swing_low = None
-            for i in range(start_idx - 1, max(0, start_idx - 20), -1):
-                if i >= 2 and df['low'].iloc[i] < df['low'].iloc[i-1] and \
-                   df['low'].iloc[i] < df['low'].iloc[i+1]:
-                    swing_low = df['low'].iloc[i]
-                    break
-            
-            if swing_low is None:
-                return None
-            
-            # Check if price breaks below this level
-            for i in range(start_idx + 1, end_idx):
-                if df['close'].iloc[i] < swing_low:
-                    return (swing_low, i)
+        # Bullish: break of the last lower high; bearish: break of the last higher low
+        view = df if isinstance(df, OHLCView) else OHLCView.from_df(df)
+        level, break_idx = _find_mss(
+            view.high,
+            view.low,
+            view.close,
+            start_idx,
+            end_idx,
+            soup_type == TurtleSoupType.BULLISH,
+        )
+        if break_idx < 0:
+            return None
         
-        return None
+        return (float(level), int(break_idx))
     
-    def find_entry_zone(self, df: pd.DataFrame, mss_idx: int, soup_type: TurtleSoupType) -> Optional[Dict]:
+    def find_entry_zone(
+        self, df: Union[pd.DataFrame, OHLCView], mss_idx: int, soup_type: TurtleSoupType
+    ) -> Optional[Dict]:
         """
         Find FVG or OB for entry following MSS confirmation.
         
         Returns entry zone details including high, low, and type.
         """
+        view = df if isinstance(df, OHLCView) else OHLCView.from_df(df)
         lookback = min(5, mss_idx)
         
         if soup_type == TurtleSoupType.BULLISH:
@@ -339,21 +653,21 @@ class TurtleSoupDetector:
                     continue
                     
                 # Check for bullish FVG (gap between candle 1 high and candle 3 low)
-                if df['low'].iloc[i] > df['high'].iloc[i-2]:
+                if view.low[i] > view.high[i-2]:
                     return {
                         'type': 'FVG',
-                        'high': df['low'].iloc[i],
-                        'low': df['high'].iloc[i-2],
+                        'high': view.low[i],
+                        'low': view.high[i-2],
                         'index': i
                     }
                 
                 # Check for bullish OB (last down candle before up move)
-                if df['close'].iloc[i-1] < df['open'].iloc[i-1] and \
-                   df['close'].iloc[i] > df['open'].iloc[i]:
+                if view.close[i-1] < view.open[i-1] and \
+                   view.close[i] > view.open[i]:
                     return {
                         'type': 'OB',
-                        'high': df['high'].iloc[i-1],
-                        'low': df['low'].iloc[i-1],
+                        'high': view.high[i-1],
+                        'low': view.low[i-1],
                         'index': i-1
                     }
         
@@ -364,21 +678,21 @@ class TurtleSoupDetector:
                     continue
                     
                 # Check for bearish FVG
-                if df['high'].iloc[i] < df['low'].iloc[i-2]:
+                if view.high[i] < view.low[i-2]:
                     return {
                         'type': 'FVG',
-                        'high': df['low'].iloc[i-2],
-                        'low': df['high'].iloc[i],
+                        'high': view.low[i-2],
+                        'low': view.high[i],
                         'index': i
                     }
                 
                 # Check for bearish OB
-                if df['close'].iloc[i-1] > df['open'].iloc[i-1] and \
-                   df['close'].iloc[i] < df['open'].iloc[i]:
+                if view.close[i-1] > view.open[i-1] and \
+                   view.close[i] < view.open[i]:
                     return {
                         'type': 'OB',
-                        'high': df['high'].iloc[i-1],
-                        'low': df['low'].iloc[i-1],
+                        'high': view.high[i-1],
+                        'low': view.low[i-1],
                         'index': i-1
                     }
         
@@ -387,7 +701,7 @@ class TurtleSoupDetector:
     def calculate_trade_levels(
         self, 
         setup: TurtleSoupSetup, 
-        df: pd.DataFrame
+        df: Union[pd.DataFrame, OHLCView]
     ) -> TurtleSoupSetup:
         """
         Calculate entry, stop-loss, and take-profit levels for the setup.
@@ -404,10 +718,9 @@ class TurtleSoupDetector:
             setup.stop_loss = setup.sweep_low - buffer
             
             # Target: Next SSL (swing high) above
-            for level in sorted(self.liquidity_levels, key=lambda x: x.price):
-                if level.type == 'SSL' and level.price > setup.entry_price and not level.swept:
-                    setup.take_profit = level.price
-                    break
+            target = self._map.next_target(setup.entry_price, above=True)
+            if target is not None:
+                setup.take_profit = target
             
             if setup.take_profit is None:
                 # Use 2:1 RR as default
@@ -423,10 +736,9 @@ class TurtleSoupDetector:
             setup.stop_loss = setup.sweep_high + buffer
             
             # Target: Next BSL (swing low) below
-            for level in sorted(self.liquidity_levels, key=lambda x: x.price, reverse=True):
-                if level.type == 'BSL' and level.price < setup.entry_price and not level.swept:
-                    setup.take_profit = level.price
-                    break
+            target = self._map.next_target(setup.entry_price, above=False)
+            if target is not None:
+                setup.take_profit = target
             
             if setup.take_profit is None:
                 # Use 2:1 RR as default
@@ -437,7 +749,7 @@ class TurtleSoupDetector:
     
     def analyze(
         self, 
-        df: pd.DataFrame, 
+        df: Union[pd.DataFrame, OHLCView], 
         symbol: str = "", 
         timeframe: str = ""
     ) -> List[TurtleSoupSetup]:
@@ -445,26 +757,153 @@ class TurtleSoupDetector:
         Main analysis method - scans for Turtle Soup setups.
         
         Args:
-            df: OHLCV DataFrame with datetime index
+            df: OHLCV DataFrame with datetime index, or an OHLCView of one
             symbol: Trading symbol
             timeframe: Timeframe string
             
         Returns:
             List of detected TurtleSoupSetup objects
         """
+        # Column arrays once for every helper below
+        view = df if isinstance(df, OHLCView) else OHLCView.from_df(df)
+        self._stream_view = view
+        self._stream_buffers = None
+        
         if len(df) < self.swing_lookback * 2:
             return []
         
-        # Build liquidity map
-        self.build_liquidity_map(df)
+        # Build liquidity map, as arrays only until levels are needed
+        self._map = _LiquidityMap.from_clusters(*self._build_clusters(view))
+        
+        return self._scan_setups(view, symbol, timeframe)
+    
+    def update(
+        self,
+        timestamp: pd.Timestamp,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float = 0.0,
+        symbol: str = "",
+        timeframe: str = ""
+    ) -> List[TurtleSoupSetup]:
+        """
+        Feed one new candle and return the setups.
+        
+        Streaming counterpart to analyze() for bar-by-bar backtests and live
+        feeds. Calling update() for each new candle gives the same setups as
+        calling analyze() on the growing DataFrame, but only the new candle's
+        swing is clustered into the liquidity map instead of rebuilding it
+        from the whole history. The sweep/MSS scan still covers the recent
+        window, since new levels and later bars can change its outcome.
+        Continues from the last analyze() call, or from a fresh detector.
+        
+        Args:
+            timestamp: Candle open time
+            open_price, high, low, close, volume: Candle values
+            symbol: Trading symbol
+            timeframe: Timeframe string
+        
+        Returns:
+            List of detected TurtleSoupSetup objects
+        """
+        if self._stream_buffers is None:
+            self._prime_stream()
+        
+        view = self._append_bar(timestamp, open_price, high, low, close)
+        n = len(view)
+        
+        lookback = min(self.swing_lookback, n // 3)
+        if lookback != self._stream_lookback:
+            # The swing lookback still grows with the frame; recluster everything
+            self._stream_clusters = self._build_clusters(view)
+            self._stream_lookback = lookback
+        elif n - 1 - 2 * lookback >= 0:
+            # The bar lookback bars back now has its full right-hand window
+            ssl_clusters, bsl_clusters = self._stream_clusters
+            i = n - 1 - lookback
+            if _swing_mask(view.high[i - lookback:n], lookback, True)[lookback]:
+                ssl_clusters.add(view.high[i], view.index[i])
+            if _swing_mask(view.low[i - lookback:n], lookback, False)[lookback]:
+                bsl_clusters.add(view.low[i], view.index[i])
+        
+        if n < self.swing_lookback * 2:
+            return []
+        
+        self._map = _LiquidityMap.from_clusters(*self._stream_clusters)
         
+        return self._scan_setups(view, symbol, timeframe)
+    
+    def _prime_stream(self) -> None:
+        """Seed update() buffers and clusters from the last analyze() frame, if any"""
+        view = self._stream_view
+        n = len(view) if view is not None else 0
+        capacity = max(2 * n, 256)
+        
+        self._stream_buffers = (
+            np.empty(capacity, dtype=object),
+            np.empty(capacity),
+            np.empty(capacity),
+            np.empty(capacity),
+            np.empty(capacity),
+        )
+        if view is not None:
+            self._stream_buffers[0][:n] = np.asarray(view.index, dtype=object)
+            columns = (view.open, view.high, view.low, view.close)
+            for buffer, column in zip(self._stream_buffers[1:], columns):
+                buffer[:n] = column
+        self._stream_len = n
+        
+        self._stream_clusters = self._build_clusters(self._stream_slice())
+        self._stream_lookback = min(self.swing_lookback, n // 3)
+    
+    def _append_bar(
+        self,
+        timestamp: pd.Timestamp,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float
+    ) -> OHLCView:
+        """Append one bar to the stream buffers and return a view of all bars"""
+        n = self._stream_len
+        if n == len(self._stream_buffers[0]):
+            self._stream_buffers = tuple(
+                np.concatenate([buffer, np.empty_like(buffer)]) for buffer in self._stream_buffers
+            )
+        
+        for buffer, value in zip(self._stream_buffers, (timestamp, open_price, high, low, close)):
+            buffer[n] = value
+        self._stream_len = n + 1
+        
+        return self._stream_slice()
+    
+    def _stream_slice(self) -> OHLCView:
+        """Zero-copy view of the bars fed to update() so far"""
+        n = self._stream_len
+        index, opens, highs, lows, closes = self._stream_buffers
+        return OHLCView(
+            index=index[:n], open=opens[:n], high=highs[:n], low=lows[:n], close=closes[:n]
+        )
+    
+    def _scan_setups(self, view: OHLCView, symbol: str, timeframe: str) -> List[TurtleSoupSetup]:
+        """Scan the recent candles for sweeps against the current liquidity map"""
         setups = []
         
         # Scan for sweeps in recent candles
-        scan_start = max(self.swing_lookback, len(df) - 50)
+        scan_start = max(self.swing_lookback, len(view) - 50)
+        
+        # Setups carry the sweep candle's time when the index holds timestamps
+        timestamped = len(view) > 0 and hasattr(view.index[-1], 'timestamp')
+        
+        # Sweeps for the whole scan window in one pass; levels are flagged as
+        # swept candle by candle so target lookups only see earlier sweeps
+        swept_by = self._sweep_levels(view, scan_start, len(view))
         
-        for i in range(scan_start, len(df)):
-            sweep_result = self.detect_sweep(df, i)
+        for row in np.flatnonzero(swept_by >= 0):
+            i = scan_start + int(row)
+            sweep_result = self._mark_swept(view, i, int(swept_by[row]))
             
             if sweep_result:
                 level, soup_type = sweep_result
@@ -475,15 +914,15 @@ class TurtleSoupDetector:
                     status=SweepStatus.SWEPT,
                     swept_level=level,
                     sweep_candle_idx=i,
-                    sweep_low=df['low'].iloc[i] if soup_type == TurtleSoupType.BULLISH else 0,
-                    sweep_high=df['high'].iloc[i] if soup_type == TurtleSoupType.BEARISH else 0,
+                    sweep_low=view.low[i] if soup_type == TurtleSoupType.BULLISH else 0,
+                    sweep_high=view.high[i] if soup_type == TurtleSoupType.BEARISH else 0,
                     symbol=symbol,
                     timeframe=timeframe,
-                    timestamp=df.index[i] if hasattr(df.index[i], 'timestamp') else datetime.now()
+                    timestamp=view.index[i] if timestamped else datetime.now()
                 )
                 
                 # Check for MSS confirmation
-                mss_result = self.detect_mss(df, i, soup_type)
+                mss_result = self.detect_mss(view, i, soup_type)
                 
                 if mss_result:
                     mss_level, mss_idx = mss_result
@@ -493,7 +932,7 @@ class TurtleSoupDetector:
                     setup.status = SweepStatus.CONFIRMED
                     
                     # Find entry zone
-                    entry_zone = self.find_entry_zone(df, mss_idx, soup_type)
+                    entry_zone = self.find_entry_zone(view, mss_idx, soup_type)
                     
                     if entry_zone:
                         setup.entry_zone_high = entry_zone['high']
@@ -502,10 +941,10 @@ class TurtleSoupDetector:
                         setup.status = SweepStatus.ENTRY_READY
                         
                         # Calculate trade levels
-                        setup = self.calculate_trade_levels(setup, df)
+                        setup = self.calculate_trade_levels(setup, view)
                         
                         # Calculate confidence
-                        setup.confidence = self._calculate_confidence(setup, df)
+                        setup.confidence = self._calculate_confidence(setup, view)
                 
                 if setup.status in [SweepStatus.CONFIRMED, SweepStatus.ENTRY_READY]:
                     setups.append(setup)
@@ -513,7 +952,9 @@ class TurtleSoupDetector:
         self.active_setups = setups
         return setups
     
-    def _calculate_confidence(self, setup: TurtleSoupSetup, df: pd.DataFrame) -> float:
+    def _calculate_confidence(
+        self, setup: TurtleSoupSetup, df: Union[pd.DataFrame, OHLCView]
+    ) -> float:
         """Calculate confidence score for the setup"""
         confidence = 0.5  # Base confidence
         
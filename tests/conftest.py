@@ -0,0 +1,37 @@
+"""Shared fixtures for the detector and model tests"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_ohlc(
+    seed: int,
+    n: int = 400,
+    freq: str = "15min",
+    start: str = "2024-01-01 00:00",
+    vol: float = 0.0012,
+) -> pd.DataFrame:
+    """Random-walk EURUSD-like OHLCV frame, reproducible from seed"""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0, vol, n) + 0.0003 * np.sin(np.arange(n) / (15 + seed % 20))
+    close = 1.1 + np.cumsum(steps)
+    open_ = np.r_[close[0], close[:-1]] + rng.normal(0, vol / 4, n)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, vol / 2, n))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, vol / 2, n))
+    
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": rng.integers(100, 1000, n).astype(np.float64),
+        },
+        index=pd.date_range(start, periods=n, freq=freq),
+    )
+
+
+@pytest.fixture
+def ohlc_factory():
+    return make_ohlc
@@ -0,0 +1,65 @@
+"""Buy/Sell Model tests"""
+
+import pytest
+
+from ict_agent.detectors.fvg import FVGDetector, FVGDirection
+from ict_agent.detectors.market_structure import MarketStructureAnalyzer
+from ict_agent.models.buy_sell_model import BuySellModelDetector
+
+
+@pytest.mark.parametrize("htf_bias", [None, "bullish", "bearish"])
+def test_analyze_matches_fresh_detector_on_growing_frame(ohlc_factory, htf_bias):
+    ohlc = ohlc_factory(3, n=300, vol=0.0010)
+    detector = BuySellModelDetector(swing_length=5)
+    
+    found = 0
+    for end in range(150, 301, 5):
+        frame = ohlc.iloc[:end]
+        expected = BuySellModelDetector(swing_length=5).analyze(frame, htf_bias)
+        assert repr(detector.analyze(frame, htf_bias)) == repr(expected)
+        found += expected is not None
+    assert found
+
+
+def test_analyze_sees_forming_bar_revised_in_place(ohlc_factory):
+    detector = BuySellModelDetector(swing_length=5)
+    
+    changed = 0
+    for seed in range(6):
+        frame = ohlc_factory(seed, n=200, vol=0.0010).copy()
+        before = repr(detector.analyze(frame, "bearish"))
+        
+        # The forming bar spikes below every earlier low and is analyzed again
+        low = frame.columns.get_loc("low")
+        close = frame.columns.get_loc("close")
+        frame.iloc[-1, low] = frame["low"].min() - 0.005
+        frame.iloc[-1, close] = frame.iloc[-1, low]
+        after = repr(detector.analyze(frame, "bearish"))
+        
+        assert after == repr(BuySellModelDetector(swing_length=5).analyze(frame, "bearish"))
+        changed += after != before
+    assert changed
+
+
+@pytest.mark.parametrize("seed, swing_length", [(0, 5), (1, 10), (2, 3)])
+def test_fused_scan_matches_detectors(ohlc_factory, seed, swing_length):
+    ohlc = ohlc_factory(seed, n=500, vol=0.0008 + 0.0002 * seed)
+    detector = BuySellModelDetector(swing_length=swing_length, min_fvg_pips=3.0)
+    swings, _ = detector._scan_structure(ohlc)
+    assert swings
+    
+    analyzer = MarketStructureAnalyzer(swing_length=swing_length)
+    analyzer.analyze(ohlc)
+    assert [(s.index, s.swing_type, s.price) for s in swings] == [
+        (s.index, s.swing_type, s.price) for s in analyzer._swings
+    ]
+    
+    fvg_detector = FVGDetector(min_gap_pips=3.0)
+    fvg_detector.detect(ohlc)
+    assert fvg_detector.get_active_fvgs()
+    for direction in (FVGDirection.BULLISH, FVGDirection.BEARISH):
+        fused, _ = detector._active_fvgs[direction]
+        expected = fvg_detector.get_active_fvgs(direction)
+        assert [(f.index, f.top, f.bottom) for f in fused] == [
+            (f.index, f.top, f.bottom) for f in expected
+        ]
@@ -0,0 +1,16 @@
+"""FVG detector tests"""
+
+from ict_agent.detectors.fvg import FVGDetector, FVGDirection
+
+
+def test_get_fvgs_includes_mitigated(ohlc_factory):
+    detector = FVGDetector(min_gap_pips=3.0)
+    detector.detect(ohlc_factory(0, n=500, vol=0.0008))
+    
+    fvgs = detector.get_fvgs()
+    assert [f.index for f in fvgs] == sorted(f.index for f in fvgs)
+    assert any(f.mitigated for f in fvgs)
+    assert tuple(f for f in fvgs if not f.mitigated) == detector.get_active_fvgs()
+    
+    for direction in (FVGDirection.BULLISH, FVGDirection.BEARISH):
+        assert detector.get_fvgs(direction) == [f for f in fvgs if f.direction == direction]
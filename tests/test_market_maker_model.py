@@ -0,0 +1,152 @@
+"""Market Maker Buy/Sell Model tests"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from ict_agent.models.market_maker_model import (
+    ConsolidationRange,
+    MarketMakerModelDetector,
+    MarketMakerModelType,
+    MarketMakerSetup,
+    MMModelPhase,
+)
+
+
+def _reference_consolidation(detector, df, end_idx):
+    """One window at a time over DataFrame slices, as analyze used to scan"""
+    if end_idx < detector.consolidation_min_candles:
+        return None
+    
+    close = df["close"].shift(1)
+    tr = pd.concat(
+        [df["high"] - df["low"], (df["high"] - close).abs(), (df["low"] - close).abs()],
+        axis=1,
+    ).max(axis=1)
+    atr = tr.rolling(window=14).mean()
+    max_range = atr[max(0, end_idx - 50):end_idx].mean() * detector.consolidation_max_atr_mult * 10
+    
+    for lookback in range(detector.consolidation_min_candles, min(100, end_idx)):
+        window = df.iloc[end_idx - lookback:end_idx]
+        high = window["high"].max()
+        low = window["low"].min()
+        if high - low <= max_range:
+            upper_touches = sum(window["high"] >= high * 0.998)
+            lower_touches = sum(window["low"] <= low * 1.002)
+            if upper_touches >= 2 and lower_touches >= 2:
+                return ConsolidationRange(
+                    high=high,
+                    low=low,
+                    start_idx=end_idx - lookback,
+                    end_idx=end_idx,
+                    candle_count=lookback
+                )
+    return None
+
+
+def _reference_confidence(setup):
+    confidence = 0.3
+    if setup.consolidation.candle_count >= 15:
+        confidence += 0.15
+    if len(setup.engineered_levels) >= 3:
+        confidence += 0.15
+    elif len(setup.engineered_levels) >= 2:
+        confidence += 0.10
+    if setup.mss_level:
+        confidence += 0.15
+    if setup.entry_type:
+        confidence += 0.10
+        if setup.entry_type == "FVG":
+            confidence += 0.05
+    if setup.risk_reward and setup.risk_reward >= 3:
+        confidence += 0.10
+    return min(confidence, 1.0)
+
+
+def _reference_analyze(detector, df):
+    """analyze rebuilt from the per-window detector steps"""
+    setups = []
+    for scan_end in range(50, len(df) - 20):
+        consolidation = _reference_consolidation(detector, df, scan_end)
+        if consolidation is None:
+            continue
+        
+        next_candles = df.iloc[scan_end:scan_end + 10]
+        broke_down = next_candles["low"].min() < consolidation.low
+        broke_up = next_candles["high"].max() > consolidation.high
+        if broke_down == broke_up:
+            continue
+        model_type = MarketMakerModelType.BUY_MODEL if broke_down \
+            else MarketMakerModelType.SELL_MODEL
+        
+        engineered = detector.detect_engineered_liquidity(df, scan_end, model_type)
+        if len(engineered) < detector.min_engineered_levels:
+            continue
+        
+        pd_array = detector.detect_pd_array(df, consolidation, model_type)
+        mss = detector.detect_mss(df, engineered, model_type)
+        setup = MarketMakerSetup(
+            type=model_type,
+            phase=MMModelPhase.MSS_CONFIRMED if mss else
+            MMModelPhase.SELLSIDE_CURVE if broke_down else MMModelPhase.BUYSIDE_CURVE,
+            consolidation=consolidation,
+            engineered_levels=engineered,
+            pd_array_high=pd_array[0],
+            pd_array_low=pd_array[1],
+            timestamp=df.index[-1]
+        )
+        if mss:
+            setup.mss_level, setup.mss_candle_idx = mss
+            entry_zone = detector.find_entry_zone(df, setup.mss_candle_idx, model_type)
+            if entry_zone:
+                setup.entry_zone_high = entry_zone["high"]
+                setup.entry_zone_low = entry_zone["low"]
+                setup.entry_type = entry_zone["type"]
+                setup.phase = MMModelPhase.SMART_MONEY_REVERSAL
+                curve = df.iloc[scan_end:]
+                setup = detector.calculate_trade_levels(
+                    setup, df, curve["low"].min(), curve["high"].max()
+                )
+        
+        setup.confidence = _reference_confidence(setup)
+        if setup.confidence >= 0.5:
+            setups.append(setup)
+    
+    return detector._deduplicate_setups(setups)
+
+
+def test_analyze_finds_longest_consolidation(ohlc_factory):
+    # 99 bars is the longest lookback; asking for exactly that must still scan
+    found = 0
+    for seed in (0, 2, 7):
+        df = ohlc_factory(seed, vol=0.0012)
+        detector = MarketMakerModelDetector(consolidation_min_candles=99)
+        setups = detector.analyze(df)
+        assert setups == _reference_analyze(detector, df)
+        found += sum(setup.consolidation.candle_count == 99 for setup in setups)
+    assert found
+
+
+@pytest.mark.parametrize("seed", [0, 3])
+@pytest.mark.parametrize("min_candles", [5, 30, 98, 99, 100])
+def test_analyze_matches_per_window_reference(ohlc_factory, seed, min_candles):
+    df = ohlc_factory(seed, n=300, vol=0.0008 + 0.0002 * seed)
+    detector = MarketMakerModelDetector(consolidation_min_candles=min_candles)
+    
+    assert detector.analyze(df) == _reference_analyze(detector, df)
+    for end_idx in range(50, len(df) - 20, 7):
+        assert detector.detect_consolidation(df, end_idx) == \
+            _reference_consolidation(detector, df, end_idx), end_idx
+
+
+def test_analyze_from_many_threads(ohlc_factory):
+    # Every thread shares the ATR cache; frames come and go while others read it
+    frames = [ohlc_factory(seed, n=150) for seed in range(24)]
+    expected = [MarketMakerModelDetector().analyze(df.copy()) for df in frames]
+    
+    def run(k):
+        return MarketMakerModelDetector().analyze(frames[k].copy())
+    
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert list(pool.map(run, list(range(len(frames))) * 4)) == expected * 4
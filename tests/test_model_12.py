@@ -0,0 +1,130 @@
+"""Model 12 (OB + FVG scalping) streaming tests"""
+
+import pytest
+
+from ict_agent.detectors.fvg import FVGDirection
+from ict_agent.detectors.order_block import OBDirection
+from ict_agent.models.model_12_obfvg import Model12Detector, Model12Direction
+
+
+def _setup_key(setup):
+    return (
+        setup.direction,
+        setup.phase,
+        setup.order_block.index if setup.order_block else None,
+        setup.fvg.index if setup.fvg else None,
+        setup.entry_price,
+        setup.stop_loss,
+        setup.take_profit,
+        setup.confidence,
+        setup.is_valid,
+    )
+
+
+def _signal_key(signal):
+    return (
+        signal.direction,
+        signal.timestamp,
+        signal.entry_price,
+        signal.stop_loss,
+        signal.take_profit,
+        signal.confidence,
+    )
+
+
+@pytest.mark.parametrize(
+    "seed, vol, warmup", [(4, 0.0004, 30), (29, 0.0006, 30), (29, 0.0006, 15)]
+)
+def test_update_matches_analyze_on_growing_frame(ohlc_factory, seed, vol, warmup):
+    # A 15-bar warm-up is shorter than the 20 bars analyze needs for setups
+    ohlc = ohlc_factory(seed, n=100, freq="5min", start="2024-01-02 01:00", vol=vol)
+    
+    batch = Model12Detector()
+    stream = Model12Detector()
+    stream.analyze(ohlc.iloc[:warmup])
+    
+    for i in range(warmup, len(ohlc)):
+        bar = ohlc.iloc[i]
+        expected = batch.analyze(ohlc.iloc[: i + 1])
+        actual = stream.update(
+            ohlc.index[i], bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"]
+        )
+        assert [_setup_key(s) for s in actual] == [_setup_key(s) for s in expected], i
+    
+    signals = batch.get_signals()
+    assert signals
+    assert [_signal_key(s) for s in stream.get_signals()] == [_signal_key(s) for s in signals]
+
+
+def test_setups_use_order_block_range(ohlc_factory):
+    ohlc = ohlc_factory(29, n=100, freq="5min", start="2024-01-02 01:00", vol=0.0006)
+    detector = Model12Detector()
+    
+    setups = []
+    for i in range(30, len(ohlc) + 1):
+        setups.extend(detector.analyze(ohlc.iloc[:i]))
+    assert setups
+    
+    for setup in setups:
+        ob = setup.order_block
+        assert ob.displacement_pips > 0
+        if setup.direction == Model12Direction.BULLISH:
+            assert setup.stop_loss == pytest.approx(ob.low - 2 * detector.pip_size)
+        else:
+            assert setup.stop_loss == pytest.approx(ob.high + 2 * detector.pip_size)
+        assert f"{ob.high:.5f} - {ob.low:.5f}" in detector.format_setup(setup)
+
+
+def _newest_fvg_after(detector, ob, is_bullish):
+    """Per-OB FVG lookup: newest unmitigated, large enough FVG formed after the OB"""
+    direction = FVGDirection.BULLISH if is_bullish else FVGDirection.BEARISH
+    matching = [
+        f for f in detector.fvg_detector.get_active_fvgs(direction)
+        if f.index > ob.index
+        and abs(f.top - f.bottom) / detector.pip_size >= detector.min_fvg_pips
+    ]
+    return max(matching, key=lambda f: f.index) if matching else None
+
+
+@pytest.mark.parametrize("seed", [0, 1, 7])
+def test_setups_pair_each_ob_with_its_newest_fvg(ohlc_factory, seed):
+    ohlc = ohlc_factory(seed, n=1500, freq="5min", vol=0.0006)
+    detector = Model12Detector()
+    detector.analyze(ohlc.iloc[:30])
+    
+    created = 0
+    for i in range(30, len(ohlc)):
+        known = {id(s) for s in detector._active_setups}
+        bar = ohlc.iloc[i]
+        detector.update(
+            ohlc.index[i], bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"]
+        )
+        
+        for setup in detector._active_setups:
+            if id(setup) in known:
+                continue
+            created += 1
+            is_bullish = setup.direction == Model12Direction.BULLISH
+            assert setup.fvg is _newest_fvg_after(detector, setup.order_block, is_bullish)
+        
+        # Every retested OB with a qualifying FVG and an acceptable stop has a setup
+        if detector.killzone_manager.get_current_killzone_ts(ohlc.index[i]) is None:
+            continue
+        taken = {s.order_block.index for s in detector._active_setups}
+        lows = ohlc["low"].to_numpy()[: i + 1]
+        highs = ohlc["high"].to_numpy()[: i + 1]
+        for ob in detector.ob_detector.get_active_order_blocks():
+            is_bullish = ob.direction == OBDirection.BULLISH
+            fvg = _newest_fvg_after(detector, ob, is_bullish)
+            if fvg is None or ob.index > i - 1:
+                continue
+            if is_bullish:
+                retested = lows[ob.index:].min() <= ob.high
+                risk = (fvg.midpoint - ob.low) / detector.pip_size + 2
+            else:
+                retested = highs[ob.index:].max() >= ob.low
+                risk = (ob.high - fvg.midpoint) / detector.pip_size + 2
+            if retested and risk < detector.max_stop_pips - 1e-6:
+                assert ob.index in taken, (i, ob.index)
+    
+    assert created > 0
@@ -0,0 +1,81 @@
+"""Power of Three model tests"""
+
+import pandas as pd
+import pytest
+
+from ict_agent.models.power_of_three import PowerOfThreeModel
+
+
+def _ny_frames(ohlc_factory):
+    return [
+        ohlc_factory(seed, n=200, freq="15min", start="2024-03-11 00:00", vol=0.0015)
+        for seed in range(16)
+    ]
+
+
+def test_scan_matches_fresh_model_across_frames(ohlc_factory):
+    model = PowerOfThreeModel()
+    symbols = _ny_frames(ohlc_factory)
+    frames = [ohlc.iloc[:end] for end in range(30, 65) for ohlc in symbols]
+    expected = [PowerOfThreeModel().scan(frame) for frame in frames]
+    
+    # Same index and length for every symbol, and each short-lived wrapper
+    # frame is freed before the next, so CPython hands out the same id()
+    for frame, setup in zip(frames, expected):
+        assert model.scan(pd.DataFrame(frame)) == setup
+    assert any(expected)
+
+
+def test_scan_sees_forming_bar_revised_in_place(ohlc_factory):
+    model = PowerOfThreeModel()
+    
+    revised = 0
+    for ohlc in _ny_frames(ohlc_factory):
+        for end in range(30, 65):
+            frame = ohlc.iloc[:end].copy()
+            before = model.scan(frame)
+            if before is None:
+                continue
+            
+            # Nudge the forming bar's close and scan the same object again
+            close = frame.columns.get_loc("close")
+            frame.iloc[-1, close] += 0.0001
+            after = model.scan(frame)
+            assert after == PowerOfThreeModel().scan(frame)
+            revised += after != before
+    assert revised
+
+
+@pytest.mark.parametrize("session", ["ny", "asia", "last_50"])
+def test_batch_scans_match_scan_on_each_prefix(ohlc_factory, session):
+    # asia runs 19:00 to midnight; a name outside SESSIONS scans the last 50 bars
+    model = PowerOfThreeModel()
+    
+    found = 0
+    for seed in range(4):
+        ohlc = ohlc_factory(seed, n=300, freq="15min", start="2024-03-11 00:00", vol=0.0015)
+        expected = {}
+        for end in range(1, len(ohlc) + 1):
+            setup = model.scan(ohlc.iloc[:end], session)
+            if setup:
+                expected[end - 1] = setup
+        
+        records = model.scan_batch_records(ohlc, session)
+        assert records["index"].tolist() == list(expected)
+        assert list(model.iter_setups(ohlc, records, session)) == list(expected.values())
+        
+        batch = model.scan_batch(ohlc, session)
+        assert list(batch.index) == [setup.timestamp for setup in expected.values()]
+        for (_, row), setup in zip(batch.iterrows(), expected.values()):
+            assert row["direction"] == setup.direction
+            assert (row["accumulation_low"], row["accumulation_high"]) == \
+                setup.accumulation_range
+            assert (
+                row["manipulation_level"], row["entry_price"], row["stop_loss"],
+                row["target"], row["risk_reward"],
+            ) == (
+                setup.manipulation_level, setup.entry_price, setup.stop_loss,
+                setup.target, setup.risk_reward,
+            )
+        found += len(expected)
+    assert found
@@ -0,0 +1,74 @@
+"""Silver Bullet model tests"""
+
+import pandas as pd
+import pytest
+
+from ict_agent.models.silver_bullet import SilverBulletModel
+
+
+def _frame(ohlc_factory, seed, vol, bars):
+    # 5M frame ending inside the NY AM window
+    ohlc = ohlc_factory(seed, n=200, freq="5min", start="2024-03-11 00:00", vol=vol)
+    return ohlc.iloc[:bars].copy()
+
+
+@pytest.mark.parametrize(
+    "seed, vol, bars, shift",
+    [(3, 0.0006, 129, -0.003), (4, 0.0012, 131, -0.003), (0, 0.0012, 131, 0.003)],
+)
+def test_scan_sees_forming_bar_revised_in_place(ohlc_factory, seed, vol, bars, shift):
+    model = SilverBulletModel()
+    frame = _frame(ohlc_factory, seed, vol, bars)
+    model.scan(frame, "bullish")
+    
+    # The forming bar gaps away and the same object is scanned again
+    frame.iloc[-1] += shift
+    for htf_bias in ("bullish", "bearish"):
+        assert model.scan(frame, htf_bias) == SilverBulletModel().scan(frame, htf_bias)
+
+
+
+def test_window_start_follows_each_frames_index(ohlc_factory):
+    model = SilverBulletModel()
+    ohlc = _frame(ohlc_factory, 0, 0.0006, 131)
+    
+    # Same length and last bar, but starting earlier with most of the window missing
+    earlier = ohlc_factory(0, n=200, freq="5min", start="2024-03-10 23:10", vol=0.0006)
+    gapped = earlier.iloc[:141].drop(earlier.index[131:140]).iloc[1:]
+    assert len(gapped) == len(ohlc) and gapped.index[-1] == ohlc.index[-1]
+    
+    # Each short-lived wrapper frame is freed before the next, so CPython soon
+    # hands one the id() of a frame with the other index
+    starts = []
+    for _ in range(20):
+        for frame in (ohlc, gapped):
+            starts.append(model._get_window_start_index(pd.DataFrame(frame), "ny_am"))
+    assert starts == [120, 129] * 20
+
+
+@pytest.mark.parametrize("seed, vol", [(1, 0.0006), (3, 0.0012)])
+def test_scan_batch_matches_scan_on_each_prefix(ohlc_factory, seed, vol):
+    ohlc = _frame(ohlc_factory, seed, vol, 200)
+    
+    found = 0
+    for htf_bias in ("bullish", "bearish"):
+        batch = SilverBulletModel().scan_batch(ohlc, htf_bias)
+        
+        model = SilverBulletModel()
+        expected = {}
+        for end in range(1, len(ohlc) + 1):
+            if model._get_active_window(ohlc.index[end - 1]) is None:
+                continue
+            setup = model.scan(ohlc.iloc[:end], htf_bias)
+            if setup:
+                expected[setup.timestamp] = setup
+        
+        assert list(batch.index) == list(expected)
+        for ts, row in batch.iterrows():
+            setup = expected[ts]
+            assert row["fvg_index"] == setup.fvg.index
+            assert (row["entry_price"], row["stop_loss"], row["target"]) == (
+                setup.entry_price, setup.stop_loss, setup.target
+            )
+        found += len(batch)
+    assert found
@@ -0,0 +1,88 @@
+"""Turtle Soup tests"""
+
+import numpy as np
+import pytest
+
+from ict_agent.models.turtle_soup import TurtleSoupDetector, _LevelClusters, _swing_mask
+
+SHORT_SWINGS = dict(
+    swing_lookback=3, min_sweep_rejection=0.3, sweep_threshold_pips=5.0, mss_lookback=15
+)
+
+
+@pytest.mark.parametrize("seed, config", [(0, {}), (1, SHORT_SWINGS)])
+@pytest.mark.parametrize("warmup", [0, 40])
+def test_update_matches_analyze_on_growing_frame(ohlc_factory, seed, config, warmup):
+    # The default 20-bar swing lookback still grows with the frame early on
+    ohlc = ohlc_factory(seed, n=160, freq="5min", vol=0.0010)
+    
+    batch = TurtleSoupDetector(**config)
+    stream = TurtleSoupDetector(**config)
+    if warmup:
+        stream.analyze(ohlc.iloc[:warmup])
+    
+    found = 0
+    for i in range(warmup, len(ohlc)):
+        bar = ohlc.iloc[i]
+        expected = batch.analyze(ohlc.iloc[: i + 1], "EURUSD", "5m")
+        actual = stream.update(
+            ohlc.index[i], bar["open"], bar["high"], bar["low"], bar["close"], bar["volume"],
+            "EURUSD", "5m",
+        )
+        assert actual == expected, i
+        assert stream.liquidity_levels == batch.liquidity_levels, i
+        found += len(expected)
+    assert found
+
+
+def test_swing_mask_matches_strict_neighbours():
+    # Few distinct prices, so most windows hold ties
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        prices = rng.integers(0, 5, int(rng.integers(0, 40))).astype(np.float64)
+        lookback = int(rng.integers(1, 6))
+        for is_high in (True, False):
+            signed = prices if is_high else -prices
+            expected = np.zeros(len(prices), dtype=bool)
+            for i in range(lookback, len(prices) - lookback):
+                neighbours = np.r_[signed[i - lookback:i], signed[i + 1:i + lookback + 1]]
+                expected[i] = (signed[i] > neighbours).all()
+            assert (_swing_mask(prices, lookback, is_high) == expected).all(), (prices, lookback)
+
+
+def test_level_clusters_add_to_earliest_level():
+    clusters = _LevelClusters(threshold=1.0)
+    for price in (12.0, 10.5, 11.2, 10.6, 13.5):
+        clusters.add(price, None)
+    
+    # 11.2 is within reach of both 12.0 and the nearer 10.5; the earlier level wins
+    assert clusters.prices == [12.0, 10.5, 13.5]
+    assert clusters.strengths == [2, 2, 1]
+    
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        threshold = float(rng.uniform(0.2, 2.0))
+        clusters = _LevelClusters(threshold)
+        prices, strengths = [], []
+        for price in rng.uniform(0, 10, int(rng.integers(1, 30))).round(1).tolist():
+            clusters.add(price, None)
+            match = next((j for j, p in enumerate(prices) if abs(p - price) < threshold), None)
+            if match is None:
+                prices.append(price)
+                strengths.append(1)
+            else:
+                strengths[match] += 1
+        assert clusters.prices == prices
+        assert clusters.strengths == strengths
+
+
+def test_liquidity_levels_are_replaced_by_assignment(ohlc_factory):
+    ohlc = ohlc_factory(0, n=160, freq="5min", vol=0.0010)
+    detector = TurtleSoupDetector()
+    levels = detector.build_liquidity_map(ohlc)
+    assert isinstance(levels, tuple) and levels == detector.liquidity_levels
+    
+    ssl_levels = [level for level in levels if level.type == "SSL"]
+    assert ssl_levels and len(ssl_levels) < len(levels)
+    detector.liquidity_levels = ssl_levels
+    assert detector.liquidity_levels == tuple(ssl_levels)